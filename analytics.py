@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Project Analytics Queries for ProjectOps
+Status, software, client and monthly distributions computed with GROUP BY in
+the database, so charts render from a few dozen rows instead of whole tables
+"""
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import text
+
+
+class ProjectAnalytics:
+    """Aggregate queries behind the Analytics page"""
+
+    # Columns that may be grouped on; never taken from user input
+    DISTRIBUTION_COLUMNS = ("status", "software", "client_name")
+
+    def __init__(self, db):
+        self.db = db
+        self.dialect = db.engine.dialect.name
+
+    def _month_bucket(self, column):
+        """SQL expression for the YYYY-MM month of an ISO date string column, NULL if unparseable"""
+        if self.dialect == "sqlite":
+            return f"strftime('%Y-%m', {column})"
+        # Dates are stored as text; only cast values that look like ISO dates
+        return (f"CASE WHEN {column} ~ '^[0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}}' "
+                f"THEN to_char(date_trunc('month', CAST(SUBSTRING({column}, 1, 10) AS DATE)), 'YYYY-MM') END")
+
+    def _distribution(self, column, user_id=None, limit=None):
+        if column not in self.DISTRIBUTION_COLUMNS:
+            raise ValueError(f"Cannot group projects by {column}")
+        try:
+            user_filter = "WHERE user_id = :user_id" if user_id else ""
+            limit_clause = "LIMIT :limit" if limit else ""
+            query = text(f"""
+                SELECT {column}, COUNT(*) AS count
+                FROM projects {user_filter}
+                GROUP BY {column}
+                ORDER BY count DESC, {column}
+                {limit_clause}
+            """)
+            with self.db.engine.connect() as conn:
+                rows = conn.execute(query, {'user_id': user_id, 'limit': limit}).fetchall()
+            return pd.DataFrame(rows, columns=[column, 'count'])
+        except Exception as e:
+            st.error(f"Error getting {column} distribution: {e}")
+            return pd.DataFrame(columns=[column, 'count'])
+
+    def status_distribution(self, user_id=None):
+        status_counts = self.db.get_project_status_counts(user_id)
+        return pd.DataFrame(list(status_counts.items()), columns=['status', 'count'])
+
+    def software_distribution(self, user_id=None):
+        return self._distribution("software", user_id)
+
+    def top_clients(self, user_id=None, limit=10):
+        return self._distribution("client_name", user_id, limit)
+
+    def projects_per_month(self, user_id=None):
+        """New projects per start month, oldest first"""
+        try:
+            bucket = self._month_bucket("start_date")
+            user_filter = "AND user_id = :user_id" if user_id else ""
+            query = text(f"""
+                SELECT month, COUNT(*) AS count FROM (
+                    SELECT {bucket} AS month FROM projects
+                    WHERE start_date IS NOT NULL {user_filter}
+                ) buckets
+                WHERE month IS NOT NULL
+                GROUP BY month
+                ORDER BY month
+            """)
+            with self.db.engine.connect() as conn:
+                rows = conn.execute(query, {'user_id': user_id}).fetchall()
+            return pd.DataFrame(rows, columns=['month', 'count'])
+        except Exception as e:
+            st.error(f"Error getting projects per month: {e}")
+            return pd.DataFrame(columns=['month', 'count'])
+
+    def get_summary(self, user_id=None, top_clients=10):
+        """Everything the Analytics page draws, as small DataFrames"""
+        status = self.status_distribution(user_id)
+        return {
+            'total_projects': int(status['count'].sum()) if not status.empty else 0,
+            'status': status,
+            'software': self.software_distribution(user_id),
+            'clients': self.top_clients(user_id, top_clients),
+            'per_month': self.projects_per_month(user_id)
+        }
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Streamlit Cache Layer for ProjectOps
+Shared resources are built once per process with st.cache_resource and
+query results are cached with st.cache_data, keyed on user id plus the
+user's data version so any write invalidates that user's entries. A miss
+falls through to the cross-process cache in shared_cache.py when enabled
+"""
+
+import threading
+
+import streamlit as st
+
+from config import CACHE_CONFIG, PROFILE_PICTURE_CONFIG, PROJECT_CARD_DEFAULT_PAGE_SIZE
+from database_postgres import ProjectOpsDatabase
+from query_stats import query_scope
+from render_profiler import profile_call
+from shared_cache import shared_result
+
+QUERY_TTL = CACHE_CONFIG["query_ttl_seconds"]
+QUERY_MAX_ENTRIES = CACHE_CONFIG["query_max_entries"]
+
+
+@st.cache_resource(show_spinner=False)
+def get_database():
+    """Process-wide database handle (one engine and connection pool)"""
+    return ProjectOpsDatabase()
+
+
+@st.cache_resource(show_spinner=False)
+def get_chatbot():
+    from chatbot import ProjectChatbot
+    return ProjectChatbot(get_database())
+
+
+@st.cache_resource(show_spinner=False)
+def get_report_generator():
+    from reports import ReportGenerator
+    return ReportGenerator()
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """Process-wide cache of serialized Plotly figure specs"""
+    from chart_cache import FigureCache
+    return FigureCache()
+
+
+@st.cache_resource(show_spinner=False)
+def get_analytics():
+    from analytics import ProjectAnalytics
+    return ProjectAnalytics(get_database())
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_projects(user_id, data_version):
+    return get_database().get_all_projects(user_id)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_project_filter_options(user_id, data_version):
+    return get_database().get_project_filter_options(user_id)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_filtered_project_count(user_id, status, software, search, data_version):
+    return get_database().count_filtered_projects(user_id, status, software, search)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_filtered_projects(user_id, status, software, search, limit, offset, data_version):
+    return get_database().filter_projects(user_id, status, software, search, limit, offset)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_global_search_count(user_id, search, entity_types, data_version):
+    return get_database().count_global_search(search, user_id, list(entity_types))
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_global_search(user_id, search, entity_types, limit, offset, data_version):
+    return get_database().global_search(search, user_id, list(entity_types), limit, offset)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_meetings(user_id, data_version):
+    return get_database().get_all_meetings(user_id)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_issues(user_id, data_version):
+    return get_database().get_all_issues(user_id)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_client_updates(user_id, data_version):
+    return get_database().get_all_client_updates(user_id)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_project_activity_counts(project_ids, user_id, data_version):
+    return get_database().get_project_activity_counts(list(project_ids), user_id)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_dashboard_metrics(user_id, data_version):
+    return get_database().get_dashboard_metrics(user_id)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_project_status_counts(user_id, data_version):
+    return get_database().get_project_status_counts(user_id)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_recent_projects(user_id, limit, data_version):
+    return get_database().get_recent_projects(user_id, limit)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_recent_meetings(user_id, limit, data_version):
+    return get_database().get_recent_meetings(user_id, limit)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_project_bundle(project_id, user_id, data_version):
+    return get_database().get_project_bundle(project_id, user_id)
+
+
+@st.cache_data(ttl=QUERY_TTL, max_entries=QUERY_MAX_ENTRIES, show_spinner=False)
+@shared_result
+def _load_analytics(user_id, data_version):
+    return get_analytics().get_summary(user_id)
+
+
+@st.cache_data(ttl=CACHE_CONFIG["profile_ttl_seconds"], max_entries=CACHE_CONFIG["profile_max_entries"], show_spinner=False)
+@shared_result
+def _load_profile_picture(user_id, data_version):
+    return get_database().get_user_profile_picture(user_id)
+
+
+@st.cache_data(ttl=CACHE_CONFIG["profile_ttl_seconds"], max_entries=CACHE_CONFIG["profile_max_entries"], show_spinner=False)
+def _load_profile_thumbnail(path, size):
+    # Stored file names carry a content hash, so the path alone is a safe cache key
+    from profile_pictures import profile_picture_variant
+    variant = profile_picture_variant(path, size)
+    if variant is None:
+        return None
+    with open(variant, "rb") as f:
+        return f.read()
+
+
+def data_version(user_id):
+    return get_database().get_data_version(user_id)
+
+
+@profile_call("data")
+def cached_projects(user_id):
+    return _load_projects(user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_project_filter_options(user_id):
+    return _load_project_filter_options(user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_filtered_project_count(user_id, status=None, software=None, search=None):
+    return _load_filtered_project_count(user_id, status, software, search, data_version(user_id))
+
+
+@profile_call("data")
+def cached_filtered_projects(user_id, status=None, software=None, search=None, limit=None, offset=0):
+    return _load_filtered_projects(user_id, status, software, search, limit, offset, data_version(user_id))
+
+
+@profile_call("data")
+def cached_global_search_count(user_id, search, entity_types=()):
+    return _load_global_search_count(user_id, search, tuple(entity_types), data_version(user_id))
+
+
+@profile_call("data")
+def cached_global_search(user_id, search, entity_types=(), limit=None, offset=0):
+    return _load_global_search(user_id, search, tuple(entity_types), limit, offset, data_version(user_id))
+
+
+@profile_call("data")
+def cached_meetings(user_id):
+    return _load_meetings(user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_issues(user_id):
+    return _load_issues(user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_client_updates(user_id):
+    return _load_client_updates(user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_project_activity_counts(project_ids, user_id):
+    return _load_project_activity_counts(tuple(int(pid) for pid in project_ids), user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_dashboard_metrics(user_id):
+    return _load_dashboard_metrics(user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_project_status_counts(user_id):
+    return _load_project_status_counts(user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_recent_projects(user_id, limit=10):
+    return _load_recent_projects(user_id, limit, data_version(user_id))
+
+
+@profile_call("data")
+def cached_recent_meetings(user_id, limit=5):
+    return _load_recent_meetings(user_id, limit, data_version(user_id))
+
+
+@profile_call("data")
+def cached_project_bundle(project_id, user_id):
+    return _load_project_bundle(int(project_id), user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_analytics(user_id):
+    return _load_analytics(user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_profile_picture(user_id):
+    return _load_profile_picture(user_id, data_version(user_id))
+
+
+@profile_call("data")
+def cached_profile_thumbnail(user_id, size):
+    """Encoded size-px variant of the user's picture, or None when they have none"""
+    path = cached_profile_picture(user_id)
+    return _load_profile_thumbnail(path, size) if path else None
+
+
+def _warm_user_snapshot(user_id):
+    with query_scope("prefetch"):
+        loaders = [
+            lambda uid: cached_profile_thumbnail(uid, min(PROFILE_PICTURE_CONFIG["sizes"])),
+            cached_dashboard_metrics,
+            cached_project_status_counts,
+            cached_recent_meetings,
+            cached_recent_projects,
+            cached_project_filter_options,
+            cached_filtered_project_count,
+            lambda uid: cached_filtered_projects(uid, limit=PROJECT_CARD_DEFAULT_PAGE_SIZE),
+        ]
+        for load in loaders:
+            try:
+                load(user_id)
+            except Exception:
+                # A failed warm-up only means the page queries on first render as before
+                pass
+
+
+def prefetch_user_snapshot(user_id):
+    """Warm the shared query cache for a user who just logged in, on a background thread.
+
+    Runs while the login rerun is in flight so the first Dashboard render reads
+    from cache; a render that asks for an entry still being loaded waits for it
+    instead of querying twice.
+    """
+    if not CACHE_CONFIG["prefetch_on_login"]:
+        return None
+    # No script run context is attached: st.cache_data doesn't need one, and the thread outlives the login run,
+    # so any st.error from a failing query would otherwise be written into a finished or unrelated run
+    thread = threading.Thread(target=_warm_user_snapshot, args=(user_id,), name=f"prefetch-{user_id}", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Intent Matching Benchmark for ProjectOps
+Times the chatbot router and the email classifier on a seeded corpus of
+realistic queries and email bodies: the original chain of per-keyword
+substring scans against the compiled IntentMatcher, both for routing (first
+intent by priority) and for scoring every intent. Also reports where the two
+route differently (word boundaries mean "mom" no longer matches "moment"),
+and checks a few labelled texts route to the expected intent
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from chatbot import CHATBOT_INTENTS
+from email_integration import EMAIL_TYPE_KEYWORDS
+from generate_data import AGENDAS, CLIENT_PREFIXES, DEFAULT_SEED, ISSUE_TOPICS, PEOPLE, PROJECT_KINDS
+from intent_matcher import IntentMatcher
+
+QUERY_TEMPLATES = [
+    "What's the status of {project}?",
+    "How is {project} progressing?",
+    "Show status for {client}",
+    "Show meetings for {project}",
+    "Meetings this month",
+    "Last meetings",
+    "What issues are unresolved?",
+    "Show issues for {project}",
+    "Pending issues",
+    "Show recent client updates",
+    "Last update for {project}",
+    "Updates for {client}",
+    "What got updated on {client}",
+    "Anything updating on {project}?",
+    "Show all projects",
+    "Projects for {client}",
+    "Help",
+    "Can you give me a moment to think about {client}",
+    "Who attended the {agenda} session with {client}?",
+    "Any bugs reported on {project} since go-live?",
+    "thanks!",
+]
+
+EMAIL_OPENERS = [
+    "Hi team,", "Good morning {person},", "Hello,", "Dear {person},", "Hi all,"
+]
+EMAIL_SENTENCES = [
+    "Following up on the {agenda} for {project}.",
+    "We are seeing a {topic} when users post invoices after the latest patch.",
+    "The screen is not working since this morning and the batch job failed twice.",
+    "Could you please provide some clarification on how to configure the approval workflow?",
+    "I have a question about the licence renewal and whether support covers it.",
+    "The data migration milestone is completed and the reports were delivered to finance.",
+    "Attached is the weekly progress summary for your review.",
+    "Can we schedule a call next week to go through the agenda?",
+    "The release was scheduled for Friday.",
+    "Please find the discussion notes from our appointment on Tuesday.",
+    "Our {person} will join the session to walk through the changes.",
+    "The client confirmed the {kind} timeline and budget remain unchanged.",
+    "We will keep monitoring the environment overnight and report back tomorrow.",
+    "Users in the warehouse have been trained and everything looks good so far.",
+    "There is a crash in the payroll module when exporting to Excel.",
+]
+EMAIL_CLOSERS = ["Regards,\n{person}", "Thanks,\n{person}", "Kind regards,\n{person}\n{client}"]
+
+
+# (matcher, text, expected intent) that first() must route correctly
+ROUTING_CHECKS = [
+    ("chatbot", "what got updated on acme", "update"),
+    ("chatbot", "anything updating on payroll migration", "update"),
+    ("chatbot", "show meetings for acme erp upgrade", "meeting"),
+    ("chatbot", "can you give me a moment to think", None),
+    ("email", "hi all,\n\nthe release was scheduled for friday.\n\nregards", "meeting"),
+    ("email", "we are scheduling the cutover for next week", "meeting"),
+    ("email", "the screen is not working since this morning", "issue"),
+    ("email", "the milestone was completed and the reports delivered", "update"),
+]
+
+
+def build_corpus(queries, emails, seed=DEFAULT_SEED):
+    """Seeded chatbot queries and (subject, body) emails built from the synthetic data vocabulary"""
+    rng = random.Random(seed)
+
+    def fill(template):
+        client = rng.choice(CLIENT_PREFIXES)
+        return template.format(
+            client=client,
+            project=f"{client} {rng.choice(PROJECT_KINDS)}",
+            agenda=rng.choice(AGENDAS).lower(),
+            topic=rng.choice(ISSUE_TOPICS).lower(),
+            person=rng.choice(PEOPLE),
+            kind=rng.choice(PROJECT_KINDS).lower()
+        )
+
+    query_corpus = [fill(rng.choice(QUERY_TEMPLATES)).lower().strip() for _ in range(queries)]
+    email_corpus = []
+    for _ in range(emails):
+        sentences = [fill(rng.choice(EMAIL_SENTENCES)) for _ in range(rng.randint(3, 12))]
+        body = "\n\n".join([fill(rng.choice(EMAIL_OPENERS)), " ".join(sentences), fill(rng.choice(EMAIL_CLOSERS))])
+        subject = f"{fill('{project}')} - {rng.choice(['weekly update', 'issue', 'question', 'meeting notes', 'FYI'])}"
+        email_corpus.append((subject.lower(), body.lower()))
+    return query_corpus, email_corpus
+
+
+def legacy_first(intents, texts, default=None):
+    """The original routing: one substring scan per keyword, intents checked in order"""
+    for intent, keywords in intents.items():
+        if any(keyword in text for keyword in keywords for text in texts):
+            return intent
+    return default
+
+
+def legacy_scores(intents, texts):
+    """Every intent with its keyword occurrence count, by substring counting"""
+    scores = {}
+    for intent, keywords in intents.items():
+        hits = sum(text.count(keyword) for keyword in keywords for text in texts)
+        if hits:
+            scores[intent] = hits
+    return scores
+
+
+def _time(func, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - started)
+    return best / len(items) * 1e6
+
+
+def run_benchmark(queries=5000, emails=1000, repeat=5, seed=DEFAULT_SEED):
+    query_corpus, email_corpus = build_corpus(queries, emails, seed)
+    chatbot_matcher = IntentMatcher(CHATBOT_INTENTS)
+    email_matcher = IntentMatcher(EMAIL_TYPE_KEYWORDS)
+    cases = [
+        ("Chatbot queries", query_corpus, CHATBOT_INTENTS, chatbot_matcher,
+         lambda query: (query,), lambda query: query),
+        ("Email bodies", email_corpus, EMAIL_TYPE_KEYWORDS, email_matcher,
+         lambda email: email, lambda email: f"{email[0]}\n{email[1]}"),
+    ]
+    results = []
+    for name, corpus, intents, matcher, legacy_texts, matcher_text in cases:
+        legacy_us = _time(lambda item: legacy_first(intents, legacy_texts(item)), corpus, repeat)
+        legacy_scores_us = _time(lambda item: legacy_scores(intents, legacy_texts(item)), corpus, repeat)
+        first_us = _time(lambda item: matcher.first(matcher_text(item)), corpus, repeat)
+        scores_us = _time(lambda item: matcher.scores(matcher_text(item)), corpus, repeat)
+        differences = [
+            (item, legacy_first(intents, legacy_texts(item)), matcher.first(matcher_text(item)))
+            for item in corpus
+        ]
+        differences = [difference for difference in differences if difference[1] != difference[2]]
+        # One example for each (substring, matcher) routing pair
+        examples = {}
+        for item, legacy, new in differences:
+            examples.setdefault((legacy, new), item)
+        results.append({
+            'corpus': name,
+            'items': len(corpus),
+            'avg_chars': sum(len(matcher_text(item)) for item in corpus) / len(corpus),
+            'legacy_first_us': legacy_us,
+            'legacy_all_intents_us': legacy_scores_us,
+            'matcher_first_us': first_us,
+            'matcher_all_intents_us': scores_us,
+            'first_speedup': legacy_us / first_us if first_us else 0.0,
+            'all_intents_speedup': legacy_scores_us / scores_us if scores_us else 0.0,
+            'disagreements': len(differences),
+            'disagreement_examples': [
+                {'text': str(item)[:120], 'legacy': legacy, 'matcher': new} for (legacy, new), item in examples.items()
+            ]
+        })
+    return results
+
+
+def check_routing():
+    """[(matcher, text, expected, routed)] for every ROUTING_CHECKS entry"""
+    matchers = {'chatbot': IntentMatcher(CHATBOT_INTENTS), 'email': IntentMatcher(EMAIL_TYPE_KEYWORDS)}
+    return [
+        (name, text, expected, matchers[name].first(text))
+        for name, text, expected in ROUTING_CHECKS
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time keyword intent routing: substring scans vs the compiled IntentMatcher")
+    parser.add_argument("--queries", type=int, default=5000, help="Chatbot queries in the corpus")
+    parser.add_argument("--emails", type=int, default=1000, help="Emails in the corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs; the best one is reported")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Corpus seed")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.queries, args.emails, args.repeat, args.seed)
+
+    print(f"\n📊 Intent matching, microseconds per item (best of {args.repeat})\n")
+    print(f"{'':<32}{'--- First intent ---':>30}{'---- All intents ---':>30}")
+    print(f"{'Corpus':<18}{'Items':>7}{'Chars':>7}{'Substring':>11}{'Matcher':>10}{'Speedup':>9}"
+          f"{'Substring':>11}{'Matcher':>10}{'Speedup':>9}")
+    for result in results:
+        print(
+            f"{result['corpus']:<18}{result['items']:>7}{result['avg_chars']:>7.0f}"
+            f"{result['legacy_first_us']:>11.2f}{result['matcher_first_us']:>10.2f}{result['first_speedup']:>8.1f}x"
+            f"{result['legacy_all_intents_us']:>11.2f}{result['matcher_all_intents_us']:>10.2f}{result['all_intents_speedup']:>8.1f}x"
+        )
+    for result in results:
+        if result['disagreements']:
+            print(f"\n⚠️ {result['corpus']}: {result['disagreements']} item(s) routed differently, e.g.")
+            for example in result['disagreement_examples']:
+                print(f"   {example['legacy']} -> {example['matcher']}: {example['text']!r}")
+
+    print("\n🧭 Routing checks")
+    failures = 0
+    for name, text, expected, routed in check_routing():
+        failures += routed != expected
+        print(f"   {'✅' if routed == expected else '❌'} {name}: {text!r} -> {routed} (expected {expected})")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    if failures:
+        print(f"\n❌ {failures} routing check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
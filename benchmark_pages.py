@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Page Render Benchmark for ProjectOps
+Logs a fixture admin into a scratch SQLite database seeded at several sizes
+and renders every menu page with Streamlit's AppTest, recording wall time,
+query count and peak memory. Results can be saved as a JSON baseline and
+later runs fail when a page regresses against it
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from benchmark_reruns import ADMIN_EMAIL, ADMIN_PASSWORD, _new_app, _seed_database
+
+PAGES = [
+    "🏠 Dashboard",
+    "📁 Project Tracker",
+    "🗓️ Meeting & MoM Log",
+    "🧾 Client Update Log",
+    "🛠️ Issue Tracker",
+    "🤖 AI Chatbot",
+    "📈 Analytics",
+    "📧 Email Integration",
+    "👥 User Management",
+    "🔎 Global Search"
+]
+
+# Widget state set before a page renders, for pages that show little without input
+PAGE_STATE = {
+    "🔎 Global Search": {'global_search_query': "data migration"}
+}
+
+DEFAULT_SCALES = [100, 10_000, 100_000]
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+# A page regresses when it is this much slower / larger than the baseline;
+# timing differences under TIME_FLOOR_MS are treated as noise
+TIME_TOLERANCE = 0.5
+TIME_FLOOR_MS = 100
+MEMORY_TOLERANCE = 0.25
+PAYLOAD_TOLERANCE = 0.1
+
+# Slowest a single render may take before it is recorded as timed out
+RENDER_TIMEOUT_S = 120
+
+
+class PayloadMeter:
+    """Bytes one browser session would receive, via ForwardMsgQueue's enqueue hook.
+
+    Streamlit replaces a cacheable message (large, identical element) the
+    browser already holds with a short hash reference; the meter does the same
+    for messages it has seen in earlier runs of the session.
+    """
+
+    def __init__(self):
+        self.seen = set()
+
+    def _on_message(self, msg):
+        from streamlit.runtime.forward_msg_cache import create_reference_msg
+        if msg.metadata.cacheable and msg.hash in self.seen:
+            self.bytes += create_reference_msg(msg).ByteSize()
+            return
+        self.bytes += msg.ByteSize()
+        if msg.metadata.cacheable:
+            self.seen.add(msg.hash)
+
+    @contextmanager
+    def measure(self):
+        from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+        self.bytes = 0
+        ForwardMsgQueue.on_before_enqueue_msg(self._on_message)
+        try:
+            yield self
+        finally:
+            ForwardMsgQueue.on_before_enqueue_msg(None)
+
+
+def _page_app(db_url, session_token, page):
+    at = _new_app(db_url, session_token, page)
+    for key, value in PAGE_STATE.get(page, {}).items():
+        at.session_state[key] = value
+    return at
+
+
+def _render_page(db_url, session_token, page):
+    """Cold render (empty st.cache_data) then a warm rerun of one page"""
+    import streamlit as st
+    from query_stats import record_queries
+
+    st.cache_data.clear()
+    at = _page_app(db_url, session_token, page)
+    meter = PayloadMeter()
+    with record_queries() as recorder, meter.measure():
+        started = time.perf_counter()
+        try:
+            at.run(timeout=RENDER_TIMEOUT_S)
+        except RuntimeError as e:
+            # AppTest stops the script on timeout; skip the warm and memory passes
+            return {'page': page, 'cold_ms': RENDER_TIMEOUT_S * 1000, 'warm_ms': None, 'queries': recorder.count,
+                    'peak_kb': None, 'payload_kb': None, 'rerun_payload_kb': None, 'errors': [str(e)]}
+        cold_ms = (time.perf_counter() - started) * 1000
+    payload_bytes = meter.bytes
+    errors = [str(e.value) for e in at.exception]
+
+    with meter.measure():
+        started = time.perf_counter()
+        at.run(timeout=RENDER_TIMEOUT_S)
+        warm_ms = (time.perf_counter() - started) * 1000
+    rerun_payload_bytes = meter.bytes
+
+    # Peak memory is taken on a separate cold render since tracemalloc slows everything down
+    st.cache_data.clear()
+    at = _page_app(db_url, session_token, page)
+    tracemalloc.start()
+    try:
+        at.run(timeout=RENDER_TIMEOUT_S)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'page': page,
+        'cold_ms': round(cold_ms, 1),
+        'warm_ms': round(warm_ms, 1),
+        'queries': recorder.count,
+        'peak_kb': round(peak / 1024),
+        'payload_kb': round(payload_bytes / 1024, 1),
+        'rerun_payload_kb': round(rerun_payload_bytes / 1024, 1),
+        'errors': errors
+    }
+
+
+def _apply_app_config():
+    """Load the app's .streamlit/config.toml (workers run outside the repo so its secrets are not read)"""
+    import tomllib
+    from streamlit import config
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "config.toml")
+    with open(path, "rb") as f:
+        for section, options in tomllib.load(f).items():
+            for name, value in options.items():
+                config.set_option(f"{section}.{name}", value, where_defined=path)
+
+
+def measure_scale(project_count, db_path=None):
+    """Seed one database with project_count projects and render every page against it"""
+    from streamlit.testing.v1 import AppTest
+
+    _apply_app_config()
+    db_path = db_path or os.path.join(tempfile.mkdtemp(prefix="projectops-bench-"), f"pages-{project_count}.db")
+    db_url = f"sqlite:///{db_path}"
+    seed = AppTest.from_function(_seed_database, args=(project_count, ADMIN_EMAIL, ADMIN_PASSWORD), default_timeout=1800)
+    seed.secrets["DB_URL"] = db_url
+    seed.run()
+    if seed.exception:
+        raise RuntimeError(f"Seeding failed: {seed.exception[0].value}")
+    session_token = seed.session_state['session_token']
+
+    results = []
+    for page in PAGES:
+        result = _render_page(db_url, session_token, page)
+        result['projects'] = project_count
+        results.append(result)
+    return results
+
+
+def run_benchmark(scales=None):
+    """Measure each scale in a fresh interpreter (the app's database handles are per process)"""
+    results = []
+    for project_count in scales or DEFAULT_SCALES:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as output:
+            output_path = output.name
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", str(project_count), "--json", output_path],
+            capture_output=True, text=True, cwd=tempfile.gettempdir()
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"{project_count} projects: {completed.stderr[-2000:]}")
+        with open(output_path) as f:
+            results.extend(json.load(f))
+        os.remove(output_path)
+    return results
+
+
+def find_regressions(results, baseline):
+    """Compare results with a baseline list; returns human-readable failures.
+
+    A page that errors or times out always fails, even if it already did when
+    the baseline was recorded.
+    """
+    expected = {(row['projects'], row['page']): row for row in baseline}
+    failures = []
+    for result in results:
+        label = f"{result['page']} @ {result['projects']}"
+        before = expected.get((result['projects'], result['page']))
+        if result['errors']:
+            failures.append(f"{label}: raised {result['errors'][0]}")
+            continue
+        if not before:
+            continue
+        if before['errors']:
+            print(f"ℹ️ {label}: fixed since the baseline; run with --update-baseline to record it")
+            continue
+        if result['queries'] > before['queries']:
+            failures.append(f"{label}: {result['queries']} queries, baseline {before['queries']}")
+        time_limit = max(before['cold_ms'] * (1 + TIME_TOLERANCE), before['cold_ms'] + TIME_FLOOR_MS)
+        if result['cold_ms'] > time_limit:
+            failures.append(f"{label}: {result['cold_ms']:.0f} ms, baseline {before['cold_ms']:.0f} ms")
+        if result['peak_kb'] > before['peak_kb'] * (1 + MEMORY_TOLERANCE):
+            failures.append(f"{label}: peak {result['peak_kb']} KB, baseline {before['peak_kb']} KB")
+        if before.get('rerun_payload_kb') is not None and result['rerun_payload_kb'] > before['rerun_payload_kb'] * (1 + PAYLOAD_TOLERANCE):
+            failures.append(f"{label}: {result['rerun_payload_kb']} KB per rerun, baseline {before['rerun_payload_kb']} KB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every page at several data sizes and check against a baseline")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Project counts to seed")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.json, "w") as f:
+            json.dump(measure_scale(args.worker), f)
+        return
+
+    results = run_benchmark(args.scales)
+
+    print("\n📊 Page renders\n")
+    print(f"{'Page':<24}{'Projects':>10}{'Cold ms':>10}{'Warm ms':>10}{'Queries':>10}{'Peak KB':>10}{'Sent KB':>10}{'Rerun KB':>10}")
+    for result in results:
+        optional = "".join(
+            f"{result[key]:>10}" if result.get(key) is not None else f"{'-':>10}"
+            for key in ('warm_ms', 'queries', 'peak_kb', 'payload_kb', 'rerun_payload_kb')
+        )
+        print(f"{result['page']:<24}{result['projects']:>10}{result['cold_ms']:>10.0f}{optional}"
+              + ("  ❌" if result['errors'] else ""))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️ No baseline at {args.baseline}; run with --update-baseline to record one")
+        return
+
+    with open(args.baseline) as f:
+        failures = find_regressions(results, json.load(f))
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("\n✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
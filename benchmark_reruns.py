@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Rerun Benchmark for ProjectOps
+Drives the app with Streamlit's AppTest against a scratch SQLite database and
+counts the SQL queries each interaction issues, measured twice: as a
+whole-script rerun (what st.rerun() or an app without fragments costs) and
+as the fragment-only rerun the browser requests when a widget inside a
+fragment changes
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from unittest.mock import patch
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import RerunData
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+import query_stats
+from query_stats import record_queries
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+ADMIN_EMAIL = "benchmark-admin@example.com"
+ADMIN_PASSWORD = "benchmark-password"
+
+
+def _seed_database(project_count, admin_email, admin_password):
+    """Runs inside AppTest so the app modules pick up the benchmark DB_URL secret"""
+    import streamlit as st
+    from sqlalchemy import text
+    from generate_data import generate_dataset
+    from neon_auth import auth
+
+    auth.create_admin_user(admin_email, admin_password, "Benchmark Admin")
+    with auth.db.engine.connect() as conn:
+        user_id = conn.execute(text("SELECT id FROM users WHERE email = :email"), {"email": admin_email}).scalar()
+    generate_dataset(auth.db.engine, project_count, user_ids=[user_id])
+    with auth.db.engine.connect() as conn:
+        first_project_id = conn.execute(text("SELECT MIN(id) FROM projects WHERE user_id = :user_id"), {"user_id": user_id}).scalar()
+
+    success, user_info = auth.login_user(admin_email, admin_password)
+    auth.write_buffer.flush()
+    st.session_state['session_token'] = user_info['session_token']
+    st.session_state['first_project_id'] = first_project_id
+
+
+def _new_app(db_url, session_token, menu):
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.secrets["DB_URL"] = db_url
+    at.session_state['session_token'] = session_token
+    at.session_state['active_menu'] = menu
+    return at
+
+
+@contextmanager
+def _fragment_rerun(fragment_id):
+    """Make AppTest.run() rerun only fragment_id, as the browser asks for after a widget inside it changes.
+
+    AppTest always requests a whole-script rerun, so the request it builds is
+    given the fragment id here.
+    """
+    with patch.object(local_script_runner, "RerunData", partial(RerunData, fragment_id=fragment_id)):
+        yield
+
+
+def _find_button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def _chat_message(at):
+    at.chat_input[0].set_value("Show meetings this month")
+
+
+def _log_meeting(at):
+    at.text_input(key="meeting_attendees_input").input("Benchmark attendees")
+    at.text_input(key="meeting_agenda_input").input("Benchmark agenda")
+    _find_button(at, "📝 Log Meeting").click()
+
+
+def _change_card_page(at):
+    at.number_input(key="project_cards_page").set_value(2)
+
+
+def _add_detail_issue(at):
+    at.text_area(key="detail_issue_description").input("Benchmark detail issue")
+    _find_button(at, "Add Issue").click()
+
+
+# (name, menu, fragment scope, interaction, opens the project detail panel)
+SCENARIOS = [
+    ("Chat message", "🤖 AI Chatbot", "chat", _chat_message, False),
+    ("Log meeting form", "🗓️ Meeting & MoM Log", "meeting_log", _log_meeting, False),
+    ("Project card page", "📁 Project Tracker", "project_tracker", _change_card_page, False),
+    ("Project detail add issue", "🏠 Dashboard", "project_detail", _add_detail_issue, True),
+]
+
+
+def _interaction_queries(db_url, session_token, scenario, first_project_id, fragment):
+    """Queries issued by the rerun that follows the scenario's interaction, optionally as a fragment rerun"""
+    name, menu, scope, interact, opens_detail = scenario
+    # Both measurements start cold, so the first cannot warm the cache for the second
+    st.cache_data.clear()
+    at = _new_app(db_url, session_token, menu)
+    if opens_detail:
+        at.session_state['show_project_detail'] = True
+        at.session_state['selected_project_id'] = first_project_id
+    at.run()
+    interact(at)
+    with record_queries() as recorder, _fragment_rerun(query_stats.fragment_ids[scope]) if fragment else nullcontext():
+        at.run()
+    if at.exception:
+        raise RuntimeError(f"{name} failed: {at.exception[0].value}")
+    return recorder
+
+
+def run_benchmark(project_count=50, db_path=None):
+    """Return one result dict per scenario"""
+    db_path = db_path or os.path.join(tempfile.mkdtemp(prefix="projectops-bench-"), "benchmark.db")
+    db_url = f"sqlite:///{db_path}"
+
+    seed = AppTest.from_function(_seed_database, args=(project_count, ADMIN_EMAIL, ADMIN_PASSWORD), default_timeout=300)
+    seed.secrets["DB_URL"] = db_url
+    seed.run()
+    if seed.exception:
+        raise RuntimeError(f"Seeding failed: {seed.exception[0].value}")
+    session_token = seed.session_state['session_token']
+    first_project_id = seed.session_state['first_project_id']
+
+    results = []
+    for scenario in SCENARIOS:
+        full = _interaction_queries(db_url, session_token, scenario, first_project_id, fragment=False)
+        fragment = _interaction_queries(db_url, session_token, scenario, first_project_id, fragment=True)
+        results.append({
+            'scenario': scenario[0],
+            'fragment': scenario[2],
+            'full_rerun_queries': full.count,
+            'fragment_rerun_queries': fragment.count,
+            'full_rerun_queries_by_scope': full.count_by_scope(),
+            'fragment_rerun_queries_by_scope': fragment.count_by_scope()
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count DB queries per interaction: full rerun vs fragment rerun")
+    parser.add_argument("--projects", type=int, default=50, help="Number of projects to seed")
+    parser.add_argument("--db-path", help="SQLite file to use (default: a new temporary file)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.projects, args.db_path)
+
+    print(f"\n📊 DB queries per interaction ({args.projects} projects)\n")
+    print(f"{'Scenario':<28}{'Full rerun':>12}{'Fragment':>10}{'Saved':>8}")
+    for result in results:
+        saved = result['full_rerun_queries'] - result['fragment_rerun_queries']
+        print(f"{result['scenario']:<28}{result['full_rerun_queries']:>12}{result['fragment_rerun_queries']:>10}{saved:>8}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for ProjectOps
+Renders the login page in a fresh interpreter under `python -X importtime`
+and reports how much import time the app adds on top of Streamlit itself.
+Fails when the cold start goes over budget or when a module that only a
+later page needs is loaded just to show the login page
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmark_reruns import ADMIN_EMAIL, ADMIN_PASSWORD, APP_PATH, _seed_database
+
+# Import time the login page may add on top of Streamlit, in milliseconds
+STARTUP_BUDGET_MS = 1000
+
+# Heavy modules that belong to specific pages, never to the login page.
+# (Streamlit itself imports the plotly base package, so only plotly.express is checked)
+LOGIN_PAGE_FORBIDDEN = ["plotly.express", "reportlab", "openpyxl", "requests", "docx", "chatbot", "reports", "email_integration"]
+
+APP_START_MARKER = "-- projectops app start --"
+
+# Runs in the child interpreter. Streamlit is imported before the marker so
+# only the imports triggered by the app script itself are counted.
+CHILD_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app_path!r}, default_timeout=120)
+at.secrets["DB_URL"] = {db_url!r}
+already_loaded = set(sys.modules)
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+started = time.perf_counter()
+at.run()
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "run_ms": elapsed_ms,
+    "errors": [str(e.value) for e in at.exception],
+    "loaded": [name for name in {forbidden!r} if name in sys.modules and name not in already_loaded]
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Return [(module, cumulative_ms)] for top-level imports after the app start marker"""
+    imports = []
+    started = False
+    for line in stderr.splitlines():
+        if APP_START_MARKER in line:
+            started = True
+            continue
+        if not started or not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            cumulative_us = int(cumulative)
+        except ValueError:
+            continue  # the header row
+        # Nested imports are indented under the module that triggered them
+        if not name[1:].startswith(" "):
+            imports.append((name.strip(), cumulative_us / 1000))
+    return imports
+
+
+def measure_once(db_url):
+    child = CHILD_SCRIPT.format(app_path=APP_PATH, db_url=db_url, marker=APP_START_MARKER, forbidden=LOGIN_PAGE_FORBIDDEN)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", child],
+        capture_output=True, text=True, cwd=tempfile.gettempdir()
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr[-2000:])
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    imports = parse_importtime(completed.stderr)
+    result['imports'] = sorted(imports, key=lambda item: item[1], reverse=True)
+    result['import_ms'] = sum(ms for _, ms in imports)
+    return result
+
+
+def run_benchmark(runs=3, db_path=None):
+    """Seed a scratch database, then measure the login page cold start `runs` times"""
+    from streamlit.testing.v1 import AppTest
+
+    db_path = db_path or os.path.join(tempfile.mkdtemp(prefix="projectops-bench-"), "startup.db")
+    db_url = f"sqlite:///{db_path}"
+    seed = AppTest.from_function(_seed_database, args=(10, ADMIN_EMAIL, ADMIN_PASSWORD), default_timeout=300)
+    seed.secrets["DB_URL"] = db_url
+    seed.run()
+
+    # The first interpreter also writes bytecode caches; keep the median of the rest
+    measure_once(db_url)
+    results = sorted((measure_once(db_url) for _ in range(runs)), key=lambda r: r['import_ms'])
+    return results[len(results) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure login page cold-start import time")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to measure (median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="Fail above this much app import time")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--json", help="Also write the result to this JSON file")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.runs)
+
+    print(f"\n⏱️ Login page cold start: {result['import_ms']:.0f} ms of imports, {result['run_ms']:.0f} ms first run "
+          f"(budget {args.budget_ms:.0f} ms)\n")
+    for name, ms in result['imports'][:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    failures = []
+    if result['errors']:
+        failures.append(f"app raised: {result['errors'][0]}")
+    if result['import_ms'] > args.budget_ms:
+        failures.append(f"imports took {result['import_ms']:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    if result['loaded']:
+        failures.append(f"login page loaded {', '.join(result['loaded'])}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("\n✅ Within budget")
+
+
+if __name__ == "__main__":
+    main()
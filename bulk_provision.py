@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Bulk User Provisioning for Project Tracker
+Creates users from a CSV file (columns: email, full_name, role) and sends
+their invitation emails through the outbox over a pooled SMTP connection
+"""
+
+import argparse
+import csv
+import io
+import os
+import re
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+from email import message_from_bytes
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+VALID_ROLES = ("user", "admin")
+
+
+def parse_user_csv(source):
+    """Parse a CSV path, file object or bytes into (users, errors)"""
+    if isinstance(source, (bytes, bytearray)):
+        handle = io.StringIO(source.decode("utf-8-sig"))
+    elif isinstance(source, str):
+        handle = open(source, newline="", encoding="utf-8-sig")
+    else:
+        handle = io.StringIO(source.read().decode("utf-8-sig"))
+
+    users = []
+    errors = []
+    with handle:
+        reader = csv.DictReader(handle)
+        fieldnames = [name.strip().lower() for name in (reader.fieldnames or [])]
+        if "email" not in fieldnames:
+            return [], ["CSV must have an 'email' column"]
+        for line_number, row in enumerate(reader, start=2):
+            row = {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+            email = row.get("email", "")
+            full_name = row.get("full_name") or row.get("name") or email.split("@")[0]
+            role = (row.get("role") or "user").lower()
+            if not EMAIL_PATTERN.match(email):
+                errors.append(f"Line {line_number}: invalid email '{email}'")
+                continue
+            if role not in VALID_ROLES:
+                errors.append(f"Line {line_number}: invalid role '{role}' for {email}")
+                continue
+            users.append({"email": email, "full_name": full_name, "role": role})
+    return users, errors
+
+
+class _DebugSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept mail from smtplib without TLS or auth"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost debugging server")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip().split(" ", 1)[0].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for data_line in iter(self.rfile.readline, b""):
+                    if data_line in (b".\r\n", b".\n"):
+                        break
+                    data.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                with self.server.lock:
+                    self.server.messages.append(message_from_bytes(b"".join(data)))
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                # MAIL, RCPT, RSET, NOOP
+                self.reply("250 OK")
+
+
+class DebugSMTPServer(socketserver.ThreadingTCPServer):
+    """In-process SMTP sink on a free local port; received messages are kept in .messages"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _DebugSMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, name="debug-smtp", daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        self.server_close()
+
+
+def run_check(count):
+    """Provision count users through this CLI against a throwaway database and a local SMTP sink.
+
+    The CLI runs in a subprocess started in an empty directory, so it sees
+    neither the app's secrets nor its database. Returns (passed, log lines).
+    """
+    workdir = tempfile.mkdtemp(prefix="bulk_provision_check_")
+    csv_path = os.path.join(workdir, "users.csv")
+    emails = [f"check.user{i}@example.com" for i in range(count)]
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["email", "full_name", "role"])
+        writer.writerows([email, f"Check User {i}", "user"] for i, email in enumerate(emails))
+
+    log = []
+    passed = True
+
+    def expect(condition, message):
+        nonlocal passed
+        passed = passed and condition
+        log.append(f"{'✅' if condition else '❌'} {message}")
+
+    env = dict(os.environ, DB_URL=f"sqlite:///{os.path.join(workdir, 'check.db')}")
+    with DebugSMTPServer() as server:
+        port = server.server_address[1]
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), csv_path, "--smtp-host", "127.0.0.1",
+             "--smtp-port", str(port), "--from-email", "tracker@example.com", "--no-tls"],
+            cwd=workdir, env=env, capture_output=True, text=True, timeout=300
+        )
+        expect(result.returncode == 0, f"bulk_provision.py exited with {result.returncode}")
+        if result.returncode:
+            log.append(result.stderr.strip()[-2000:])
+
+        recipients = sorted(message["To"] for message in server.messages)
+        expect(recipients == sorted(emails), f"{len(server.messages)} of {count} invitation(s) delivered, one per user")
+        expect(all("Temporary Password:" in message.get_payload() for message in server.messages),
+               "every invitation carries a temporary password")
+        expect(all(message["From"] == "tracker@example.com" for message in server.messages),
+               "invitations were sent from the --from-email address")
+        expect(server.connections == 1, f"{server.connections} SMTP connection(s) for {count} invitation(s)")
+    return passed, log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create Project Tracker users from a CSV file")
+    parser.add_argument("csv_path", nargs="?", help="CSV with email, full_name and role columns")
+    parser.add_argument("--smtp-host", help="Override the SMTP host from secrets")
+    parser.add_argument("--smtp-port", type=int, help="Override the SMTP port from secrets")
+    parser.add_argument("--from-email", help="Override the sender address from secrets")
+    parser.add_argument("--no-tls", action="store_true", help="Send without STARTTLS (e.g. local debugging server)")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the CSV without creating users")
+    parser.add_argument("--check", type=int, metavar="USERS",
+                        help="Provision USERS users against a throwaway database and a local SMTP sink, "
+                             "and verify every invitation arrives")
+    args = parser.parse_args()
+
+    if args.check:
+        print(f"\n📧 Checking bulk provisioning with {args.check} users and a local SMTP server\n")
+        passed, log = run_check(args.check)
+        print("\n".join(log))
+        print(f"\n{'✅ Bulk provisioning check passed' if passed else '❌ Bulk provisioning check failed'}")
+        sys.exit(0 if passed else 1)
+    if not args.csv_path:
+        parser.error("csv_path is required unless --check is given")
+
+    users, errors = parse_user_csv(args.csv_path)
+    for error in errors:
+        print(f"⚠️ {error}")
+    print(f"📄 {len(users)} valid user rows in {args.csv_path}")
+    if args.dry_run or not users:
+        return
+
+    from mail_queue import configure_mail_queue, load_smtp_config
+
+    overrides = {'smtp_host': args.smtp_host, 'smtp_port': args.smtp_port, 'from_email': args.from_email}
+    if args.no_tls:
+        overrides['use_tls'] = False
+    # Before neon_auth starts the process's outbox worker, so it sends with the overrides too
+    configure_mail_queue(load_smtp_config(overrides))
+    from neon_auth import auth
+    mail_queue = auth.mail_queue
+
+    results = auth.bulk_create_users(users)
+    if results['error']:
+        print(f"❌ {results['error']}")
+        return
+    for email in results['skipped']:
+        print(f"⏭️ Skipped existing user: {email}")
+    for user in results['created']:
+        if user['email_queued']:
+            print(f"✅ Created {user['email']} ({user['role']}) - invitation queued")
+        else:
+            print(f"✅ Created {user['email']} ({user['role']}) - temporary password: {user['temp_password']}")
+
+    print("📧 Sending invitations...")
+    if not mail_queue.wait(timeout=120):
+        print("⏳ Some invitations are still queued; they will be retried by the app's mail worker.")
+    print(f"📧 Sent {mail_queue.stats['sent']} emails over {mail_queue.stats['connections']} connection(s), "
+          f"{mail_queue.stats['failed']} failed")
+    if mail_queue.stats['last_error']:
+        print(f"⚠️ Last error: {mail_queue.stats['last_error']}")
+
+
+if __name__ == "__main__":
+    main()
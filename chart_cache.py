@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Chart Figure Cache for ProjectOps
+Plotly figures are built once per distinct input and kept as serialized JSON
+specs, keyed by a fingerprint of the aggregated series and chart options, so
+reruns over unchanged counts skip plotly.express entirely. Cached specs come
+back as Figures built without validation, so st.plotly_chart neither
+re-validates them nor rebuilds them from a dict; it still serializes the spec
+once per render. Specs built by other app processes are picked up from the
+shared cache when it is enabled
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from config import CACHE_CONFIG
+from render_profiler import note_cache, profile_call
+from shared_cache import MISSING, cache_key, get_shared_cache
+
+
+def _as_list(values):
+    """Plain Python list from a pandas Series, numpy array or any iterable"""
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def _figure(spec):
+    """Figure from a cached spec. The spec was produced by Plotly itself, so validating it again is skipped:
+    that validation costs about ten times as much as everything else st.plotly_chart does with it"""
+    import plotly.graph_objects as go
+    return go.Figure(json.loads(spec), _validate=False)
+
+
+def figure_fingerprint(kind, data, options):
+    """Stable hash of the chart type, its input series and its options"""
+    payload = json.dumps([kind, data, options], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FigureCache:
+    """LRU of serialized figure specs with hit/miss counters"""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or CACHE_CONFIG["figure_max_entries"]
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    def get_or_build(self, kind, data, options, build):
+        """Return the figure for these inputs, calling build() to make a Plotly figure on a miss"""
+        key = figure_fingerprint(kind, data, options)
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is not None:
+                self._specs.move_to_end(key)
+                self.hits += 1
+                note_cache(True)
+                return _figure(spec)
+        shared = get_shared_cache()
+        spec = shared.get(cache_key("figure", [key])) if shared else MISSING
+        with self._lock:
+            if spec is MISSING:
+                self.misses += 1
+            else:
+                self.shared_hits += 1
+        note_cache(spec is not MISSING)
+
+        if spec is MISSING:
+            import plotly.io as pio
+            spec = pio.to_json(build(), validate=False)
+            if shared:
+                shared.set(cache_key("figure", [key]), spec)
+        with self._lock:
+            self._specs[key] = spec
+            self._specs.move_to_end(key)
+            while len(self._specs) > self.max_entries:
+                self._specs.popitem(last=False)
+        return _figure(spec)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+                'entries': len(self._specs),
+                'bytes': sum(len(spec) for spec in self._specs.values())
+            }
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+            self.hits = 0
+            self.misses = 0
+            self.shared_hits = 0
+
+
+@profile_call("chart")
+def pie_chart(cache, values, names, title, color_discrete_map=None, height=None):
+    data = {'values': _as_list(values), 'names': _as_list(names)}
+    options = {'title': title, 'color_discrete_map': color_discrete_map, 'height': height}
+
+    def build():
+        import plotly.express as px
+        fig = px.pie(values=data['values'], names=data['names'], title=title, color_discrete_map=color_discrete_map)
+        if height:
+            fig.update_layout(height=height)
+        return fig
+
+    return cache.get_or_build("pie", data, options, build)
+
+
+@profile_call("chart")
+def line_chart(cache, x, y, title):
+    data = {'x': _as_list(x), 'y': _as_list(y)}
+
+    def build():
+        import plotly.express as px
+        return px.line(x=data['x'], y=data['y'], title=title)
+
+    return cache.get_or_build("line", data, {'title': title}, build)
+
+
+@profile_call("chart")
+def bar_chart(cache, x, y, title):
+    data = {'x': _as_list(x), 'y': _as_list(y)}
+
+    def build():
+        import plotly.express as px
+        return px.bar(x=data['x'], y=data['y'], title=title)
+
+    return cache.get_or_build("bar", data, {'title': title}, build)
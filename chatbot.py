@@ -1,38 +1,65 @@
 import re
+import threading
 from datetime import datetime, timedelta
 import pandas as pd
+from config import ENTITY_INDEX_CONFIG
 from database_postgres import ProjectOpsDatabase
+from entity_index import EntityIndex
+from intent_matcher import IntentMatcher
+
+# Intent -> keywords, in routing priority order
+CHATBOT_INTENTS = {
+    'status': ['status', 'progress', 'how is'],
+    'meeting': ['meeting', 'mom', 'minutes'],
+    'issue': ['issue', 'problem', 'bug', 'unresolved'],
+    'update': ['update', 'communication', 'client'],
+    'project': ['project', 'client'],
+    'help': ['help']
+}
+
+# Words that never name a project or client on their own: intent keywords and filler
+ENTITY_STOPWORDS = {word for keywords in CHATBOT_INTENTS.values() for keyword in keywords for word in keyword.split()} | {
+    'a', 'about', 'all', 'an', 'and', 'any', 'are', 'can', 'do', 'does', 'doing', 'for', 'give', 'going', 'got', 'has',
+    'have', 'how', 'in', 'is', 'last', 'latest', 'list', 'me', 'my', 'of', 'on', 'please', 'recent', 'show', 's',
+    'tell', 'the', 'this', 'to', 'what', 'whats', 'when', 'where', 'which', 'with', 'you'
+}
 
 class ProjectChatbot:
+    intent_matcher = IntentMatcher(CHATBOT_INTENTS)
+
     def __init__(self, db):
         self.db = db
+        self._entity_indexes = {}  # user id -> (data version, EntityIndex)
+        self._entity_indexes_lock = threading.Lock()
+        db.add_write_listener(self._on_write)
         
     def process_query(self, user_query, user_id=None):
         """Process user query and return appropriate response"""
         query = user_query.lower().strip()
+        intent = self.intent_matcher.first(query)
         
         # Project status queries
-        if any(word in query for word in ['status', 'progress', 'how is']):
+        if intent == 'status':
             return self._handle_status_query(query, user_id)
         
         # Meeting queries
-        elif any(word in query for word in ['meeting', 'mom', 'minutes']):
+        elif intent == 'meeting':
             return self._handle_meeting_query(query, user_id)
         
         # Issue queries
-        elif any(word in query for word in ['issue', 'problem', 'bug', 'unresolved']):
+        elif intent == 'issue':
             return self._handle_issue_query(query, user_id)
         
         # Client update queries
-        elif any(word in query for word in ['update', 'communication', 'client']):
+        elif intent == 'update':
             return self._handle_update_query(query, user_id)
         
         # General project queries
-        elif any(word in query for word in ['project', 'client']):
+        elif intent == 'project':
             return self._handle_project_query(query, user_id)
         
         # Help query
-        elif 'help' in query:
+        elif intent == 'help':
             return self._get_help_message()
         
         else:
@@ -41,47 +68,41 @@ class ProjectChatbot:
     def _handle_status_query(self, query, user_id=None):
         """Handle project status queries"""
         # Extract project name or client name
-        project_name = self._extract_project_name(query)
+        projects, project_name, others = self._find_projects(query, user_id)
         
         if project_name:
-            projects = self.db.search_projects(project_name)
             if not projects.empty:
-                # Filter by user if specified
-                if user_id:
-                    projects = projects[projects['user_id'] == user_id]
+                if len(projects) > 1:
+                    return self._which_project(projects, project_name, others)
+                project = projects.iloc[0]
+                summary = self.db.get_project_summary(project['id'])
                 
-                if not projects.empty:
-                    project = projects.iloc[0]
-                    summary = self.db.get_project_summary(project['id'])
-                    
-                    response = f"📊 **Project Status: {project['project_name']}**\n\n"
-                    response += f"**Client:** {project['client_name']}\n"
-                    response += f"**Status:** {project['status']}\n"
-                    response += f"**Software:** {project['software']}\n"
-                    response += f"**Vendor:** {project['vendor']}\n"
-                    response += f"**Start Date:** {project['start_date']}\n"
-                    response += f"**Deadline:** {project['deadline']}\n\n"
-                    response += f"**Summary:**\n"
-                    response += f"• Total Meetings: {summary['meetings_count']}\n"
-                    response += f"• Total Issues: {summary['issues_count']}\n"
-                    response += f"• Pending Issues: {summary['pending_issues']}\n"
-                    
-                    if not summary['recent_updates'].empty:
-                        response += f"\n**Latest Update:**\n"
-                        latest = summary['recent_updates'].iloc[0]
-                        response += f"• {latest['summary']} (on {latest['update_date']})"
-                    
-                    return response
-                else:
-                    return f"❌ No project found matching '{project_name}' for your account."
+                response = f"📊 **Project Status: {project['project_name']}**\n\n"
+                response += f"**Client:** {project['client_name']}\n"
+                response += f"**Status:** {project['status']}\n"
+                response += f"**Software:** {project['software']}\n"
+                response += f"**Vendor:** {project['vendor']}\n"
+                response += f"**Start Date:** {project['start_date']}\n"
+                response += f"**Deadline:** {project['deadline']}\n\n"
+                response += f"**Summary:**\n"
+                response += f"• Total Meetings: {summary['meetings_count']}\n"
+                response += f"• Total Issues: {summary['issues_count']}\n"
+                response += f"• Pending Issues: {summary['pending_issues']}\n"
+                
+                if not summary['recent_updates'].empty:
+                    response += f"\n**Latest Update:**\n"
+                    latest = summary['recent_updates'].iloc[0]
+                    response += f"• {latest['summary']} (on {latest['update_date']})"
+                
+                return response + self._also_matching(others)
             else:
-                return f"❌ No project found matching '{project_name}'. Please check the project name."
+                return f"❌ No project found matching '{project_name}'. Please check the project name." + self._suggestions(others)
         else:
             return "❓ Please specify which project you'd like to check the status for."
     
     def _handle_meeting_query(self, query, user_id=None):
         """Handle meeting-related queries"""
-        project_name = self._extract_project_name(query)
+        projects, project_name, others = self._find_projects(query, user_id)
         
         if 'this month' in query:
             # Get meetings from current month
@@ -118,38 +139,32 @@ class ProjectChatbot:
         
         elif project_name:
             # Get meetings for specific project
-            projects = self.db.search_projects(project_name)
             if not projects.empty:
-                # Filter by user if specified
-                if user_id:
-                    projects = projects[projects['user_id'] == user_id]
+                if len(projects) > 1:
+                    return self._which_project(projects, project_name, others)
+                project = projects.iloc[0]
+                meetings = self.db.get_meetings_by_project(project['id'])
                 
-                if not projects.empty:
-                    project = projects.iloc[0]
-                    meetings = self.db.get_meetings_by_project(project['id'])
-                    
-                    if not meetings.empty:
-                        response = f"📅 **Meetings for {project['project_name']}:**\n\n"
-                        for _, meeting in meetings.iterrows():
-                            response += f"• **{meeting['meeting_date']}**\n"
-                            response += f"  Agenda: {meeting['agenda']}\n"
-                            response += f"  Attendees: {meeting['attendees']}\n"
-                            response += f"  MoM: {meeting['mom'][:150]}...\n"
-                            response += f"  Next Steps: {meeting['next_steps']}\n\n"
-                        return response
-                    else:
-                        return f"📅 No meetings found for {project['project_name']}."
+                if not meetings.empty:
+                    response = f"📅 **Meetings for {project['project_name']}:**\n\n"
+                    for _, meeting in meetings.iterrows():
+                        response += f"• **{meeting['meeting_date']}**\n"
+                        response += f"  Agenda: {meeting['agenda']}\n"
+                        response += f"  Attendees: {meeting['attendees']}\n"
+                        response += f"  MoM: {meeting['mom'][:150]}...\n"
+                        response += f"  Next Steps: {meeting['next_steps']}\n\n"
+                    return response + self._also_matching(others)
                 else:
-                    return f"❌ No project found matching '{project_name}' for your account."
+                    return f"📅 No meetings found for {project['project_name']}."
             else:
-                return f"❌ No project found matching '{project_name}'."
+                return f"❌ No project found matching '{project_name}'." + self._suggestions(others)
         
         else:
             return "❓ Please specify which project's meetings you'd like to see, or ask for 'meetings this month' or 'last meetings'."
     
     def _handle_issue_query(self, query, user_id=None):
         """Handle issue-related queries"""
-        project_name = self._extract_project_name(query)
+        projects, project_name, others = self._find_projects(query, user_id)
         
         if 'unresolved' in query or 'pending' in query:
             issues = self.db.get_all_issues(user_id)
@@ -160,7 +175,7 @@ class ProjectChatbot:
                     response = "🚨 **Pending Issues:**\n\n"
                     for _, issue in pending_issues.iterrows():
                         response += f"• **{issue['project_name']}** - {issue['date_reported']}\n"
-                        response += f"  Issue: {issue['issue_description']}\n"
+                        response += f"  Issue: {issue['description']}\n"
                         response += f"  Assigned to: {issue['assigned_to']}\n\n"
                     return response
                 else:
@@ -170,69 +185,57 @@ class ProjectChatbot:
         
         elif project_name:
             # Get issues for specific project
-            projects = self.db.search_projects(project_name)
             if not projects.empty:
-                # Filter by user if specified
-                if user_id:
-                    projects = projects[projects['user_id'] == user_id]
+                if len(projects) > 1:
+                    return self._which_project(projects, project_name, others)
+                project = projects.iloc[0]
+                issues = self.db.get_issues_by_project(project['id'])
                 
-                if not projects.empty:
-                    project = projects.iloc[0]
-                    issues = self.db.get_issues_by_project(project['id'])
-                    
-                    if not issues.empty:
-                        response = f"🚨 **Issues for {project['project_name']}:**\n\n"
-                        for _, issue in issues.iterrows():
-                            status_emoji = "🟡" if issue['status'] == 'Pending' else "✅"
-                            response += f"{status_emoji} **{issue['status']}** - {issue['date_reported']}\n"
-                            response += f"  Issue: {issue['issue_description']}\n"
-                            response += f"  Assigned to: {issue['assigned_to']}\n"
-                            if issue['resolution_date']:
-                                response += f"  Resolved: {issue['resolution_date']}\n"
-                            response += "\n"
-                        return response
-                    else:
-                        return f"📋 No issues found for {project['project_name']}."
+                if not issues.empty:
+                    response = f"🚨 **Issues for {project['project_name']}:**\n\n"
+                    for _, issue in issues.iterrows():
+                        status_emoji = "🟡" if issue['status'] == 'Pending' else "✅"
+                        response += f"{status_emoji} **{issue['status']}** - {issue['date_reported']}\n"
+                        response += f"  Issue: {issue['description']}\n"
+                        response += f"  Assigned to: {issue['assigned_to']}\n"
+                        if issue['resolution_date']:
+                            response += f"  Resolved: {issue['resolution_date']}\n"
+                        response += "\n"
+                    return response + self._also_matching(others)
                 else:
-                    return f"❌ No project found matching '{project_name}' for your account."
+                    return f"📋 No issues found for {project['project_name']}."
             else:
-                return f"❌ No project found matching '{project_name}'."
+                return f"❌ No project found matching '{project_name}'." + self._suggestions(others)
         
         else:
             return "❓ Please specify which project's issues you'd like to see, or ask for 'unresolved issues'."
     
     def _handle_update_query(self, query, user_id=None):
         """Handle client update queries"""
-        project_name = self._extract_project_name(query)
+        projects, project_name, others = self._find_projects(query, user_id)
         
         if 'last' in query and 'update' in query:
             if project_name:
-                projects = self.db.search_projects(project_name)
                 if not projects.empty:
-                    # Filter by user if specified
-                    if user_id:
-                        projects = projects[projects['user_id'] == user_id]
+                    if len(projects) > 1:
+                        return self._which_project(projects, project_name, others)
+                    project = projects.iloc[0]
+                    updates = self.db.get_client_updates_by_project(project['id'], user_id)
                     
-                    if not projects.empty:
-                        project = projects.iloc[0]
-                        updates = self.db.get_client_updates_by_project(project['id'], user_id)
-                        
-                        if not updates.empty:
-                            latest = updates.iloc[0]
-                            response = f"📧 **Latest Update for {project['project_name']}:**\n\n"
-                            response += f"**Date:** {latest['update_date']}\n"
-                            response += f"**Summary:** {latest['summary']}\n"
-                            response += f"**Sent by:** {latest['sent_by']}\n"
-                            response += f"**Mode:** {latest['mode']}\n"
-                            response += f"**Client Feedback:** {latest['client_feedback']}\n"
-                            response += f"**Next Step:** {latest['next_step']}\n"
-                            return response
-                        else:
-                            return f"📧 No updates found for {project['project_name']}."
+                    if not updates.empty:
+                        latest = updates.iloc[0]
+                        response = f"📧 **Latest Update for {project['project_name']}:**\n\n"
+                        response += f"**Date:** {latest['update_date']}\n"
+                        response += f"**Summary:** {latest['summary']}\n"
+                        response += f"**Sent by:** {latest['sent_by']}\n"
+                        response += f"**Mode:** {latest['mode']}\n"
+                        response += f"**Client Feedback:** {latest['client_feedback']}\n"
+                        response += f"**Next Step:** {latest['next_step']}\n"
+                        return response + self._also_matching(others)
                     else:
-                        return f"❌ No project found matching '{project_name}' for your account."
+                        return f"📧 No updates found for {project['project_name']}."
                 else:
-                    return f"❌ No project found matching '{project_name}'."
+                    return f"❌ No project found matching '{project_name}'." + self._suggestions(others)
             else:
                 # Get recent updates for all projects
                 projects = self.db.get_all_projects(user_id)
@@ -262,31 +265,25 @@ class ProjectChatbot:
         
         elif project_name:
             # Get all updates for specific project
-            projects = self.db.search_projects(project_name)
             if not projects.empty:
-                # Filter by user if specified
-                if user_id:
-                    projects = projects[projects['user_id'] == user_id]
+                if len(projects) > 1:
+                    return self._which_project(projects, project_name, others)
+                project = projects.iloc[0]
+                updates = self.db.get_client_updates_by_project(project['id'], user_id)
                 
-                if not projects.empty:
-                    project = projects.iloc[0]
-                    updates = self.db.get_client_updates_by_project(project['id'], user_id)
-                    
-                    if not updates.empty:
-                        response = f"📧 **Updates for {project['project_name']}:**\n\n"
-                        for _, update in updates.iterrows():
-                            response += f"• **{update['update_date']}** - {update['mode']}\n"
-                            response += f"  Summary: {update['summary']}\n"
-                            response += f"  Sent by: {update['sent_by']}\n"
-                            response += f"  Feedback: {update['client_feedback']}\n"
-                            response += f"  Next Step: {update['next_step']}\n\n"
-                        return response
-                    else:
-                        return f"📧 No updates found for {project['project_name']}."
+                if not updates.empty:
+                    response = f"📧 **Updates for {project['project_name']}:**\n\n"
+                    for _, update in updates.iterrows():
+                        response += f"• **{update['update_date']}** - {update['mode']}\n"
+                        response += f"  Summary: {update['summary']}\n"
+                        response += f"  Sent by: {update['sent_by']}\n"
+                        response += f"  Feedback: {update['client_feedback']}\n"
+                        response += f"  Next Step: {update['next_step']}\n\n"
+                    return response + self._also_matching(others)
                 else:
-                    return f"❌ No project found matching '{project_name}' for your account."
+                    return f"📧 No updates found for {project['project_name']}."
             else:
-                return f"❌ No project found matching '{project_name}'."
+                return f"❌ No project found matching '{project_name}'." + self._suggestions(others)
         
         else:
             return "❓ Please specify which project's updates you'd like to see, or ask for 'last update'."
@@ -315,38 +312,98 @@ class ProjectChatbot:
         
         elif 'client' in query:
             # Extract client name and show their projects
-            client_name = self._extract_project_name(query)
+            projects, client_name, others = self._find_projects(query, user_id)
             if client_name:
-                projects = self.db.search_projects(client_name)
                 if not projects.empty:
-                    # Filter by user if specified
-                    if user_id:
-                        projects = projects[projects['user_id'] == user_id]
-                    
-                    if not projects.empty:
-                        response = f"📋 **Projects for {client_name}:**\n\n"
-                        for _, project in projects.iterrows():
-                            status_emoji = {
-                                'In Progress': '🟡',
-                                'Completed': '✅',
-                                'On Hold': '🔴'
-                            }.get(project['status'], '⚪')
-                            
-                            response += f"{status_emoji} **{project['project_name']}**\n"
-                            response += f"  Software: {project['software']}\n"
-                            response += f"  Status: {project['status']}\n"
-                            response += f"  Deadline: {project['deadline']}\n\n"
-                        return response
-                    else:
-                        return f"📋 No projects found for {client_name} in your account."
+                    response = f"📋 **Projects for {client_name}:**\n\n"
+                    for _, project in projects.iterrows():
+                        status_emoji = {
+                            'In Progress': '🟡',
+                            'Completed': '✅',
+                            'On Hold': '🔴'
+                        }.get(project['status'], '⚪')
+                        
+                        response += f"{status_emoji} **{project['project_name']}**\n"
+                        response += f"  Software: {project['software']}\n"
+                        response += f"  Status: {project['status']}\n"
+                        response += f"  Deadline: {project['deadline']}\n\n"
+                    return response + self._also_matching(others)
                 else:
-                    return f"📋 No projects found for {client_name}."
+                    return f"📋 No projects found for {client_name}." + self._suggestions(others)
             else:
                 return "❓ Please specify which client's projects you'd like to see."
         
         else:
             return "❓ Please specify what you'd like to know about projects. Try 'show all projects' or 'projects for [client name]'."
     
+    def _on_write(self, user_id, version, projects):
+        """Apply a write to the user's index and move it to the new version.
+        
+        Only possible when the index was at the version just before this
+        write and the write says which projects it changed; otherwise the
+        index is marked stale and reloaded on its next lookup.
+        """
+        with self._entity_indexes_lock:
+            indexed_version, index = self._entity_indexes.get(user_id, (None, None))
+            if index is None:
+                return
+            if version is None or projects is None or indexed_version != version - 1:
+                self._entity_indexes[user_id] = (None, index)
+                return
+            index.apply(projects)
+            self._entity_indexes[user_id] = (version, index)
+    
+    def _entity_index(self, user_id):
+        """The user's project/client name index, reloaded only when their data version moved without a write from this process"""
+        version = self.db.get_data_version(user_id)
+        with self._entity_indexes_lock:
+            indexed_version, index = self._entity_indexes.get(user_id, (None, None))
+            if index is None:
+                index = EntityIndex(ENTITY_STOPWORDS)
+                self._entity_indexes[user_id] = (None, index)
+        if indexed_version != version:
+            projects = self.db.get_all_projects(user_id)
+            index.refresh(projects.to_dict('records'))
+            with self._entity_indexes_lock:
+                # Tagged with the version read before loading, so a write landing mid-reload forces another
+                self._entity_indexes[user_id] = (version, index)
+        return index
+    
+    def _find_projects(self, query, user_id=None):
+        """Resolve the project or client named in a query against the user's name index.
+        
+        Returns (projects, name, others): the best candidate's projects (newest
+        first), its name (or the text looked for when nothing matched) and other
+        candidate names - close alternatives when found, suggestions when not.
+        name is None when nothing in the query resolves and no name pattern fits.
+        """
+        if user_id is None:
+            # Names are only resolved within one user's projects, never across everyone's
+            return pd.DataFrame(), self._extract_project_name(query), []
+        # The whole query is resolved: its intent words and filler are index stopwords
+        candidates = self._entity_index(user_id).resolve(query)
+        if not candidates:
+            return pd.DataFrame(), self._extract_project_name(query), []
+        matches = [c for c in candidates if c['score'] >= ENTITY_INDEX_CONFIG["min_score"]]
+        if not matches:
+            return pd.DataFrame(), self._extract_project_name(query) or query, [c['name'] for c in candidates]
+        best = matches[0]
+        others = [c['name'] for c in matches[1:] if best['score'] - c['score'] <= ENTITY_INDEX_CONFIG["ambiguity_margin"]]
+        return pd.DataFrame(best['projects']), best['name'], others
+    
+    def _which_project(self, projects, name, others):
+        """Ask which project was meant when the name matched several (a client with more than one)"""
+        response = f"🔎 **{name}** matches {len(projects)} projects. Which one did you mean?\n\n"
+        for _, project in projects.iterrows():
+            response += f"• **{project['project_name']}** ({project['status']})\n"
+        return response + self._also_matching(others)
+    
+    def _also_matching(self, names):
+        return f"\n\n🔎 Also matching: {', '.join(names)}" if names else ""
+    
+    def _suggestions(self, names):
+        return f" Did you mean: {', '.join(names)}?" if names else ""
+    
     def _extract_project_name(self, query):
         """Extract project or client name from query"""
         # Common patterns for project/client names
@@ -27,6 +27,66 @@ AUTHENTICATOR_CONFIG = {
     "cookie_expiry_days": 1
 }
 
+# Password hashing settings (scrypt work factor; run `python password_hashing.py --calibrate`
+# on the production host to pick "n" for the latency budget)
+PASSWORD_HASH_CONFIG = {
+    "n": int(os.getenv("PASSWORD_SCRYPT_N", 2 ** 14)),
+    "r": 8,
+    "p": 1,
+    "salt_bytes": 16,
+    "key_bytes": 32,
+    "latency_budget_ms": 250,
+    "verify_workers": 4,
+    "bulk_hash_workers": 2,
+    "verify_timeout_seconds": 10
+}
+
+# Login rate limiting (token buckets per email and per client, with
+# exponential lockout after repeated failures)
+LOGIN_RATE_LIMIT_CONFIG = {
+    "email_capacity": 5,
+    "email_refill_seconds": 30,
+    "client_capacity": 20,
+    "client_refill_seconds": 6,
+    "email_backoff_after_failures": 3,
+    "client_backoff_after_failures": 10,
+    # Shared by every attempt whose client address is unknown
+    "unattributed_capacity": 100,
+    "unattributed_refill_seconds": 1,
+    "unattributed_backoff_after_failures": 50,
+    "backoff_base_seconds": 2,
+    "backoff_max_seconds": 15 * 60,
+    "max_tracked_keys": 10000,  # least recently updated keys are evicted beyond this
+    # Reverse proxies in front of the app; X-Forwarded-For is ignored when 0
+    "trusted_proxy_count": int(os.getenv("LOGIN_TRUSTED_PROXY_COUNT", "0")),
+    "persist": os.getenv("LOGIN_RATE_LIMIT_PERSIST", "false").lower() == "true"
+}
+
+# Streamlit cache settings (query results are keyed on user id plus a
+# per-user data version that every write bumps)
+CACHE_CONFIG = {
+    "query_ttl_seconds": 600,
+    "query_max_entries": 2000,
+    "profile_ttl_seconds": 3600,
+    "profile_max_entries": 1000,
+    "figure_max_entries": 500,
+    "prefetch_on_login": True
+}
+
+# Cross-process caching for deployments running several Streamlit workers.
+# When enabled, per-user data versions are kept in the database (a write in one
+# worker invalidates cached reads in all of them) and query results and figure
+# specs are also stored in the shared backend ("sqlite" file or "none")
+SHARED_CACHE_CONFIG = {
+    "enabled": os.getenv("SHARED_CACHE", "false").lower() == "true",
+    "backend": os.getenv("SHARED_CACHE_BACKEND", "sqlite"),
+    "path": os.getenv("SHARED_CACHE_PATH", "shared_cache.db"),
+    "namespace": os.getenv("SHARED_CACHE_NAMESPACE", "projectops"),
+    "ttl_seconds": 600,
+    "max_entries": 20000,
+    "version_refresh_seconds": 1.0
+}
+
 # UI Configuration
 UI_CONFIG = {
     "page_title": "ProjectOps Assistant",
@@ -35,6 +95,38 @@ UI_CONFIG = {
     "initial_sidebar_state": "expanded"
 }
 
+# Project card grid pagination
+PROJECT_CARD_PAGE_SIZES = [6, 12, 24, 48]
+PROJECT_CARD_DEFAULT_PAGE_SIZE = 12
+
+# Most projects offered at once by project pickers; a search narrows the list
+PROJECT_PICKER_LIMIT = 50
+
+# Profile pictures are stored only as resized, content-hashed variants
+PROFILE_PICTURE_CONFIG = {
+    "dir": "profile_pics",
+    "sizes": [60, 200],
+    "format": "WEBP",  # or "JPEG"
+    "quality": 85,
+    "max_upload_bytes": 5 * 1024 * 1024,
+    "max_pixels": 40_000_000
+}
+
+# Global search (full-text index over projects, meetings, client updates and issues)
+SEARCH_CONFIG = {
+    "page_size": 20,
+    "max_terms": 8,
+    "snippet_words": 24
+}
+
+# Chatbot project/client name resolution (trigram similarity, 0-1)
+ENTITY_INDEX_CONFIG = {
+    "token_similarity": 0.4,   # a query word counts as a typo/partial of a name word above this
+    "min_score": 0.5,          # candidates below this are only offered as suggestions
+    "ambiguity_margin": 0.1,   # other candidates this close to the best are listed too
+    "max_candidates": 5
+}
+
 # Chart colors
 CHART_COLORS = {
     'in_progress': '#ffd700',
@@ -115,7 +207,9 @@ EXPORT_CONFIG = {
     "excel": {
         "sheet_name": "Data",
         "index": False
-    }
+    },
+    # The in-app audit log download is built in memory; larger exports go through export_audit_logs.py
+    "audit_log_ui_max_rows": 50000
 }
 
 # Analytics settings
@@ -1,15 +1,40 @@
 import pandas as pd
 import sqlalchemy
-from sqlalchemy import create_engine, text, MetaData, Table, Column, Integer, String, DateTime, Text
+from sqlalchemy import create_engine, text, bindparam, MetaData, Table, Column, Integer, String, DateTime, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import streamlit as st
 from datetime import datetime
+import json
 import os
+import threading
+import time
+
+from config import SEARCH_CONFIG, SHARED_CACHE_CONFIG
+from query_stats import install_query_counter, query_scope
+from search_index import MARK_START, MARK_END, SEARCH_SOURCES, create_search_index, fts5_query, query_terms, tsquery
 
 Base = declarative_base()
 
+PROJECT_COLUMNS = ['id', 'project_name', 'client_name', 'software', 'vendor', 'start_date', 'deadline', 'status', 'description', 'file_path', 'user_id']
+MEETING_COLUMNS = ['id', 'project_id', 'meeting_date', 'attendees', 'agenda', 'mom', 'next_steps', 'follow_up_date', 'user_id']
+CLIENT_UPDATE_COLUMNS = ['id', 'project_id', 'update_date', 'summary', 'sent_by', 'mode', 'client_feedback', 'next_step', 'user_id']
+ISSUE_COLUMNS = ['id', 'project_id', 'date_reported', 'description', 'status', 'assigned_to', 'resolution_date', 'user_id']
+SEARCH_RESULT_COLUMNS = ['entity_type', 'entity_id', 'project_id', 'project_name', 'entity_date', 'title', 'snippet']
+
 class ProjectOpsDatabase:
+    # Per-user data versions, shared by every instance in the process. Write
+    # methods bump them so cached reads keyed on the version go stale. With
+    # SHARED_CACHE_CONFIG enabled the versions live in the data_versions table
+    # and this dict holds each user's last read, refreshed every few seconds.
+    _data_versions = {}
+    _data_versions_checked = {}
+    _data_versions_lock = threading.Lock()
+    # Called after every write made through this process with (user_id,
+    # version, projects); see bump_data_version. In-memory indexes use them
+    # to follow local writes instead of reloading on the version change
+    _write_listeners = []
+
     def __init__(self, connection_string=None):
         """Initialize PostgreSQL database connection"""
         if connection_string is None:
@@ -20,12 +45,72 @@ class ProjectOpsDatabase:
                 connection_string = os.getenv("DB_URL", "sqlite:///projectops.db")
         
         self.engine = create_engine(connection_string)
+        install_query_counter(self.engine)
+        self.shared_versions = SHARED_CACHE_CONFIG["enabled"]
         self.Session = sessionmaker(bind=self.engine)
         self.metadata = MetaData()
         
         # Create tables if they don't exist
         self._create_tables()
     
+    def get_data_version(self, user_id):
+        """Return the current data version token for a user"""
+        if not self.shared_versions:
+            return self._data_versions.get(user_id, 0)
+        checked = self._data_versions_checked.get(user_id)
+        if checked is not None and time.monotonic() - checked < SHARED_CACHE_CONFIG["version_refresh_seconds"]:
+            return self._data_versions.get(user_id, 0)
+        try:
+            with query_scope("data_versions"), self.engine.connect() as conn:
+                version = conn.execute(
+                    text("SELECT version FROM data_versions WHERE user_id = :user_id"),
+                    {"user_id": user_id if user_id is not None else 0}
+                ).scalar()
+        except Exception:
+            # Keep serving the last known version until the database answers again
+            return self._data_versions.get(user_id, 0)
+        with self._data_versions_lock:
+            self._data_versions[user_id] = version or 0
+            self._data_versions_checked[user_id] = time.monotonic()
+        return version or 0
+
+    def add_write_listener(self, callback):
+        """Register callback(user_id, version, projects) to run after each write"""
+        with self._data_versions_lock:
+            if callback not in self._write_listeners:
+                self._write_listeners.append(callback)
+
+    def bump_data_version(self, user_id, projects=None):
+        """Invalidate cached reads for a user after a write.
+        
+        projects describes the write to listeners: {project id: new row, or
+        None when deleted}, {} when no project changed, None when any of the
+        user's projects may have. version is None when the bump failed.
+        """
+        version = None
+        if not self.shared_versions:
+            with self._data_versions_lock:
+                version = self._data_versions[user_id] = self._data_versions.get(user_id, 0) + 1
+        else:
+            try:
+                with query_scope("data_versions"), self.engine.connect() as conn:
+                    params = {"user_id": user_id if user_id is not None else 0}
+                    conn.execute(text("""
+                        INSERT INTO data_versions (user_id, version) VALUES (:user_id, 1)
+                        ON CONFLICT (user_id) DO UPDATE SET version = data_versions.version + 1
+                    """), params)
+                    version = conn.execute(text("SELECT version FROM data_versions WHERE user_id = :user_id"), params).scalar()
+                    conn.commit()
+                with self._data_versions_lock:
+                    self._data_versions[user_id] = version
+                    self._data_versions_checked[user_id] = time.monotonic()
+            except Exception as e:
+                st.error(f"Error updating data version: {e}")
+                # Re-read on the next lookup rather than trusting the local copy
+                self._data_versions_checked.pop(user_id, None)
+        for callback in list(self._write_listeners):
+            callback(user_id, version, projects)
+
     def _create_tables(self):
         """Create database tables if they don't exist"""
         try:
@@ -82,12 +167,62 @@ class ProjectOpsDatabase:
                 Column('user_id', Integer)
             )
             
+            # Per-user data versions shared between app processes
+            data_versions_table = Table('data_versions', self.metadata,
+                Column('user_id', Integer, primary_key=True, autoincrement=False),
+                Column('version', Integer, nullable=False, default=0)
+            )
+            
             # Create all tables
             self.metadata.create_all(self.engine)
+            self._create_indexes()
+            self._create_full_text_index()
             
         except Exception as e:
             st.error(f"Error creating tables: {e}")
     
+    def _create_indexes(self):
+        """Create indexes used by the per-user and per-project queries (create_all skips existing tables)"""
+        indexes = [
+            "CREATE INDEX IF NOT EXISTS idx_projects_user_status ON projects (user_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_meetings_user_date ON meetings (user_id, meeting_date)",
+            "CREATE INDEX IF NOT EXISTS idx_client_updates_user_date ON client_updates (user_id, update_date)",
+            "CREATE INDEX IF NOT EXISTS idx_issues_user_status ON issues (user_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_issues_user_date ON issues (user_id, date_reported)",
+            "CREATE INDEX IF NOT EXISTS idx_meetings_project_date ON meetings (project_id, meeting_date)",
+            "CREATE INDEX IF NOT EXISTS idx_client_updates_project_date ON client_updates (project_id, update_date)",
+            "CREATE INDEX IF NOT EXISTS idx_issues_project_date ON issues (project_id, date_reported)",
+        ]
+        with self.engine.connect() as conn:
+            for statement in indexes:
+                conn.execute(text(statement))
+            conn.commit()
+        if self.engine.dialect.name == "postgresql":
+            self._create_search_indexes()
+
+    def _create_search_indexes(self):
+        """Trigram indexes so the project search's LOWER(...) LIKE '%term%' can use an index on PostgreSQL"""
+        statements = [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            "CREATE INDEX IF NOT EXISTS idx_projects_name_trgm ON projects USING gin (LOWER(project_name) gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS idx_projects_client_trgm ON projects USING gin (LOWER(client_name) gin_trgm_ops)",
+        ]
+        try:
+            with self.engine.connect() as conn:
+                for statement in statements:
+                    conn.execute(text(statement))
+                conn.commit()
+        except Exception:
+            # pg_trgm may not be installable for this role; search still works as a scan
+            pass
+    
+    def _create_full_text_index(self):
+        """Full-text index behind the global search page (see search_index.py)"""
+        try:
+            create_search_index(self.engine)
+        except Exception as e:
+            st.error(f"Error creating search index: {e}")
+
     def add_project(self, project_name, client_name, software, vendor, start_date, deadline, status, description, file_path=None, user_id=None):
         """Add a new project"""
         try:
@@ -95,8 +230,9 @@ class ProjectOpsDatabase:
                 query = text("""
                     INSERT INTO projects (project_name, client_name, software, vendor, start_date, deadline, status, description, file_path, user_id)
                     VALUES (:project_name, :client_name, :software, :vendor, :start_date, :deadline, :status, :description, :file_path, :user_id)
+                    RETURNING id
                 """)
-                conn.execute(query, {
+                row = {
                     'project_name': project_name,
                     'client_name': client_name,
                     'software': software,
@@ -107,8 +243,10 @@ class ProjectOpsDatabase:
                     'description': description,
                     'file_path': file_path,
                     'user_id': user_id
-                })
+                }
+                project_id = conn.execute(query, row).scalar()
                 conn.commit()
+                self.bump_data_version(user_id, {project_id: {'id': project_id, **row}})
                 return True
         except Exception as e:
             st.error(f"Error adding project: {e}")
@@ -158,6 +296,7 @@ class ProjectOpsDatabase:
                     'user_id': user_id
                 })
                 conn.commit()
+                self.bump_data_version(user_id, {})
                 return True
         except Exception as e:
             st.error(f"Error adding meeting: {e}")
@@ -218,11 +357,42 @@ class ProjectOpsDatabase:
                     'user_id': user_id
                 })
                 conn.commit()
+                self.bump_data_version(user_id, {})
                 return True
         except Exception as e:
             st.error(f"Error adding client update: {e}")
             return False
     
+    def get_all_client_updates(self, user_id=None):
+        """Get all client updates with project names (optionally filtered by user)"""
+        try:
+            if user_id:
+                query = text("""
+                    SELECT cu.*, p.project_name 
+                    FROM client_updates cu 
+                    JOIN projects p ON cu.project_id = p.id 
+                    WHERE cu.user_id = :user_id
+                    ORDER BY cu.update_date DESC
+                """)
+                params = {'user_id': user_id}
+            else:
+                query = text("""
+                    SELECT cu.*, p.project_name 
+                    FROM client_updates cu 
+                    JOIN projects p ON cu.project_id = p.id 
+                    ORDER BY cu.update_date DESC
+                """)
+                params = {}
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, params).fetchall()
+                if rows:
+                    columns = ['id', 'project_id', 'update_date', 'summary', 'sent_by', 'mode', 'client_feedback', 'next_step', 'user_id', 'project_name']
+                    return pd.DataFrame(rows, columns=columns)
+                return pd.DataFrame()
+        except Exception as e:
+            st.error(f"Error getting client updates: {e}")
+            return pd.DataFrame()
+    
     def get_client_updates_by_project(self, project_id, user_id=None):
         """Get client updates for a specific project"""
         try:
@@ -278,6 +448,7 @@ class ProjectOpsDatabase:
                     'user_id': user_id
                 })
                 conn.commit()
+                self.bump_data_version(user_id, {})
                 return True
         except Exception as e:
             st.error(f"Error adding issue: {e}")
@@ -319,24 +490,174 @@ class ProjectOpsDatabase:
             st.error(f"Error getting issues: {e}")
             return pd.DataFrame()
     
-    def search_projects(self, search_term):
+    def search_projects(self, search_term, user_id=None):
         """Search projects by name or client"""
         try:
-            query = text("""
-                SELECT * FROM projects 
-                WHERE project_name ILIKE :search_term OR client_name ILIKE :search_term
-                ORDER BY id DESC
-            """)
+            where, params = self._project_filter_clause(user_id, search=search_term)
+            query = text(f"SELECT * FROM projects WHERE {where} ORDER BY id DESC")
             with self.engine.connect() as conn:
-                result = conn.execute(query, {'search_term': f'%{search_term}%'})
-                rows = result.fetchall()
+                rows = conn.execute(query, params).fetchall()
                 if rows:
-                    columns = ['id', 'project_name', 'client_name', 'software', 'vendor', 'start_date', 'deadline', 'status', 'description', 'file_path', 'user_id']
-                    return pd.DataFrame(rows, columns=columns)
+                    return pd.DataFrame(rows, columns=PROJECT_COLUMNS)
                 return pd.DataFrame()
         except Exception as e:
             st.error(f"Error searching projects: {e}")
             return pd.DataFrame()
+
+    def _global_search_query(self, search, user_id=None, entity_types=None):
+        """Match expression, extra WHERE conditions and parameters for the search index, or None without terms"""
+        terms = query_terms(search)
+        if not terms:
+            return None
+        entity_types = [entity_type for entity_type in entity_types or [] if entity_type in SEARCH_SOURCES]
+        if self.engine.dialect.name != "postgresql":
+            return "search_index MATCH :query", {'query': fts5_query(terms, user_id, entity_types)}
+        conditions, params = ["s.document @@ to_tsquery('english', :query)"], {'query': tsquery(terms)}
+        if user_id:
+            conditions.append("s.user_id = :user_id")
+            params['user_id'] = user_id
+        if entity_types:
+            conditions.append("s.entity_type IN :entity_types")
+            params['entity_types'] = entity_types
+        return " AND ".join(conditions), params
+
+    def count_global_search(self, search, user_id=None, entity_types=None):
+        """Number of projects, meetings, client updates and issues matching a search"""
+        try:
+            clause = self._global_search_query(search, user_id, entity_types)
+            if clause is None:
+                return 0
+            where, params = clause
+            query = text(f"SELECT COUNT(*) FROM search_index s WHERE {where}")
+            if 'entity_types' in params:
+                query = query.bindparams(bindparam('entity_types', expanding=True))
+            with self.engine.connect() as conn:
+                return conn.execute(query, params).scalar() or 0
+        except Exception as e:
+            st.error(f"Error counting search results: {e}")
+            return 0
+
+    def global_search(self, search, user_id=None, entity_types=None, limit=None, offset=0):
+        """One page of search hits across all entity types, best match first, with highlighted title and snippet.
+
+        Only the page's rows are highlighted and joined to their project.
+        """
+        try:
+            clause = self._global_search_query(search, user_id, entity_types)
+            if clause is None:
+                return pd.DataFrame(columns=SEARCH_RESULT_COLUMNS)
+            where, params = clause
+            params.update({
+                'limit': limit or SEARCH_CONFIG["page_size"], 'offset': offset,
+                'mark_start': MARK_START, 'mark_end': MARK_END
+            })
+            if self.engine.dialect.name == "postgresql":
+                params['title_options'] = f"HighlightAll=true, StartSel={MARK_START}, StopSel={MARK_END}"
+                params['snippet_options'] = (
+                    f"MaxWords={SEARCH_CONFIG['snippet_words']}, MinWords={SEARCH_CONFIG['snippet_words'] // 2}, "
+                    f"MaxFragments=2, FragmentDelimiter=\" … \", StartSel={MARK_START}, StopSel={MARK_END}"
+                )
+                query = text(f"""
+                    SELECT hits.entity_type, hits.entity_id, hits.project_id, p.project_name, hits.entity_date,
+                           ts_headline('english', hits.title, to_tsquery('english', :query), :title_options),
+                           ts_headline('english', hits.body, to_tsquery('english', :query), :snippet_options)
+                    FROM (
+                        SELECT s.*, ts_rank_cd(s.document, to_tsquery('english', :query)) AS rank
+                        FROM search_index s
+                        WHERE {where}
+                        ORDER BY rank DESC, s.entity_type, s.entity_id DESC
+                        LIMIT :limit OFFSET :offset
+                    ) hits
+                    LEFT JOIN projects p ON p.id = hits.project_id
+                    ORDER BY hits.rank DESC, hits.entity_type, hits.entity_id DESC
+                """)
+            else:
+                # bm25 weights follow the FTS5 column order; matches in the title count four times.
+                # The page is ranked first, then each hit is looked up by rowid for highlighting.
+                query = text(f"""
+                    SELECT s.entity_type, s.entity_id, s.project_id, p.project_name, s.entity_date,
+                           highlight(search_index, 5, :mark_start, :mark_end),
+                           snippet(search_index, 6, :mark_start, :mark_end, ' … ', {SEARCH_CONFIG['snippet_words']})
+                    FROM (
+                        SELECT s.rowid AS hit, bm25(search_index, 0, 0, 0, 0, 0, 4.0, 1.0) AS score
+                        FROM search_index s
+                        WHERE {where}
+                        ORDER BY score, s.rowid DESC
+                        LIMIT :limit OFFSET :offset
+                    ) hits
+                    CROSS JOIN search_index s
+                    LEFT JOIN projects p ON p.id = s.project_id
+                    WHERE {where} AND s.rowid = hits.hit
+                    ORDER BY hits.score, hits.hit DESC
+                """)
+            if 'entity_types' in params:
+                query = query.bindparams(bindparam('entity_types', expanding=True))
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, params).fetchall()
+                return pd.DataFrame(rows, columns=SEARCH_RESULT_COLUMNS)
+        except Exception as e:
+            st.error(f"Error searching: {e}")
+            return pd.DataFrame(columns=SEARCH_RESULT_COLUMNS)
+
+    @staticmethod
+    def _project_filter_clause(user_id=None, status=None, software=None, search=None):
+        """WHERE clause and parameters for the Project Tracker filters; search is a case-insensitive substring match"""
+        conditions = ["project_name IS NOT NULL", "TRIM(project_name) <> ''"]
+        params = {}
+        if user_id:
+            conditions.append("user_id = :user_id")
+            params['user_id'] = user_id
+        if status:
+            conditions.append("status = :status")
+            params['status'] = status
+        if software:
+            conditions.append("software = :software")
+            params['software'] = software
+        if search:
+            escaped = search.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("(LOWER(project_name) LIKE :search ESCAPE '\\' OR LOWER(client_name) LIKE :search ESCAPE '\\')")
+            params['search'] = f"%{escaped}%"
+        return " AND ".join(conditions), params
+
+    def count_filtered_projects(self, user_id=None, status=None, software=None, search=None):
+        """Number of projects matching the Project Tracker filters"""
+        try:
+            where, params = self._project_filter_clause(user_id, status, software, search)
+            with self.engine.connect() as conn:
+                return conn.execute(text(f"SELECT COUNT(*) FROM projects WHERE {where}"), params).scalar() or 0
+        except Exception as e:
+            st.error(f"Error counting projects: {e}")
+            return 0
+
+    def filter_projects(self, user_id=None, status=None, software=None, search=None, limit=None, offset=0):
+        """Projects matching the Project Tracker filters, newest first; limit/offset select one page"""
+        try:
+            where, params = self._project_filter_clause(user_id, status, software, search)
+            page_clause = ""
+            if limit:
+                page_clause = "LIMIT :limit OFFSET :offset"
+                params.update({'limit': limit, 'offset': offset})
+            query = text(f"SELECT * FROM projects WHERE {where} ORDER BY id DESC {page_clause}")
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, params).fetchall()
+                return pd.DataFrame(rows, columns=PROJECT_COLUMNS)
+        except Exception as e:
+            st.error(f"Error filtering projects: {e}")
+            return pd.DataFrame(columns=PROJECT_COLUMNS)
+
+    def get_project_filter_options(self, user_id=None):
+        """Distinct statuses and software values for the Project Tracker dropdowns"""
+        try:
+            user_filter = "AND user_id = :user_id" if user_id else ""
+            options = {}
+            with self.engine.connect() as conn:
+                for column in ("status", "software"):
+                    query = text(f"SELECT DISTINCT {column} FROM projects WHERE {column} IS NOT NULL {user_filter} ORDER BY {column}")
+                    options[column] = [row[0] for row in conn.execute(query, {'user_id': user_id})]
+            return options
+        except Exception as e:
+            st.error(f"Error getting project filter options: {e}")
+            return {'status': [], 'software': []}
     
     def delete_project(self, project_id):
         """Delete a project and all related data"""
@@ -356,15 +677,239 @@ class ProjectOpsDatabase:
                 conn.execute(delete_meetings, {'project_id': project_id})
                 
                 # Delete the project
+                owner = conn.execute(text("SELECT user_id FROM projects WHERE id = :project_id"), {'project_id': project_id}).fetchone()
                 delete_project = text("DELETE FROM projects WHERE id = :project_id")
                 result = conn.execute(delete_project, {'project_id': project_id})
                 conn.commit()
+                if owner:
+                    self.bump_data_version(owner[0], {project_id: None})
                 
                 return result.rowcount > 0
         except Exception as e:
             st.error(f"Error deleting project: {e}")
             return False
     
+    def get_project_activity_counts(self, project_ids, user_id=None):
+        """Meeting, update and issue counts for the given projects in one query"""
+        if not project_ids:
+            return {}
+        try:
+            user_filter = " AND {alias}.user_id = :user_id" if user_id else ""
+            query = text(f"""
+                SELECT p.id,
+                    (SELECT COUNT(*) FROM meetings m WHERE m.project_id = p.id{user_filter.format(alias='m')}),
+                    (SELECT COUNT(*) FROM client_updates cu WHERE cu.project_id = p.id{user_filter.format(alias='cu')}),
+                    (SELECT COUNT(*) FROM issues i WHERE i.project_id = p.id{user_filter.format(alias='i')})
+                FROM projects p
+                WHERE p.id IN :project_ids
+            """).bindparams(bindparam('project_ids', expanding=True))
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, {'project_ids': [int(pid) for pid in project_ids], 'user_id': user_id}).fetchall()
+                return {row[0]: {'meetings': row[1], 'updates': row[2], 'issues': row[3]} for row in rows}
+        except Exception as e:
+            st.error(f"Error getting project activity counts: {e}")
+            return {}
+
+    def get_dashboard_metrics(self, user_id=None):
+        """All dashboard KPIs in one round trip using conditional aggregation"""
+        metrics = {
+            'total_projects': 0, 'active_projects': 0, 'completed_projects': 0, 'on_hold_projects': 0,
+            'total_meetings': 0, 'total_updates': 0, 'total_issues': 0, 'pending_issues': 0
+        }
+        try:
+            user_filter = "WHERE user_id = :user_id" if user_id else ""
+            query = text(f"""
+                SELECT p.total_projects, p.active_projects, p.completed_projects, p.on_hold_projects,
+                       m.total_meetings, cu.total_updates, i.total_issues, i.pending_issues
+                FROM (
+                    SELECT COUNT(*) AS total_projects,
+                           COALESCE(SUM(CASE WHEN status = 'In Progress' THEN 1 ELSE 0 END), 0) AS active_projects,
+                           COALESCE(SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END), 0) AS completed_projects,
+                           COALESCE(SUM(CASE WHEN status = 'On Hold' THEN 1 ELSE 0 END), 0) AS on_hold_projects
+                    FROM projects {user_filter}
+                ) p
+                CROSS JOIN (SELECT COUNT(*) AS total_meetings FROM meetings {user_filter}) m
+                CROSS JOIN (SELECT COUNT(*) AS total_updates FROM client_updates {user_filter}) cu
+                CROSS JOIN (
+                    SELECT COUNT(*) AS total_issues,
+                           COALESCE(SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END), 0) AS pending_issues
+                    FROM issues {user_filter}
+                ) i
+            """)
+            with self.engine.connect() as conn:
+                row = conn.execute(query, {'user_id': user_id}).fetchone()
+                if row:
+                    metrics.update({key: int(value or 0) for key, value in row._mapping.items()})
+            return metrics
+        except Exception as e:
+            st.error(f"Error getting dashboard metrics: {e}")
+            return metrics
+
+    def get_project_status_counts(self, user_id=None):
+        """Number of projects per status"""
+        try:
+            user_filter = "WHERE user_id = :user_id" if user_id else ""
+            query = text(f"SELECT status, COUNT(*) FROM projects {user_filter} GROUP BY status ORDER BY COUNT(*) DESC")
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, {'user_id': user_id}).fetchall()
+                return {status: count for status, count in rows}
+        except Exception as e:
+            st.error(f"Error getting project status counts: {e}")
+            return {}
+
+    def get_recent_projects(self, user_id=None, limit=10):
+        """Most recently created projects, only the columns the dashboard shows"""
+        try:
+            user_filter = "WHERE user_id = :user_id" if user_id else ""
+            query = text(f"""
+                SELECT id, project_name, client_name, software, status, start_date
+                FROM projects {user_filter}
+                ORDER BY id DESC
+                LIMIT :limit
+            """)
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, {'user_id': user_id, 'limit': limit}).fetchall()
+                if rows:
+                    columns = ['id', 'project_name', 'client_name', 'software', 'status', 'start_date']
+                    return pd.DataFrame(rows, columns=columns)
+                return pd.DataFrame()
+        except Exception as e:
+            st.error(f"Error getting recent projects: {e}")
+            return pd.DataFrame()
+
+    def get_recent_meetings(self, user_id=None, limit=5):
+        """Latest meetings with their project names, at most limit rows"""
+        try:
+            user_filter = "WHERE m.user_id = :user_id" if user_id else ""
+            query = text(f"""
+                SELECT m.id, m.project_id, p.project_name, m.meeting_date, m.agenda
+                FROM meetings m JOIN projects p ON m.project_id = p.id
+                {user_filter}
+                ORDER BY m.meeting_date DESC, m.id DESC
+                LIMIT :limit
+            """)
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, {'user_id': user_id, 'limit': limit}).fetchall()
+                if rows:
+                    columns = ['id', 'project_id', 'project_name', 'meeting_date', 'agenda']
+                    return pd.DataFrame(rows, columns=columns)
+                return pd.DataFrame()
+        except Exception as e:
+            st.error(f"Error getting recent meetings: {e}")
+            return pd.DataFrame()
+
+    def get_meetings_by_project(self, project_id, user_id=None):
+        """Get meetings for a specific project, newest first"""
+        return self._get_project_children(
+            "meetings", MEETING_COLUMNS, "meeting_date", project_id, user_id, "meetings"
+        )
+
+    def get_issues_by_project(self, project_id, user_id=None):
+        """Get issues for a specific project, newest first"""
+        return self._get_project_children(
+            "issues", ISSUE_COLUMNS, "date_reported", project_id, user_id, "issues"
+        )
+
+    def _get_project_children(self, table, columns, date_column, project_id, user_id, label):
+        try:
+            user_filter = " AND c.user_id = :user_id" if user_id else ""
+            select_list = ", ".join(f"c.{column}" for column in columns)
+            query = text(f"""
+                SELECT {select_list}, p.project_name
+                FROM {table} c
+                JOIN projects p ON c.project_id = p.id
+                WHERE c.project_id = :project_id{user_filter}
+                ORDER BY c.{date_column} DESC, c.id DESC
+            """)
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, {'project_id': int(project_id), 'user_id': user_id}).fetchall()
+                if rows:
+                    return pd.DataFrame(rows, columns=columns + ['project_name'])
+                return pd.DataFrame()
+        except Exception as e:
+            st.error(f"Error getting {label}: {e}")
+            return pd.DataFrame()
+
+    def _json_rows(self, alias, columns):
+        """SQL aggregating a child table's rows into a JSON array of objects"""
+        pairs = ", ".join(f"'{column}', {alias}.{column}" for column in columns)
+        if self.engine.dialect.name == "sqlite":
+            return f"COALESCE(json_group_array(json_object({pairs})), '[]')"
+        return f"COALESCE(json_agg(json_build_object({pairs})), '[]')"
+
+    def get_project_bundle(self, project_id, user_id=None):
+        """A project with its meetings, client updates and issues in one round trip"""
+        bundle = {'project': None, 'meetings': pd.DataFrame(), 'updates': pd.DataFrame(), 'issues': pd.DataFrame()}
+        try:
+            user_filter = " AND {alias}.user_id = :user_id" if user_id else ""
+            project_list = ", ".join(f"p.{column}" for column in PROJECT_COLUMNS)
+            query = text(f"""
+                SELECT {project_list},
+                    (SELECT {self._json_rows('m', MEETING_COLUMNS)} FROM meetings m
+                     WHERE m.project_id = p.id{user_filter.format(alias='m')}) AS meetings,
+                    (SELECT {self._json_rows('cu', CLIENT_UPDATE_COLUMNS)} FROM client_updates cu
+                     WHERE cu.project_id = p.id{user_filter.format(alias='cu')}) AS updates,
+                    (SELECT {self._json_rows('i', ISSUE_COLUMNS)} FROM issues i
+                     WHERE i.project_id = p.id{user_filter.format(alias='i')}) AS issues
+                FROM projects p
+                WHERE p.id = :project_id
+            """)
+            with self.engine.connect() as conn:
+                row = conn.execute(query, {'project_id': int(project_id), 'user_id': user_id}).fetchone()
+            if not row:
+                return bundle
+            bundle['project'] = dict(zip(PROJECT_COLUMNS, row[:len(PROJECT_COLUMNS)]))
+            children = row[len(PROJECT_COLUMNS):]
+            for key, columns, date_column, value in (
+                ('meetings', MEETING_COLUMNS, 'meeting_date', children[0]),
+                ('updates', CLIENT_UPDATE_COLUMNS, 'update_date', children[1]),
+                ('issues', ISSUE_COLUMNS, 'date_reported', children[2]),
+            ):
+                # PostgreSQL drivers decode json columns; SQLite returns the text
+                records = json.loads(value) if isinstance(value, str) else (value or [])
+                if records:
+                    bundle[key] = pd.DataFrame(records, columns=columns).sort_values(
+                        [date_column, 'id'], ascending=False, ignore_index=True
+                    )
+            return bundle
+        except Exception as e:
+            st.error(f"Error getting project details: {e}")
+            return bundle
+
+    def _delete_record(self, table, record_id):
+        """Delete one row by id and invalidate its owner's cached reads"""
+        with self.engine.connect() as conn:
+            owner = conn.execute(text(f"SELECT user_id FROM {table} WHERE id = :id"), {'id': int(record_id)}).fetchone()
+            result = conn.execute(text(f"DELETE FROM {table} WHERE id = :id"), {'id': int(record_id)})
+            conn.commit()
+        if owner:
+            self.bump_data_version(owner[0], {})
+        return result.rowcount > 0
+
+    def delete_meeting(self, meeting_id):
+        """Delete a meeting"""
+        try:
+            return self._delete_record("meetings", meeting_id)
+        except Exception as e:
+            st.error(f"Error deleting meeting: {e}")
+            return False
+
+    def delete_client_update(self, update_id):
+        """Delete a client update"""
+        try:
+            return self._delete_record("client_updates", update_id)
+        except Exception as e:
+            st.error(f"Error deleting client update: {e}")
+            return False
+
+    def delete_issue(self, issue_id):
+        """Delete an issue"""
+        try:
+            return self._delete_record("issues", issue_id)
+        except Exception as e:
+            st.error(f"Error deleting issue: {e}")
+            return False
+
     def get_project_by_id(self, project_id):
         """Get a specific project by ID"""
         try:
@@ -419,6 +964,7 @@ class ProjectOpsDatabase:
                 {"file_path": file_path, "user_id": user_id}
             )
             conn.commit()
+        self.bump_data_version(user_id, {})
 
     def get_user_profile_picture(self, user_id):
         with self.engine.connect() as conn:
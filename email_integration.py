@@ -17,7 +17,20 @@ import base64
 import os
 import time
 
+from intent_matcher import IntentMatcher
+
+# Keywords for the different types of project communications, in priority order
+EMAIL_TYPE_KEYWORDS = {
+    'issue': ['bug', 'error', 'problem', 'issue', 'broken', 'not working', 'failed', 'crash', 'defect'],
+    'query': ['question', 'query', 'help', 'support', 'how to', 'what is', 'clarification', 'advice'],
+    'update': ['update', 'progress', 'status', 'milestone', 'completed', 'finished', 'delivered', 'review'],
+    'meeting': ['meeting', 'call', 'discussion', 'agenda', 'schedule', 'appointment']
+}
+EMAIL_TYPE_CONFIDENCE = {'issue': 0.8, 'query': 0.7, 'update': 0.6, 'meeting': 0.5, 'general': 0.0}
+
 class OutlookEmailIntegration:
+    email_intent_matcher = IntentMatcher(EMAIL_TYPE_KEYWORDS)
+
     def __init__(self):
         """Initialize Outlook email integration"""
         self.base_url = "https://graph.microsoft.com/v1.0"
@@ -217,31 +230,12 @@ class OutlookEmailIntegration:
         body = email['body'].lower()
         from_email = email['from'].lower()
         
-        # Keywords for different types of project communications
-        issue_keywords = ['bug', 'error', 'problem', 'issue', 'broken', 'not working', 'failed', 'crash', 'defect']
-        query_keywords = ['question', 'query', 'help', 'support', 'how to', 'what is', 'clarification', 'advice']
-        update_keywords = ['update', 'progress', 'status', 'milestone', 'completed', 'finished', 'delivered', 'review']
-        meeting_keywords = ['meeting', 'call', 'discussion', 'agenda', 'schedule', 'appointment']
-        
         # Check if email is from a client (external domain)
         is_client_email = not any(domain in from_email for domain in ['@yourcompany.com', '@internal.com'])
         
-        # Determine email type
-        email_type = 'general'
-        confidence = 0.0
-        
-        if any(keyword in subject or keyword in body for keyword in issue_keywords):
-            email_type = 'issue'
-            confidence = 0.8
-        elif any(keyword in subject or keyword in body for keyword in query_keywords):
-            email_type = 'query'
-            confidence = 0.7
-        elif any(keyword in subject or keyword in body for keyword in update_keywords):
-            email_type = 'update'
-            confidence = 0.6
-        elif any(keyword in subject or keyword in body for keyword in meeting_keywords):
-            email_type = 'meeting'
-            confidence = 0.5
+        # Determine email type: the highest-priority type with a keyword in the subject or body
+        email_type = self.email_intent_matcher.first(f"{subject}\n{body}", 'general')
+        confidence = EMAIL_TYPE_CONFIDENCE[email_type]
         
         # Extract potential project name from subject or body
         project_name = self._extract_project_name(subject, body)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Entity Index for ProjectOps
+In-memory fuzzy lookup of one user's projects and clients for the chatbot.
+Names are split into normalized tokens and every token into character
+trigrams, so typos ("epicr"), partial words ("acm") and filler around a name
+("for acme project please") still resolve, with ranked candidates when more
+than one entity fits. Refreshing from a new project list only re-indexes the
+rows that changed, and apply() takes single writes without a reload
+"""
+
+import heapq
+import re
+import threading
+import unicodedata
+from collections import Counter
+from itertools import chain
+
+from config import ENTITY_INDEX_CONFIG
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_tokens(text):
+    """Lower-cased, accent-free word tokens of a name or query"""
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode("ascii")
+    return _NON_WORD.sub(" ", text.lower()).split()
+
+
+def trigrams(token):
+    """Character trigrams of one token, padded like pg_trgm so short tokens and word starts count"""
+    padded = f"  {token} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class EntityIndex:
+    """Trigram index over project names and client names.
+
+    refresh() takes the user's project rows (dicts with at least id,
+    project_name and client_name); resolve() returns ranked candidates, each
+    with the project rows it stands for. stopwords are ignored in queries and
+    names unless a name consists of nothing else.
+    """
+
+    def __init__(self, stopwords=()):
+        self.stopwords = frozenset(stopwords)
+        self._lock = threading.Lock()
+        self._projects = {}          # project id -> row
+        self._entities = {}          # (type, key) -> {'type', 'name', 'tokens', 'token_set', 'project_ids'}
+        self._token_entities = {}    # token -> set of entity keys
+        self._gram_tokens = {}       # trigram -> set of tokens
+        self._token_grams = {}       # token -> trigrams
+
+    def _content_tokens(self, text, keep_all=False):
+        tokens = normalize_tokens(text)
+        content = [token for token in tokens if token not in self.stopwords and token.rstrip("s") not in self.stopwords]
+        return content or (tokens if keep_all else [])
+
+    def _add_token(self, token, key):
+        if token not in self._token_grams:
+            grams = trigrams(token)
+            self._token_grams[token] = grams
+            for gram in grams:
+                self._gram_tokens.setdefault(gram, set()).add(token)
+        self._token_entities.setdefault(token, set()).add(key)
+
+    def _remove_token(self, token, key):
+        keys = self._token_entities.get(token)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del self._token_entities[token]
+            for gram in self._token_grams.pop(token):
+                tokens = self._gram_tokens[gram]
+                tokens.discard(token)
+                if not tokens:
+                    del self._gram_tokens[gram]
+
+    def _add_entity(self, key, name, project_id):
+        entity = self._entities.get(key)
+        if entity is None:
+            tokens = tuple(self._content_tokens(name, keep_all=True))
+            entity = {'type': key[0], 'name': name, 'tokens': tokens, 'token_set': frozenset(tokens), 'project_ids': set()}
+            self._entities[key] = entity
+            for token in set(entity['tokens']):
+                self._add_token(token, key)
+        entity['project_ids'].add(project_id)
+
+    def _remove_entity(self, key, project_id):
+        entity = self._entities[key]
+        entity['project_ids'].discard(project_id)
+        if not entity['project_ids']:
+            del self._entities[key]
+            for token in set(entity['tokens']):
+                self._remove_token(token, key)
+
+    @staticmethod
+    def _keys(row):
+        client = " ".join(normalize_tokens(row.get('client_name')))
+        keys = [('project', row['id'])]
+        if client:
+            keys.append(('client', client))
+        return keys
+
+    def _drop(self, project_id):
+        for key in self._keys(self._projects.pop(project_id)):
+            self._remove_entity(key, project_id)
+
+    def _put(self, row):
+        """Index a row, re-indexing its names only when they changed"""
+        project_id = row['id']
+        old = self._projects.get(project_id)
+        if old is not None and (row.get('project_name'), row.get('client_name')) != (old.get('project_name'), old.get('client_name')):
+            self._drop(project_id)
+            old = None
+        if old is None:
+            for key in self._keys(row):
+                name = row.get('project_name') if key[0] == 'project' else row.get('client_name')
+                self._add_entity(key, name, project_id)
+        # Other columns (status, deadline, ...) may change without touching the names
+        self._projects[project_id] = row
+
+    def refresh(self, rows):
+        """Bring the index in line with the user's current project rows; unchanged rows are left alone"""
+        rows = {row['id']: row for row in rows}
+        with self._lock:
+            for project_id in [project_id for project_id in self._projects if project_id not in rows]:
+                self._drop(project_id)
+            for row in rows.values():
+                self._put(row)
+
+    def apply(self, changes):
+        """Apply single-project writes: changes maps project id -> new row, or None when deleted"""
+        with self._lock:
+            for project_id, row in changes.items():
+                if row is not None:
+                    self._put(row)
+                elif project_id in self._projects:
+                    self._drop(project_id)
+
+    def _similar_tokens(self, token):
+        """{indexed token: Dice similarity} for tokens sharing enough trigrams with token"""
+        grams = trigrams(token)
+        shared = {}
+        for gram in grams:
+            for candidate in self._gram_tokens.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        threshold = ENTITY_INDEX_CONFIG["token_similarity"]
+        similar = {}
+        for candidate, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._token_grams[candidate]))
+            if score >= threshold:
+                similar[candidate] = score
+        return similar
+
+    def _candidates(self, entity_sets):
+        """Entities matching every query word, or failing that the ones matching the most"""
+        if len(entity_sets) == 1:
+            return entity_sets[0]
+        common = set.intersection(*entity_sets)
+        if common:
+            return common
+        counts = Counter(chain.from_iterable(entity_sets))
+        best = max(counts.values())
+        return [key for key, count in counts.items() if count == best]
+
+    def resolve(self, text, limit=None, min_score=0.0):
+        """Ranked candidates for the entity named in text, best first.
+
+        Each candidate is a dict with type ('project' or 'client'), name,
+        score (0-1: how much of the name and of the query are covered) and
+        the matching project rows.
+        """
+        limit = limit or ENTITY_INDEX_CONFIG["max_candidates"]
+        query_tokens = list(dict.fromkeys(self._content_tokens(text)))
+        if not query_tokens:
+            return []
+        with self._lock:
+            # Per query word: {indexed token: similarity}; words matching nothing still count against coverage
+            similar = [self._similar_tokens(token) for token in query_tokens]
+            entity_sets = [set().union(*(self._token_entities[token] for token in tokens)) for tokens in similar if tokens]
+            if not entity_sets:
+                return []
+            best_similarity = {}
+            for tokens in similar:
+                for token, similarity in tokens.items():
+                    if similarity > best_similarity.get(token, 0.0):
+                        best_similarity[token] = similarity
+
+            candidates = []
+            for key in self._candidates(entity_sets):
+                entity = self._entities[key]
+                names = entity['token_set']
+                query_coverage = sum(max(map(tokens.get, names & tokens.keys()), default=0.0) for tokens in similar)
+                name_coverage = sum(best_similarity.get(token, 0.0) for token in entity['tokens'])
+                score = (query_coverage / len(query_tokens) + name_coverage / len(entity['tokens'])) / 2
+                if score >= min_score:
+                    candidates.append((score, entity))
+            best = heapq.nsmallest(limit, candidates, key=lambda candidate: (-candidate[0], candidate[1]['type'] != 'project', candidate[1]['name']))
+            return [{
+                'type': entity['type'],
+                'name': entity['name'],
+                'score': round(score, 3),
+                'projects': sorted(
+                    (self._projects[project_id] for project_id in entity['project_ids']),
+                    key=lambda row: row['id'], reverse=True
+                )
+            } for score, entity in best]
+
+    def __len__(self):
+        return len(self._projects)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Audit Log Export for Project Tracker
+Streams filtered audit logs to a CSV file without loading them into memory
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from neon_auth import auth
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export audit logs to CSV")
+    parser.add_argument("output", help="CSV file to write, or - for stdout")
+    parser.add_argument("--admin-id", type=int, help="Only actions by this admin")
+    parser.add_argument("--action", help="Only this action")
+    parser.add_argument("--target-user-id", type=int, help="Only actions on this user")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Earliest timestamp (inclusive), ISO format")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Latest timestamp (exclusive), ISO format")
+    args = parser.parse_args()
+
+    filters = {
+        'admin_id': args.admin_id,
+        'action': args.action,
+        'target_user_id': args.target_user_id,
+        'start': args.start,
+        'end': args.end
+    }
+    if args.output == "-":
+        row_count = auth.export_audit_logs_csv(sys.stdout, **filters)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as output:
+            row_count = auth.export_audit_logs_csv(output, **filters)
+    print(f"✅ Exported {row_count} audit log rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
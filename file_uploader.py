@@ -155,28 +155,37 @@ def render_file_management_section(project_name, client_name):
     else:
         st.info("📁 No files uploaded for this project yet.")
 
-def render_bulk_file_upload():
-    """Render bulk file upload section"""
+def render_bulk_file_upload(user_id):
+    """Render bulk file upload section for one user's projects"""
     st.subheader("📦 Bulk File Upload")
     
     uploader = FileUploader()
     
-    # Project selection
-    from database_postgres import ProjectOpsDatabase
-    db = ProjectOpsDatabase()
-    projects = db.get_all_projects()
+    # Project selection: only the newest matches are sent to the browser, the search finds the rest
+    from app_cache import cached_filtered_project_count, cached_filtered_projects
+    from config import PROJECT_PICKER_LIMIT
+    search = st.text_input(
+        "Find project", placeholder="Search by name or client", key="bulk_upload_project_search"
+    ).strip() or None
+    projects = cached_filtered_projects(user_id, search=search, limit=PROJECT_PICKER_LIMIT)
     
     if not projects.empty:
-        project_options = projects[['id', 'project_name', 'client_name']].values.tolist()
-        project_dict = {f"{name} ({client})": (id, name, client) for id, name, client in project_options}
+        match_count = cached_filtered_project_count(user_id, search=search) if len(projects) == PROJECT_PICKER_LIMIT else len(projects)
+        if match_count > len(projects):
+            st.caption(f"Showing the {len(projects)} newest of {match_count} matching projects; search to narrow the list.")
+        project_dict = {
+            id: (name, client) for id, name, client in projects[['id', 'project_name', 'client_name']].values.tolist()
+        }
         
         selected_project = st.selectbox(
             "Select project for file upload",
-            list(project_dict.keys())
+            list(project_dict.keys()),
+            format_func=lambda id: f"{project_dict[id][0]} ({project_dict[id][1]})"
         )
         
         if selected_project:
-            project_id, project_name, client_name = project_dict[selected_project]
+            project_id = selected_project
+            project_name, client_name = project_dict[selected_project]
             
             # Multiple file upload
             uploaded_files = st.file_uploader(
@@ -199,6 +208,8 @@ def render_bulk_file_upload():
                             uploaded_count += 1
                     
                     st.success(f"✅ Successfully uploaded {uploaded_count}/{len(uploaded_files)} files")
+    elif search:
+        st.info(f"No projects match '{search}'.")
     else:
         st.warning("⚠️ No projects found. Please create a project first.")
 
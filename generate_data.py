@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator for ProjectOps
+Deterministic, seedable fixture data for load and performance testing: users,
+projects and their meetings, issues and client updates with realistic
+status, software and date distributions. Rows are generated lazily and
+written with batched executemany inserts, so large datasets stream into the
+database without being held in memory
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from config import COMMUNICATION_MODES, ISSUE_STATUS_OPTIONS, PROJECT_STATUS_OPTIONS, SOFTWARE_OPTIONS
+
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 5000
+
+# Relative weights: most projects are live, few are cancelled; Epicor/MYOB dominate
+PROJECT_STATUS_WEIGHTS = dict(zip(PROJECT_STATUS_OPTIONS, [50, 15, 30, 5]))
+SOFTWARE_WEIGHTS = dict(zip(SOFTWARE_OPTIONS, [30, 25, 15, 10, 8, 6, 4, 2]))
+ISSUE_STATUS_WEIGHTS = dict(zip(ISSUE_STATUS_OPTIONS, [35, 20, 35, 10]))
+
+# Per project: (mean, max) of each child record
+MEETINGS_PER_PROJECT = (3, 12)
+ISSUES_PER_PROJECT = (2, 10)
+UPDATES_PER_PROJECT = (2, 8)
+
+CLIENT_PREFIXES = ["ATH", "ATS", "HFC", "LTA", "FMF", "FEA", "PAFCO", "VB", "Carpenters", "Motibhai", "Courts", "RB Patel"]
+CLIENT_SUFFIXES = ["Manufacturing", "Holdings", "Retail", "Logistics", "Group", "Solutions", "Limited", "Trading"]
+PROJECT_KINDS = ["Implementation", "Upgrade", "Migration", "Support", "Rollout", "Integration"]
+PEOPLE = ["Jayshil Singh", "Support Team", "Finance Lead", "IT Manager", "Vendor Consultant", "Project Sponsor"]
+AGENDAS = ["Kickoff", "Requirements review", "Data migration", "UAT sign-off", "Go-live readiness", "Status review"]
+ISSUE_TOPICS = ["Report totals mismatch", "Login failure", "Slow posting", "Interface error", "Missing permissions", "Print layout"]
+
+INSERT_USER = text("""
+    INSERT INTO users (email, password_hash, full_name, role, is_active, must_change_password)
+    VALUES (:email, :password_hash, :full_name, :role, :is_active, :must_change_password)
+""")
+INSERT_PROJECT = text("""
+    INSERT INTO projects (id, project_name, client_name, software, vendor, start_date, deadline, status, description, user_id)
+    VALUES (:id, :project_name, :client_name, :software, :vendor, :start_date, :deadline, :status, :description, :user_id)
+""")
+INSERT_MEETING = text("""
+    INSERT INTO meetings (project_id, meeting_date, attendees, agenda, mom, next_steps, follow_up_date, user_id)
+    VALUES (:project_id, :meeting_date, :attendees, :agenda, :mom, :next_steps, :follow_up_date, :user_id)
+""")
+INSERT_ISSUE = text("""
+    INSERT INTO issues (project_id, date_reported, description, status, assigned_to, resolution_date, user_id)
+    VALUES (:project_id, :date_reported, :description, :status, :assigned_to, :resolution_date, :user_id)
+""")
+INSERT_UPDATE = text("""
+    INSERT INTO client_updates (project_id, update_date, summary, sent_by, mode, client_feedback, next_step, user_id)
+    VALUES (:project_id, :update_date, :summary, :sent_by, :mode, :client_feedback, :next_step, :user_id)
+""")
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _child_count(rng, mean_and_max):
+    """Skewed count: most projects have a few records, some have many"""
+    mean, maximum = mean_and_max
+    return min(maximum, int(rng.expovariate(1 / mean)))
+
+
+def _day_between(rng, start, end):
+    return start + timedelta(days=rng.randint(0, max(0, (end - start).days)))
+
+
+class DataGenerator:
+    """Generates one dataset; the same seed and arguments always produce the same rows"""
+
+    def __init__(self, seed=DEFAULT_SEED, today=None):
+        self.rng = random.Random(seed)
+        self.today = today or date(2025, 6, 30)
+        self.clients = [f"{prefix} {suffix}" for prefix in CLIENT_PREFIXES for suffix in CLIENT_SUFFIXES]
+
+    def users(self, count, password_hash, email_domain="example.com"):
+        for i in range(count):
+            yield {
+                'email': f"user{i + 1}@{email_domain}",
+                'password_hash': password_hash,
+                'full_name': f"Synthetic User {i + 1}",
+                'role': 'user',
+                'is_active': True,
+                'must_change_password': False
+            }
+
+    def projects(self, count, user_ids, first_id=1):
+        """Yield (project, children) pairs; children are the project's meetings, issues and updates"""
+        rng = self.rng
+        for i in range(count):
+            project_id = first_id + i
+            user_id = user_ids[i % len(user_ids)]
+            client = rng.choice(self.clients)
+            software = _weighted(rng, SOFTWARE_WEIGHTS)
+            status = _weighted(rng, PROJECT_STATUS_WEIGHTS)
+            start = self.today - timedelta(days=rng.randint(0, 3 * 365))
+            deadline = start + timedelta(days=rng.randint(30, 540))
+            project = {
+                'id': project_id,
+                'project_name': f"{software} {rng.choice(PROJECT_KINDS)} - {client} #{project_id}",
+                'client_name': client,
+                'software': software,
+                'vendor': software,
+                'start_date': start.isoformat(),
+                'deadline': deadline.isoformat(),
+                'status': status,
+                'description': f"{rng.choice(PROJECT_KINDS)} of {software} for {client}.",
+                'user_id': user_id
+            }
+            active_until = min(deadline, self.today)
+            yield project, {
+                'meetings': [self._meeting(project_id, user_id, start, active_until) for _ in range(_child_count(rng, MEETINGS_PER_PROJECT))],
+                'issues': [self._issue(project_id, user_id, start, active_until) for _ in range(_child_count(rng, ISSUES_PER_PROJECT))],
+                'updates': [self._update(project_id, user_id, start, active_until) for _ in range(_child_count(rng, UPDATES_PER_PROJECT))]
+            }
+
+    def _meeting(self, project_id, user_id, start, end):
+        rng = self.rng
+        meeting_date = _day_between(rng, start, end)
+        agenda = rng.choice(AGENDAS)
+        return {
+            'project_id': project_id,
+            'meeting_date': meeting_date.isoformat(),
+            'attendees': ", ".join(rng.sample(PEOPLE, 3)),
+            'agenda': agenda,
+            'mom': f"{agenda} held; actions agreed with the client.",
+            'next_steps': "Follow up on open actions",
+            'follow_up_date': (meeting_date + timedelta(days=rng.choice([7, 14, 30]))).isoformat(),
+            'user_id': user_id
+        }
+
+    def _issue(self, project_id, user_id, start, end):
+        rng = self.rng
+        reported = _day_between(rng, start, end)
+        status = _weighted(rng, ISSUE_STATUS_WEIGHTS)
+        resolved = status in ("Resolved", "Closed")
+        return {
+            'project_id': project_id,
+            'date_reported': reported.isoformat(),
+            'description': rng.choice(ISSUE_TOPICS),
+            'status': status,
+            'assigned_to': rng.choice(PEOPLE),
+            'resolution_date': (reported + timedelta(days=rng.randint(1, 45))).isoformat() if resolved else None,
+            'user_id': user_id
+        }
+
+    def _update(self, project_id, user_id, start, end):
+        rng = self.rng
+        return {
+            'project_id': project_id,
+            'update_date': _day_between(rng, start, end).isoformat(),
+            'summary': f"{rng.choice(AGENDAS)} progress shared with the client",
+            'sent_by': rng.choice(PEOPLE),
+            'mode': rng.choice(COMMUNICATION_MODES),
+            'client_feedback': rng.choice(["Happy with progress", "Requested changes", "No response", "Approved"]),
+            'next_step': "Continue as planned",
+            'user_id': user_id
+        }
+
+
+def _insert_batches(conn, statement, rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            conn.execute(statement, batch)
+            batch = []
+    if batch:
+        conn.execute(statement, batch)
+
+
+def generate_dataset(engine, projects, users=0, user_ids=None, seed=DEFAULT_SEED, batch_size=DEFAULT_BATCH_SIZE, password="synthetic-password"):
+    """Write users and projects (with child records) into an existing schema; returns row counts.
+
+    Projects are spread round-robin over user_ids plus any generated users.
+    """
+    from password_hashing import hash_password
+
+    generator = DataGenerator(seed)
+    counts = {'users': 0, 'projects': 0, 'meetings': 0, 'issues': 0, 'client_updates': 0}
+    with engine.connect() as conn:
+        owner_ids = list(user_ids or [])
+        if users:
+            start = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM users")).scalar()
+            domain = f"synthetic{seed}.example.com"
+            # One hash shared by every generated user; hashing is deliberately slow
+            _insert_batches(conn, INSERT_USER, generator.users(users, hash_password(password), domain), batch_size)
+            owner_ids += [row[0] for row in conn.execute(
+                text("SELECT id FROM users WHERE id > :start AND email LIKE :domain ORDER BY id"),
+                {'start': start, 'domain': f"%@{domain}"}
+            )]
+            counts['users'] = users
+        if not owner_ids:
+            raise ValueError("No users to own the projects; pass user_ids or users > 0")
+
+        # Ids are assigned here so child rows can reference them without reading them back
+        first_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM projects")).scalar() + 1
+        children = {'meetings': [], 'issues': [], 'updates': []}
+        statements = {'meetings': INSERT_MEETING, 'issues': INSERT_ISSUE, 'updates': INSERT_UPDATE}
+        project_batch = []
+
+        def flush():
+            conn.execute(INSERT_PROJECT, project_batch)
+            counts['projects'] += len(project_batch)
+            project_batch.clear()
+            for kind, rows in children.items():
+                if rows:
+                    conn.execute(statements[kind], rows)
+                    counts['client_updates' if kind == 'updates' else kind] += len(rows)
+                    rows.clear()
+
+        for project, project_children in generator.projects(projects, owner_ids, first_id):
+            project_batch.append(project)
+            for kind, rows in project_children.items():
+                children[kind].extend(rows)
+            if len(project_batch) >= batch_size:
+                flush()
+        if project_batch:
+            flush()
+
+        if engine.dialect.name == "postgresql":
+            # Explicit ids bypass the serial sequence; move it past them
+            conn.execute(text("SELECT setval(pg_get_serial_sequence('projects', 'id'), (SELECT MAX(id) FROM projects))"))
+        conn.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic ProjectOps data")
+    parser.add_argument("--projects", type=int, default=1000, help="Number of projects to generate")
+    parser.add_argument("--users", type=int, default=10, help="Number of users to create and spread projects over")
+    parser.add_argument("--owner-email", action="append", default=[], help="Existing user who should also own projects (repeatable)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed; the same seed gives the same data")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per executemany batch")
+    parser.add_argument("--password", default="synthetic-password", help="Password for every generated user")
+    args = parser.parse_args()
+
+    # Writes to the DB_URL database (Streamlit secrets, then the environment) with every table created
+    from neon_auth import auth
+    engine = auth.db.engine
+
+    user_ids = []
+    if args.owner_email:
+        with engine.connect() as conn:
+            for email in args.owner_email:
+                user_id = conn.execute(text("SELECT id FROM users WHERE email = :email"), {'email': email}).scalar()
+                if user_id is None:
+                    print(f"⚠️ No user {email}; skipping")
+                else:
+                    user_ids.append(user_id)
+    if not args.users and not user_ids:
+        print("❌ Nobody to own the projects: pass --users or an existing --owner-email")
+        return
+
+    print(f"🧪 Generating {args.projects} projects for {args.users} new users (seed {args.seed})...")
+    started = time.perf_counter()
+    counts = generate_dataset(engine, args.projects, args.users, user_ids, args.seed, args.batch_size, args.password)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Inserted in {elapsed:.1f}s: " + ", ".join(f"{count} {name}" for name, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Intent Matcher for ProjectOps
+Keyword routing for the chatbot and the email classifier. All keywords of all
+intents are compiled into one regex with word boundaries, shaped as a trie
+(keywords sharing a prefix share a branch), so a single scan of the text
+finds every intent that matches and how often, instead of one substring
+search per keyword. Routing to the first intent tries intents in priority
+order and runs each one's regex only where a substring scan finds a keyword
+"""
+
+import re
+
+# Plural and verb endings accepted after a keyword ("meetings", "crashed", "updated", "crashing")
+KEYWORD_SUFFIX = r"(?:s|es|ed|d|ing)?"
+
+# Trie edge for the final "e" of a keyword, which "-ing" replaces ("schedule" -> "scheduling")
+_FINAL_E = "e|ing"
+
+
+def _normalize(phrase):
+    return " ".join(phrase.lower().split())
+
+
+def _stem(keyword):
+    """Keyword without a final "e", which is dropped before "-ing"; None when it has none to drop"""
+    return keyword[:-1] if keyword.endswith("e") and len(keyword) > 2 else None
+
+
+def _prefix(keyword):
+    """Prefix every match of keyword starts with: its first word, less any final "e" """
+    word = keyword.split()[0]
+    return _stem(word) or word if word == keyword else word
+
+
+def _edge(char):
+    if char == " ":
+        return r"\s+"
+    if char == _FINAL_E:
+        return r"(?:e|(?=ing))"
+    return re.escape(char)
+
+
+def trie_pattern(keywords):
+    """Regex alternation of keywords with common prefixes factored out: a|ab|ac -> a(?:b|c)?"""
+    trie = {}
+    for keyword in keywords:
+        stem = _stem(keyword)
+        node = trie
+        for char in (stem if stem else keyword):
+            node = node.setdefault(char, {})
+        if stem:
+            node = node.setdefault(_FINAL_E, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [_edge(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node:
+            return f"(?:{'|'.join(branches)})?"
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    return emit(trie)
+
+
+class IntentMatcher:
+    """Finds every intent whose keywords occur in a text, in one regex pass.
+
+    intents maps intent name -> keywords and its order is the priority used
+    by first(). A keyword may belong to several intents; matching ignores
+    case and multi-word keywords match across any run of whitespace.
+    """
+
+    def __init__(self, intents):
+        self.priority = {intent: rank for rank, intent in enumerate(intents)}
+        self._intents_by_keyword = {}
+        for intent, keywords in intents.items():
+            for keyword in keywords:
+                self._intents_by_keyword.setdefault(_normalize(keyword), []).append(intent)
+        keywords = list(self._intents_by_keyword)
+        # "updating" is captured as the stem "updat"
+        for keyword in keywords:
+            stem = _stem(keyword)
+            if stem:
+                stem_intents = self._intents_by_keyword.setdefault(stem, [])
+                stem_intents.extend(intent for intent in self._intents_by_keyword[keyword] if intent not in stem_intents)
+        # The text is lower-cased once instead of compiling with re.IGNORECASE, which is several times slower
+        self._pattern = re.compile(rf"\b({trie_pattern(keywords)}){KEYWORD_SUFFIX}\b")
+        # For first(): one pattern per intent, in priority order, with the prefixes its matches start with
+        self._routes = []
+        for intent, intent_keywords in intents.items():
+            intent_keywords = [_normalize(keyword) for keyword in intent_keywords]
+            prefixes = tuple({_prefix(keyword) for keyword in intent_keywords})
+            pattern = re.compile(rf"\b(?:{trie_pattern(intent_keywords)}){KEYWORD_SUFFIX}\b")
+            self._routes.append((intent, prefixes, pattern))
+
+    def _intents(self, keyword):
+        intents = self._intents_by_keyword.get(keyword)
+        return intents if intents is not None else self._intents_by_keyword[_normalize(keyword)]
+
+    def scores(self, text):
+        """{intent: number of keyword hits} for every intent found in text"""
+        scores = {}
+        for keyword in self._pattern.findall((text or "").lower()):
+            for intent in self._intents(keyword):
+                scores[intent] = scores.get(intent, 0) + 1
+        return scores
+
+    def match(self, text):
+        """[(intent, hits)] for every intent found, most hits first, ties by priority"""
+        return sorted(self.scores(text).items(), key=lambda item: (-item[1], self.priority[item[0]]))
+
+    def first(self, text, default=None):
+        """Highest-priority intent found in text, or default when none matches.
+
+        Intents are tried in priority order and the first hit wins. Each
+        intent's regex is only tried where str.find locates one of its keyword
+        prefixes, so a long email costs a few substring scans, not a regex
+        attempt at every position.
+        """
+        text = (text or "").lower()
+        for intent, prefixes, pattern in self._routes:
+            for prefix in prefixes:
+                start = text.find(prefix)
+                while start != -1:
+                    if pattern.match(text, start):
+                        return intent
+                    start = text.find(prefix, start + 1)
+        return default
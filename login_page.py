@@ -5,7 +5,9 @@ Handles user authentication UI
 """
 
 import streamlit as st
+from app_cache import prefetch_user_snapshot
 from neon_auth import auth
+from rate_limiter import get_client_id
 
 def render_login_page():
     """Render the login page (no public registration)"""
@@ -46,7 +48,7 @@ def render_login_form():
             if not email or not password:
                 st.error("❌ Please fill in all fields")
             else:
-                success, result = auth.login_user(email, password)
+                success, result = auth.login_user(email, password, get_client_id())
                 if success:
                     # Check if user must change password
                     must_change = auth.check_must_change_password(result['id'])
@@ -58,6 +60,7 @@ def render_login_form():
                     else:
                         st.session_state.session_token = result['session_token']
                         st.session_state.user_info = result
+                        prefetch_user_snapshot(result['id'])
                         st.success(f"✅ Welcome back, {result['full_name']}!")
                         st.rerun()
                 else:
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Outbound Mail Queue for Project Tracker
+Persists outgoing mail in an outbox table and sends it from a background
+thread, reusing one SMTP connection while the outbox has mail and retrying
+with backoff
+"""
+
+import smtplib
+import threading
+import time
+import uuid
+from email.mime.text import MIMEText
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table, Text, bindparam, func, text
+
+LOGIN_URL = "https://ps-project-tracker.streamlit.app/"
+
+
+def load_smtp_config(overrides=None):
+    """Read SMTP settings from Streamlit secrets, applying any overrides"""
+    try:
+        smtp_config = dict(st.secrets.get("email", {}))
+    except Exception:
+        smtp_config = {}
+    smtp_config.update({k: v for k, v in (overrides or {}).items() if v is not None})
+    return {
+        'host': smtp_config.get("smtp_host"),
+        'port': int(smtp_config.get("smtp_port", 587)),
+        'user': smtp_config.get("smtp_user"),
+        'password': smtp_config.get("smtp_password"),
+        'from_email': smtp_config.get("from_email", smtp_config.get("smtp_user")),
+        'use_tls': str(smtp_config.get("use_tls", True)).lower() not in ("false", "0", "no")
+    }
+
+
+def smtp_configured(smtp_config):
+    """True if there is enough configuration to send mail"""
+    if not (smtp_config['host'] and smtp_config['from_email']):
+        return False
+    # Relays that use TLS expect credentials; a local relay may not
+    return not smtp_config['use_tls'] or bool(smtp_config['user'] and smtp_config['password'])
+
+
+def temp_password_email(to_email, temp_password, full_name):
+    """Subject and body of the temporary password email"""
+    body = f"""
+Hello {full_name},
+
+Your Project Tracker account has been created.
+
+Login Email: {to_email}
+Temporary Password: {temp_password}
+
+Please log in and set your own password as soon as possible.
+
+Login URL: {LOGIN_URL}
+
+If you did not expect this email, please ignore it.
+"""
+    return "Your Project Tracker Account - Temporary Password", body
+
+
+def build_message(from_email, to_email, subject, body):
+    msg = MIMEText(body)
+    msg['Subject'] = subject
+    msg['From'] = from_email
+    msg['To'] = to_email
+    return msg
+
+
+class SMTPMailer:
+    """One SMTP connection that is opened lazily and reused for many messages"""
+
+    def __init__(self, smtp_config):
+        self.config = smtp_config
+        self.server = None
+        self.connections = 0
+
+    def connect(self):
+        self.server = smtplib.SMTP(self.config['host'], self.config['port'], timeout=30)
+        self.connections += 1
+        if self.config['use_tls']:
+            self.server.starttls()
+        if self.config['user'] and self.config['password']:
+            self.server.login(self.config['user'], self.config['password'])
+
+    def send(self, msg):
+        """Send a message, reconnecting once if the server dropped the connection"""
+        if self.server is None:
+            self.connect()
+        try:
+            self.server.sendmail(msg['From'], [msg['To']], msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            self.connect()
+            self.server.sendmail(msg['From'], [msg['To']], msg.as_string())
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self.server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MailQueue:
+    """Persistent outbox drained by a background worker in batches per connection"""
+
+    def __init__(self, engine, smtp_config=None, batch_size=50, poll_seconds=5,
+                 max_attempts=5, backoff_base_seconds=30, backoff_max_seconds=3600):
+        self.engine = engine
+        self.smtp_config = smtp_config or load_smtp_config()
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._wake = threading.Event()
+        self._worker = None
+        self._lock = threading.Lock()
+        self.stats = {'queued': 0, 'sent': 0, 'failed': 0, 'retried': 0, 'connections': 0, 'last_error': None}
+        self._create_table()
+
+    def _create_table(self):
+        """Create the outbox table if it doesn't exist"""
+        metadata = MetaData()
+        self.outbox = Table('email_outbox', metadata,
+            Column('id', Integer, primary_key=True, autoincrement=True),
+            Column('to_email', String(255), nullable=False),
+            Column('from_email', String(255)),
+            Column('subject', String(500)),
+            Column('body', Text),
+            Column('status', String(20), default='pending', index=True),
+            Column('attempts', Integer, default=0),
+            Column('next_attempt_at', Float, default=0),
+            Column('claim_token', String(64), index=True),
+            Column('claimed_at', Float),
+            Column('last_error', Text),
+            Column('created_at', DateTime, server_default=func.now()),
+            Column('sent_at', DateTime)
+        )
+        try:
+            metadata.create_all(self.engine)
+        except Exception as e:
+            st.error(f"Error creating email outbox: {e}")
+
+    def is_configured(self):
+        return smtp_configured(self.smtp_config)
+
+    def enqueue(self, to_email, subject, body):
+        """Store a message in the outbox and wake the worker. Returns False if SMTP is not configured"""
+        if not self.is_configured():
+            return False
+        with self.engine.connect() as conn:
+            self.enqueue_many(conn, [(to_email, subject, body)])
+            conn.commit()
+        self.notify()
+        return True
+
+    def enqueue_many(self, conn, messages):
+        """Insert (to_email, subject, body) messages on conn, inside the caller's transaction.
+
+        Call notify() once the caller has committed, so the worker claims the
+        whole lot at once. Returns False (inserting nothing) if SMTP is not configured.
+        """
+        if not self.is_configured():
+            return False
+        if messages:
+            conn.execute(self.outbox.insert(), [{
+                'to_email': to_email,
+                'from_email': self.smtp_config['from_email'],
+                'subject': subject,
+                'body': body,
+                'status': 'pending',
+                'attempts': 0,
+                'next_attempt_at': 0
+            } for to_email, subject, body in messages])
+            self.stats['queued'] += len(messages)
+        return True
+
+    def notify(self):
+        """Wake the worker, starting it if needed, to send newly committed messages"""
+        self.start()
+        self._wake.set()
+
+    def enqueue_temp_password(self, to_email, temp_password, full_name):
+        subject, body = temp_password_email(to_email, temp_password, full_name)
+        return self.enqueue(to_email, subject, body)
+
+    def start(self):
+        """Start the background worker if it isn't running"""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="mail-queue", daemon=True)
+                self._worker.start()
+
+    def _claim_batch(self):
+        """Atomically claim up to batch_size due messages for this worker"""
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self.engine.connect() as conn:
+            # Messages left in 'sending' by a crashed worker go back to the queue
+            conn.execute(text("""
+                UPDATE email_outbox SET status = 'pending', claim_token = NULL
+                WHERE status = 'sending' AND claimed_at < :stale_before
+            """), {'stale_before': now - 600})
+            conn.execute(text("""
+                UPDATE email_outbox SET status = 'sending', claim_token = :token, claimed_at = :now
+                WHERE status = 'pending' AND id IN (
+                    SELECT id FROM email_outbox
+                    WHERE status = 'pending' AND next_attempt_at <= :now
+                    ORDER BY id LIMIT :limit
+                )
+            """), {'token': token, 'now': now, 'limit': self.batch_size})
+            rows = conn.execute(text("""
+                SELECT id, to_email, from_email, subject, body, attempts
+                FROM email_outbox WHERE claim_token = :token ORDER BY id
+            """), {'token': token}).fetchall()
+            conn.commit()
+        return rows
+
+    def _send_batch(self, rows, mailer):
+        """Send claimed messages over mailer's connection and record the outcomes"""
+        results = []
+        connections = mailer.connections
+        try:
+            for row in rows:
+                try:
+                    mailer.send(build_message(row.from_email, row.to_email, row.subject, row.body))
+                    results.append((row, None))
+                except Exception as e:
+                    results.append((row, str(e)))
+                    mailer.close()
+        finally:
+            self.stats['connections'] += mailer.connections - connections
+
+        now = time.time()
+        with self.engine.connect() as conn:
+            for row, error in results:
+                if error is None:
+                    # Bodies can hold temporary passwords; don't keep them once delivered
+                    conn.execute(text("""
+                        UPDATE email_outbox SET status = 'sent', body = NULL, claim_token = NULL,
+                            attempts = attempts + 1, sent_at = CURRENT_TIMESTAMP, last_error = NULL
+                        WHERE id = :id
+                    """), {'id': row.id})
+                    self.stats['sent'] += 1
+                else:
+                    attempts = row.attempts + 1
+                    gave_up = attempts >= self.max_attempts
+                    delay = min(self.backoff_base_seconds * 2 ** (attempts - 1), self.backoff_max_seconds)
+                    # A message that is given up on keeps no body either: it holds a temporary password
+                    conn.execute(text("""
+                        UPDATE email_outbox SET status = :status, claim_token = NULL, attempts = :attempts,
+                            next_attempt_at = :next_attempt_at, last_error = :error,
+                            body = CASE WHEN :status = 'failed' THEN NULL ELSE body END
+                        WHERE id = :id
+                    """), {
+                        'id': row.id,
+                        'status': 'failed' if gave_up else 'pending',
+                        'attempts': attempts,
+                        'next_attempt_at': now + delay,
+                        'error': error
+                    })
+                    self.stats['failed' if gave_up else 'retried'] += 1
+                    self.stats['last_error'] = error
+            conn.commit()
+
+    def _next_due_in(self):
+        with self.engine.connect() as conn:
+            next_due = conn.execute(text(
+                "SELECT MIN(next_attempt_at) FROM email_outbox WHERE status = 'pending'"
+            )).scalar()
+        if next_due is None:
+            return self.poll_seconds
+        return max(0.0, min(self.poll_seconds, next_due - time.time()))
+
+    def _run(self):
+        # The connection stays open across back-to-back batches and is closed once the outbox is idle
+        mailer = SMTPMailer(self.smtp_config)
+        while True:
+            try:
+                rows = self._claim_batch()
+                if rows:
+                    self._send_batch(rows, mailer)
+                    continue
+                wait_for = self._next_due_in()
+            except Exception as e:
+                self.stats['last_error'] = str(e)
+                wait_for = self.poll_seconds
+            mailer.close()
+            mailer = SMTPMailer(self.smtp_config)
+            self._wake.wait(wait_for)
+            self._wake.clear()
+
+    def pending_count(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text(
+                "SELECT COUNT(*) FROM email_outbox WHERE status IN ('pending', 'sending')"
+            )).scalar()
+
+    def wait(self, timeout=60):
+        """Block until the outbox is drained or the timeout expires. Returns True if drained"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if not self.pending_count():
+                return True
+            self._wake.set()
+            time.sleep(0.2)
+        return False
+
+    def get_status_counts(self):
+        """Message counts per status for the admin panel"""
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(
+                    "SELECT status, COUNT(*) FROM email_outbox GROUP BY status"
+                )).fetchall()
+            return {status: count for status, count in rows}
+        except Exception:
+            return {}
+
+    def get_failed_messages(self, limit=50):
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(text("""
+                    SELECT id, to_email, subject, attempts, last_error, created_at
+                    FROM email_outbox WHERE status = 'failed' ORDER BY id DESC LIMIT :limit
+                """), {'limit': limit}).fetchall()
+            if rows:
+                columns = ['id', 'to_email', 'subject', 'attempts', 'last_error', 'created_at']
+                return pd.DataFrame(rows, columns=columns)
+            return pd.DataFrame()
+        except Exception as e:
+            st.error(f"Error getting failed emails: {e}")
+            return pd.DataFrame()
+
+    def get_failed_recipients(self):
+        """{outbox id: recipient} for messages that failed for good.
+
+        Their bodies are cleared when they fail, so they cannot be retried as
+        they are; the sender has to queue a new message (and mark_reissued).
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT id, to_email FROM email_outbox WHERE status = 'failed'")).fetchall()
+        return {row.id: row.to_email for row in rows}
+
+    def mark_reissued(self, conn, ids):
+        """Mark failed messages as replaced by new ones, inside the caller's transaction"""
+        if ids:
+            conn.execute(text(
+                "UPDATE email_outbox SET status = 'reissued' WHERE status = 'failed' AND id IN :ids"
+            ).bindparams(bindparam('ids', expanding=True)), {'ids': list(ids)})
+
+
+_mail_queue = None
+_mail_queue_smtp_config = None
+_mail_queue_lock = threading.Lock()
+
+
+def configure_mail_queue(smtp_config):
+    """Send this process's mail with smtp_config instead of the secrets (e.g. CLI overrides).
+
+    Call before the queue is first used: there is one outbox worker per process,
+    so a second queue with other settings would race it for the same rows.
+    """
+    global _mail_queue_smtp_config
+    with _mail_queue_lock:
+        _mail_queue_smtp_config = smtp_config
+        if _mail_queue is not None:
+            _mail_queue.smtp_config = smtp_config
+
+
+def get_mail_queue(engine):
+    """Process-wide mail queue; the worker also resumes mail left over from earlier runs"""
+    global _mail_queue
+    with _mail_queue_lock:
+        if _mail_queue is None:
+            _mail_queue = MailQueue(engine, _mail_queue_smtp_config)
+            if _mail_queue.is_configured():
+                _mail_queue.start()
+        return _mail_queue
@@ -5,25 +5,30 @@ Handles user authentication and session management
 """
 
 import streamlit as st
-import requests
-import json
-import hashlib
 import secrets
+import csv
 from datetime import datetime, timedelta
 import os
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from database_postgres import ProjectOpsDatabase
+from password_hashing import hash_password, hash_passwords, needs_rehash, verify_password_in_worker
+from mail_queue import get_mail_queue, temp_password_email
+from rate_limiter import LoginRateLimiter
+from write_behind import WriteBehindBuffer
 import random
 import string
-import smtplib
-from email.mime.text import MIMEText
 
 class NeonAuth:
     def __init__(self):
         """Initialize Neon Auth with configuration"""
         self.db = ProjectOpsDatabase()
         self._create_auth_tables()
+        self.rate_limiter = LoginRateLimiter(self.db.engine)
+        # Start the outbox worker so mail queued by earlier runs gets delivered
+        self.mail_queue = get_mail_queue(self.db.engine)
+        # Audit rows and last_login updates are committed in the background
+        self.write_buffer = WriteBehindBuffer(self.db.engine)
         
         # Get Neon Auth configuration
         try:
@@ -38,10 +43,15 @@ class NeonAuth:
         """Create authentication-related tables and add user_id columns if needed"""
         try:
             with self.db.engine.connect() as conn:
+                # Detect database dialect
+                dialect = self.db.engine.dialect.name
+                # SQLite only auto-assigns ids for INTEGER PRIMARY KEY columns
+                id_column = "id INTEGER PRIMARY KEY AUTOINCREMENT" if dialect == "sqlite" else "id SERIAL PRIMARY KEY"
+
                 # Users table
-                conn.execute(text("""
+                conn.execute(text(f"""
                     CREATE TABLE IF NOT EXISTS users (
-                        id SERIAL PRIMARY KEY,
+                        {id_column},
                         email VARCHAR(255) UNIQUE NOT NULL,
                         password_hash VARCHAR(255) NOT NULL,
                         full_name VARCHAR(255),
@@ -54,9 +64,9 @@ class NeonAuth:
                 """))
                 
                 # Audit logs table
-                conn.execute(text("""
+                conn.execute(text(f"""
                     CREATE TABLE IF NOT EXISTS audit_logs (
-                        id SERIAL PRIMARY KEY,
+                        {id_column},
                         admin_id INTEGER,
                         admin_email VARCHAR(255),
                         action VARCHAR(100),
@@ -67,10 +77,15 @@ class NeonAuth:
                     )
                 """))
                 
+                # Audit log indexes for time-ordered browsing and per-admin/per-user filters
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs (timestamp)"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_audit_logs_admin_timestamp ON audit_logs (admin_id, timestamp)"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_audit_logs_target_timestamp ON audit_logs (target_user_id, timestamp)"))
+                
                 # User sessions table
-                conn.execute(text("""
+                conn.execute(text(f"""
                     CREATE TABLE IF NOT EXISTS user_sessions (
-                        id SERIAL PRIMARY KEY,
+                        {id_column},
                         user_id INTEGER REFERENCES users(id),
                         session_token VARCHAR(255) UNIQUE NOT NULL,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -78,11 +93,12 @@ class NeonAuth:
                         is_active BOOLEAN DEFAULT TRUE
                     )
                 """))
-                
-                # Detect database dialect
-                dialect = self.db.engine.dialect.name
 
-                for table in ["projects", "meetings", "client_updates", "issues"]:
+
+                # Columns added after the tables were first created
+                added_columns = [(table, "user_id", "INTEGER") for table in ["projects", "meetings", "client_updates", "issues"]]
+                added_columns.append(("users", "profile_picture", "TEXT"))
+                for table, column, column_type in added_columns:
                     if dialect == "sqlite":
                         col_check = conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
                         col_names = [col[1] for col in col_check]
@@ -92,15 +108,15 @@ class NeonAuth:
                             {"table": table}
                         ).fetchall()
                         col_names = [col[0] for col in col_check]
-                    if "user_id" not in col_names:
-                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN user_id INTEGER"))
+                    if column not in col_names:
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"))
                 conn.commit()
         except Exception as e:
             st.error(f"Error creating auth tables: {e}")
     
     def _hash_password(self, password):
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password using salted scrypt"""
+        return hash_password(password)
     
     def _generate_session_token(self):
         """Generate a secure session token"""
@@ -133,8 +149,12 @@ class NeonAuth:
         except Exception as e:
             return False, f"Registration failed: {e}"
     
-    def login_user(self, email, password):
+    def login_user(self, email, password, client_id=None):
         """Authenticate user and create session"""
+        # Throttle before touching the database
+        allowed, retry_after = self.rate_limiter.check(email, client_id)
+        if not allowed:
+            return False, f"Too many login attempts. Please try again in {int(retry_after) + 1} seconds."
         try:
             with self.db.engine.connect() as conn:
                 # Get user by email
@@ -145,16 +165,23 @@ class NeonAuth:
                 user = conn.execute(user_query, {'email': email}).fetchone()
                 
                 if not user:
+                    self.rate_limiter.record_failure(email, client_id)
                     return False, "Invalid email or password"
                 
                 if not user.is_active:
+                    self.rate_limiter.record_failure(email, client_id)
                     return False, "Account is deactivated"
                 
-                # Verify password
-                password_hash = self._hash_password(password)
-                if user.password_hash != password_hash:
+                # Verify password off the script thread
+                if not verify_password_in_worker(password, user.password_hash):
+                    self.rate_limiter.record_failure(email, client_id)
                     return False, "Invalid email or password"
                 
+                # Transparently upgrade legacy SHA-256 or outdated scrypt hashes
+                if needs_rehash(user.password_hash):
+                    rehash_query = text("UPDATE users SET password_hash = :password_hash WHERE id = :user_id")
+                    conn.execute(rehash_query, {'password_hash': self._hash_password(password), 'user_id': user.id})
+                
                 # Create session
                 session_token = self._generate_session_token()
                 expires_at = datetime.now() + timedelta(hours=24)  # 24 hour session
@@ -170,13 +197,11 @@ class NeonAuth:
                     'expires_at': expires_at
                 })
                 
-                # Update last login
-                update_query = text("""
-                    UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = :user_id
-                """)
-                conn.execute(update_query, {'user_id': user.id})
-                
                 conn.commit()
+                self.rate_limiter.record_success(email, client_id)
+                
+                # Update last login (written behind)
+                self.write_buffer.touch_last_login(user.id)
                 
                 # Return user info and session token
                 user_info = {
@@ -310,41 +335,11 @@ class NeonAuth:
             return pd.DataFrame()
 
     def send_temp_password_email(self, to_email, temp_password, full_name):
-        """Send temp password email if SMTP is configured in Streamlit secrets"""
+        """Queue the temp password email for background delivery if SMTP is configured"""
         try:
-            smtp_config = st.secrets.get("email", {})
-            smtp_host = smtp_config.get("smtp_host")
-            smtp_port = int(smtp_config.get("smtp_port", 587))
-            smtp_user = smtp_config.get("smtp_user")
-            smtp_pass = smtp_config.get("smtp_password")
-            from_email = smtp_config.get("from_email", smtp_user)
-
-            if not (smtp_host and smtp_user and smtp_pass):
-                return False, "SMTP not configured."
-            subject = "Your Project Tracker Account - Temporary Password"
-            body = f"""
-Hello {full_name},
-
-Your Project Tracker account has been created.
-
-Login Email: {to_email}
-Temporary Password: {temp_password}
-
-Please log in and set your own password as soon as possible.
-
-Login URL: https://ps-project-tracker.streamlit.app/
-
-If you did not expect this email, please ignore it.
-"""
-            msg = MIMEText(body)
-            msg['Subject'] = subject
-            msg['From'] = from_email
-            msg['To'] = to_email
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-                server.sendmail(from_email, [to_email], msg.as_string())
-            return True, "Email sent."
+            if self.mail_queue.enqueue_temp_password(to_email, temp_password, full_name):
+                return True, "Email queued."
+            return False, "SMTP not configured."
         except Exception as e:
             return False, f"Email error: {e}"
 
@@ -375,12 +370,120 @@ If you did not expect this email, please ignore it.
                 # Try to send email
                 email_sent, email_msg = self.send_temp_password_email(email, temp_password, full_name)
                 if email_sent:
-                    return True, f"Temporary password sent to {email}."
+                    return True, f"Temporary password email queued for {email}."
                 else:
                     return True, f"User created. Email not sent: {email_msg}. Temporary password: {temp_password}"
         except Exception as e:
             return False, f"User creation failed: {e}"
 
+    def bulk_create_users(self, users, admin_id=None, admin_email=None):
+        """Create many users with temp passwords in one transaction and queue their invitations.
+
+        users is a list of dicts with email, full_name and role. Returns a dict with
+        'created' (email, full_name, role, temp_password, email_queued), 'skipped'
+        (emails that already exist) and 'error' (None or a message).
+        """
+        results = {'created': [], 'skipped': [], 'error': None}
+        # Collapse duplicates within the upload, keeping the first row per email
+        unique_users = {}
+        for user in users:
+            unique_users.setdefault(user['email'].strip().lower(), user)
+        if not unique_users:
+            return results
+        try:
+            with self.db.engine.connect() as conn:
+                # One round trip to find the emails that are already taken
+                check_query = text("SELECT LOWER(email) FROM users WHERE LOWER(email) IN :emails").bindparams(
+                    bindparam('emails', expanding=True)
+                )
+                existing = {row[0] for row in conn.execute(check_query, {'emails': list(unique_users)})}
+                new_users = [user for email, user in unique_users.items() if email not in existing]
+                results['skipped'] = sorted(existing)
+                if not new_users:
+                    return results
+
+                temp_passwords = [self._generate_temp_password() for _ in new_users]
+                password_hashes = hash_passwords(temp_passwords)
+                insert_query = text("""
+                    INSERT INTO users (email, password_hash, full_name, role, must_change_password)
+                    VALUES (:email, :password_hash, :full_name, :role, TRUE)
+                """)
+                conn.execute(insert_query, [{
+                    'email': user['email'].strip(),
+                    'password_hash': password_hash,
+                    'full_name': user['full_name'],
+                    'role': user.get('role') or 'user'
+                } for user, password_hash in zip(new_users, password_hashes)])
+                if admin_id and admin_email:
+                    conn.execute(text("""
+                        INSERT INTO audit_logs (admin_id, admin_email, action, target_user_id, target_email, details)
+                        VALUES (:admin_id, :admin_email, 'create_user', NULL, :target_email, :details)
+                    """), [{
+                        'admin_id': admin_id,
+                        'admin_email': admin_email,
+                        'target_email': user['email'].strip(),
+                        'details': f"role={user.get('role') or 'user'}; bulk"
+                    } for user in new_users])
+                # Invitations are queued in the same transaction, so the worker claims them all
+                # together and sends them over one SMTP connection
+                email_queued = self.mail_queue.enqueue_many(conn, [
+                    (user['email'].strip(), *temp_password_email(user['email'].strip(), temp_password, user['full_name']))
+                    for user, temp_password in zip(new_users, temp_passwords)
+                ])
+                conn.commit()
+        except Exception as e:
+            results['error'] = f"Bulk user creation failed: {e}"
+            return results
+        self.mail_queue.notify()
+
+        for user, temp_password in zip(new_users, temp_passwords):
+            results['created'].append({
+                'email': user['email'].strip(),
+                'full_name': user['full_name'],
+                'role': user.get('role') or 'user',
+                'temp_password': None if email_queued else temp_password,
+                'email_queued': email_queued
+            })
+        return results
+
+    def resend_failed_invitations(self, admin_id=None, admin_email=None):
+        """Give every user whose temporary password email failed for good a new one and queue it.
+
+        Failed messages no longer hold their password, so a retry has to issue a
+        new one. Returns how many emails were queued.
+        """
+        try:
+            failed = self.mail_queue.get_failed_recipients()
+            if not failed or not self.mail_queue.is_configured():
+                return 0
+            with self.db.engine.connect() as conn:
+                users_query = text("SELECT id, email, full_name FROM users WHERE LOWER(email) IN :emails").bindparams(
+                    bindparam('emails', expanding=True)
+                )
+                users = conn.execute(users_query, {'emails': sorted({email.lower() for email in failed.values()})}).fetchall()
+                if not users:
+                    return 0
+                temp_passwords = [self._generate_temp_password() for _ in users]
+                conn.execute(text("""
+                    UPDATE users SET password_hash = :password_hash, must_change_password = TRUE WHERE id = :user_id
+                """), [{'password_hash': password_hash, 'user_id': user.id}
+                       for user, password_hash in zip(users, hash_passwords(temp_passwords))])
+                self.mail_queue.enqueue_many(conn, [
+                    (user.email, *temp_password_email(user.email, temp_password, user.full_name))
+                    for user, temp_password in zip(users, temp_passwords)
+                ])
+                emails = {user.email.lower() for user in users}
+                self.mail_queue.mark_reissued(conn, [outbox_id for outbox_id, email in failed.items() if email.lower() in emails])
+                conn.commit()
+            self.mail_queue.notify()
+            if admin_id and admin_email:
+                for user in users:
+                    self.log_admin_action(admin_id, admin_email, "reset_password", user.id, user.email, "resent failed invitation")
+            return len(users)
+        except Exception as e:
+            st.error(f"Failed to resend invitations: {e}")
+            return 0
+
     def _generate_temp_password(self, length=10):
         chars = string.ascii_letters + string.digits
         return ''.join(random.choice(chars) for _ in range(length))
@@ -416,6 +519,7 @@ If you did not expect this email, please ignore it.
     def get_all_users(self):
         """Return all users for admin listing"""
         try:
+            self.write_buffer.flush()
             with self.db.engine.connect() as conn:
                 query = text("SELECT id, email, full_name, role, created_at, last_login, is_active FROM users ORDER BY created_at DESC")
                 result = conn.execute(query)
@@ -467,7 +571,7 @@ If you did not expect this email, please ignore it.
                 if admin_id and admin_email:
                     self.log_admin_action(admin_id, admin_email, "reset_password", user_id, user.email)
                 if email_sent:
-                    return True, f"Temporary password sent to {user.email}."
+                    return True, f"Temporary password email queued for {user.email}."
                 else:
                     return True, f"Password reset. Email not sent: {email_msg}. Temporary password: {temp_password}"
         except Exception as e:
@@ -503,6 +607,7 @@ If you did not expect this email, please ignore it.
                 # Delete user
                 conn.execute(text("DELETE FROM users WHERE id = :user_id"), {'user_id': user_id})
                 conn.commit()
+            self.db.bump_data_version(user_id)
             # Log action
             if admin_id and admin_email:
                 self.log_admin_action(admin_id, admin_email, "delete_user", user_id, target_email)
@@ -520,36 +625,117 @@ If you did not expect this email, please ignore it.
         except Exception:
             return None
 
+    AUDIT_LOG_COLUMNS = ['id', 'admin_id', 'admin_email', 'action', 'target_user_id', 'target_email', 'details', 'timestamp']
+
     def get_audit_logs(self, limit=100):
+        logs_df, _ = self.query_audit_logs(limit=limit)
+        return logs_df
+
+    def _audit_log_filters(self, admin_id=None, action=None, target_user_id=None, start=None, end=None):
+        """Build the WHERE clause and parameters shared by audit log queries"""
+        conditions = []
+        params = {}
+        if admin_id is not None:
+            conditions.append("admin_id = :admin_id")
+            params['admin_id'] = admin_id
+        if action:
+            conditions.append("action = :action")
+            params['action'] = action
+        if target_user_id is not None:
+            conditions.append("target_user_id = :target_user_id")
+            params['target_user_id'] = target_user_id
+        if start is not None:
+            conditions.append("timestamp >= :start")
+            params['start'] = start
+        if end is not None:
+            conditions.append("timestamp < :end")
+            params['end'] = end
+        return conditions, params
+
+    def query_audit_logs(self, admin_id=None, action=None, target_user_id=None, start=None, end=None,
+                         before=None, limit=50):
+        """Filtered audit logs, newest first, with keyset pagination.
+
+        before is the (timestamp, id) cursor returned for the previous page. Returns
+        (DataFrame, next_cursor); next_cursor is None on the last page.
+        """
         try:
+            # Make the admin's own recent actions visible
+            self.write_buffer.flush()
+            conditions, params = self._audit_log_filters(admin_id, action, target_user_id, start, end)
+            if before is not None:
+                conditions.append("(timestamp < :before_ts OR (timestamp = :before_ts AND id < :before_id))")
+                params['before_ts'], params['before_id'] = before
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            params['limit'] = limit + 1
+            query = text(f"""
+                SELECT id, admin_id, admin_email, action, target_user_id, target_email, details, timestamp
+                FROM audit_logs {where}
+                ORDER BY timestamp DESC, id DESC
+                LIMIT :limit
+            """)
             with self.db.engine.connect() as conn:
-                query = text("SELECT * FROM audit_logs ORDER BY timestamp DESC LIMIT :limit")
-                result = conn.execute(query, {'limit': limit})
-                rows = result.fetchall()
-                if rows:
-                    columns = ['id', 'admin_id', 'admin_email', 'action', 'target_user_id', 'target_email', 'details', 'timestamp']
-                    return pd.DataFrame(rows, columns=columns)
-                return pd.DataFrame()
+                rows = conn.execute(query, params).fetchall()
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = (rows[-1].timestamp, rows[-1].id)
+            if rows:
+                return pd.DataFrame(rows, columns=self.AUDIT_LOG_COLUMNS), next_cursor
+            return pd.DataFrame(), None
         except Exception as e:
             st.error(f"Error getting audit logs: {e}")
-            return pd.DataFrame()
+            return pd.DataFrame(), None
 
-    def log_admin_action(self, admin_id, admin_email, action, target_user_id, target_email, details=None):
+    def get_audit_actions(self):
+        """Distinct audit actions for filter dropdowns"""
         try:
             with self.db.engine.connect() as conn:
-                query = text("""
-                    INSERT INTO audit_logs (admin_id, admin_email, action, target_user_id, target_email, details)
-                    VALUES (:admin_id, :admin_email, :action, :target_user_id, :target_email, :details)
-                """)
-                conn.execute(query, {
-                    'admin_id': admin_id,
-                    'admin_email': admin_email,
-                    'action': action,
-                    'target_user_id': target_user_id,
-                    'target_email': target_email,
-                    'details': details
-                })
-                conn.commit()
+                rows = conn.execute(text("SELECT DISTINCT action FROM audit_logs ORDER BY action")).fetchall()
+                return [row[0] for row in rows if row[0]]
+        except Exception:
+            return []
+
+    def export_audit_logs_csv(self, output, admin_id=None, action=None, target_user_id=None, start=None, end=None,
+                              batch_size=5000, limit=None):
+        """Stream matching audit logs as CSV into a text file object. Returns the row count.
+
+        Rows are read through a server-side cursor in batches, so memory use does not
+        grow with the size of the export. With limit, only the newest limit rows are written.
+        """
+        self.write_buffer.flush()
+        conditions, params = self._audit_log_filters(admin_id, action, target_user_id, start, end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = "id, admin_id, admin_email, action, target_user_id, target_email, details, timestamp"
+        if limit:
+            params['limit'] = limit
+            query = text(f"""
+                SELECT {columns} FROM (
+                    SELECT {columns} FROM audit_logs {where}
+                    ORDER BY timestamp DESC, id DESC LIMIT :limit
+                ) newest
+                ORDER BY timestamp, id
+            """)
+        else:
+            query = text(f"""
+                SELECT {columns}
+                FROM audit_logs {where}
+                ORDER BY timestamp, id
+            """)
+        writer = csv.writer(output)
+        writer.writerow(self.AUDIT_LOG_COLUMNS)
+        row_count = 0
+        with self.db.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(query, params)
+            for partition in result.partitions():
+                writer.writerows(partition)
+                row_count += len(partition)
+        return row_count
+
+    def log_admin_action(self, admin_id, admin_email, action, target_user_id, target_email, details=None):
+        """Queue an audit log row; it is committed with the next write-behind flush"""
+        try:
+            self.write_buffer.log_admin_action(admin_id, admin_email, action, target_user_id, target_email, details)
         except Exception as e:
             st.error(f"Failed to log admin action: {e}")
 
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Password Hashing for Project Tracker
+Salted scrypt hashes in a self-describing format, legacy SHA-256 upgrade
+support, off-thread verification and a work-factor calibration command
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import PASSWORD_HASH_CONFIG
+
+SCHEME = "scrypt"
+
+# Verification runs on a small bounded pool: a burst of logins queues here
+# instead of pinning every Streamlit script thread on scrypt's CPU and memory.
+_verify_pool = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_CONFIG["verify_workers"],
+    thread_name_prefix="password-verify"
+)
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(data):
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _scrypt(password, salt, n, r, p, key_bytes):
+    # OpenSSL needs roughly 128 * n * r bytes; leave headroom above that
+    maxmem = 256 * n * r * p + 1024 * 1024
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=key_bytes)
+
+
+def hash_password(password, n=None, r=None, p=None):
+    """Hash a password as scrypt$n$r$p$salt$hash"""
+    n = n or PASSWORD_HASH_CONFIG["n"]
+    r = r or PASSWORD_HASH_CONFIG["r"]
+    p = p or PASSWORD_HASH_CONFIG["p"]
+    salt = os.urandom(PASSWORD_HASH_CONFIG["salt_bytes"])
+    key = _scrypt(password, salt, n, r, p, PASSWORD_HASH_CONFIG["key_bytes"])
+    return f"{SCHEME}${n}${r}${p}${_b64encode(salt)}${_b64encode(key)}"
+
+
+def is_legacy_hash(stored_hash):
+    """True for the old unsalted SHA-256 hex digests"""
+    return bool(stored_hash) and len(stored_hash) == 64 and not stored_hash.startswith(f"{SCHEME}$")
+
+
+def verify_password(password, stored_hash):
+    """Check a password against a stored scrypt or legacy SHA-256 hash"""
+    if not stored_hash:
+        return False
+    if is_legacy_hash(stored_hash):
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(candidate, stored_hash)
+    try:
+        scheme, n, r, p, salt, key = stored_hash.split("$")
+        if scheme != SCHEME:
+            return False
+        expected = _b64decode(key)
+        candidate = _scrypt(password, _b64decode(salt), int(n), int(r), int(p), len(expected))
+        return hmac.compare_digest(candidate, expected)
+    except (ValueError, TypeError):
+        return False
+
+
+def needs_rehash(stored_hash):
+    """True if the hash is legacy or uses different parameters than configured"""
+    if is_legacy_hash(stored_hash):
+        return True
+    try:
+        scheme, n, r, p, _, _ = stored_hash.split("$")
+    except (ValueError, AttributeError):
+        return True
+    return (scheme, int(n), int(r), int(p)) != (
+        SCHEME, PASSWORD_HASH_CONFIG["n"], PASSWORD_HASH_CONFIG["r"], PASSWORD_HASH_CONFIG["p"]
+    )
+
+
+def verify_password_in_worker(password, stored_hash, timeout=None):
+    """Run verify_password on the verification pool and wait for the result"""
+    timeout = timeout or PASSWORD_HASH_CONFIG["verify_timeout_seconds"]
+    return _verify_pool.submit(verify_password, password, stored_hash).result(timeout=timeout)
+
+
+def hash_passwords(passwords):
+    """Hash many passwords in parallel, preserving order.
+
+    Uses its own short-lived pool rather than the verification pool, so a large
+    import never queues interactive logins behind its hashes.
+    """
+    with ThreadPoolExecutor(max_workers=PASSWORD_HASH_CONFIG["bulk_hash_workers"],
+                            thread_name_prefix="password-bulk") as pool:
+        return list(pool.map(hash_password, passwords))
+
+
+def time_hash(n, r, p, rounds=3):
+    """Return the median time in milliseconds to hash with the given parameters"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _scrypt("calibration-password", os.urandom(16), n, r, p, PASSWORD_HASH_CONFIG["key_bytes"])
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate(budget_ms=None, r=None, p=None, max_log2_n=20):
+    """Pick the largest power-of-two n whose hash time fits the latency budget"""
+    budget_ms = budget_ms or PASSWORD_HASH_CONFIG["latency_budget_ms"]
+    r = r or PASSWORD_HASH_CONFIG["r"]
+    p = p or PASSWORD_HASH_CONFIG["p"]
+    results = []
+    best_n = 2 ** 10
+    for log2_n in range(10, max_log2_n + 1):
+        n = 2 ** log2_n
+        elapsed = time_hash(n, r, p)
+        results.append((n, elapsed))
+        if elapsed > budget_ms:
+            break
+        best_n = n
+    return best_n, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password hashing utilities")
+    parser.add_argument("--calibrate", action="store_true", help="Pick a scrypt work factor for this machine")
+    parser.add_argument("--budget-ms", type=float, default=PASSWORD_HASH_CONFIG["latency_budget_ms"],
+                        help="Maximum time a single hash may take")
+    args = parser.parse_args()
+
+    if args.calibrate:
+        print(f"⏱️ Calibrating scrypt (r={PASSWORD_HASH_CONFIG['r']}, p={PASSWORD_HASH_CONFIG['p']}) "
+              f"for a {args.budget_ms:.0f} ms budget...")
+        best_n, results = calibrate(args.budget_ms)
+        for n, elapsed in results:
+            marker = "✅" if elapsed <= args.budget_ms else "❌"
+            print(f"  {marker} n=2^{n.bit_length() - 1:<2} {elapsed:8.1f} ms  ({128 * n * PASSWORD_HASH_CONFIG['r'] // (1024 * 1024)} MB)")
+        print(f"\n🔐 Recommended work factor: n={best_n}")
+        print(f"   Set PASSWORD_SCRYPT_N={best_n} in the environment to use it.")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
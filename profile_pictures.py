@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Profile Picture Thumbnails for ProjectOps
+Uploads are decoded once with Pillow and stored only as small resized
+variants (60px for the sidebar, 200px for the profile page). File names carry
+a hash of the upload, so a name always refers to the same bytes and can be
+cached without invalidation
+"""
+
+import glob
+import hashlib
+import io
+import os
+import re
+
+from config import PROFILE_PICTURE_CONFIG
+
+_VARIANT_SUFFIX = re.compile(r"_\d+\.(webp|jpg)$")
+
+
+def _extension():
+    return "webp" if PROFILE_PICTURE_CONFIG["format"] == "WEBP" else "jpg"
+
+
+def variant_path(path, size):
+    """File name of the size-px variant of a stored picture (any variant, or a legacy full-size upload)"""
+    root = _VARIANT_SUFFIX.sub("", path)
+    if root == path:
+        root = os.path.splitext(path)[0]
+    return f"{root}_{size}.{_extension()}"
+
+
+def _write_variant(image, size, path):
+    from PIL import Image
+
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if PROFILE_PICTURE_CONFIG["format"] != "WEBP" and variant.mode != "RGB":
+        variant = variant.convert("RGB")
+    tmp_path = f"{path}.tmp"
+    variant.save(tmp_path, PROFILE_PICTURE_CONFIG["format"], quality=PROFILE_PICTURE_CONFIG["quality"])
+    os.replace(tmp_path, path)
+
+
+def _open_image(source):
+    """Decode an upload, applying its EXIF rotation; raises ValueError when it is not a usable image"""
+    from PIL import Image, ImageOps
+
+    try:
+        image = Image.open(source)
+        if image.width * image.height > PROFILE_PICTURE_CONFIG["max_pixels"]:
+            raise ValueError("Image dimensions are too large")
+        image = ImageOps.exif_transpose(image)
+        return image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Not a readable image ({e})")
+
+
+def store_profile_picture(user_id, data):
+    """Validate an upload and write its variants; returns the path to record for the user.
+
+    Raises ValueError for files over the size limit or that are not images.
+    The user's older variants are removed.
+    """
+    max_bytes = PROFILE_PICTURE_CONFIG["max_upload_bytes"]
+    if len(data) > max_bytes:
+        raise ValueError(f"Pictures can be at most {max_bytes // (1024 * 1024)} MB")
+    image = _open_image(io.BytesIO(data))
+
+    directory = PROFILE_PICTURE_CONFIG["dir"]
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    root = os.path.join(directory, f"{user_id}_{digest}")
+    paths = {}
+    for size in PROFILE_PICTURE_CONFIG["sizes"]:
+        paths[size] = f"{root}_{size}.{_extension()}"
+        _write_variant(image, size, paths[size])
+
+    for old_path in glob.glob(os.path.join(directory, f"{user_id}_*")):
+        if old_path not in paths.values():
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+    return paths[max(paths)]
+
+
+def profile_picture_variant(path, size):
+    """Path of the size-px variant of a stored picture, building it on first use for pictures saved before
+    thumbnails existed; None when the picture is missing or unreadable"""
+    if not path:
+        return None
+    target = variant_path(path, size)
+    if os.path.exists(target):
+        return target
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            image = _open_image(io.BytesIO(f.read()))
+        _write_variant(image, size, target)
+        return target
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Query Statistics for ProjectOps
+Counts SQL statements with SQLAlchemy cursor events and attributes each one
+to the app section (fragment) that was running when it was issued
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from sqlalchemy import event
+
+_local = threading.local()
+_recorders = []
+_recorders_lock = threading.Lock()
+
+# Section name -> id of the Streamlit fragment that last ran it, so a benchmark can rerun that fragment alone
+fragment_ids = {}
+
+
+def _running_fragment_id():
+    """Id of the Streamlit fragment running on this thread, or None"""
+    try:
+        from streamlit.runtime.scriptrunner_utils.script_run_context import ThreadState
+        return ThreadState.get().fragment_id
+    except ImportError:
+        # Streamlit releases before the thread-state refactor keep it on the run context
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return getattr(get_script_run_ctx(suppress_warning=True), "current_fragment_id", None)
+
+
+def _scope_stack():
+    if not hasattr(_local, "scopes"):
+        _local.scopes = []
+    return _local.scopes
+
+
+def current_scope():
+    """Innermost section name for this thread, or 'app' outside any tracked section"""
+    scopes = _scope_stack()
+    return scopes[-1] if scopes else "app"
+
+
+def thread_query_count():
+    """Queries issued by this thread since it started; diff two readings to count a span"""
+    return getattr(_local, "query_count", 0)
+
+
+class QueryRecorder:
+    """Collects (scope, statement, duration_ms) for every query while it is active"""
+
+    def __init__(self):
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def record(self, scope, statement, duration_ms):
+        with self._lock:
+            self.queries.append((scope, statement, duration_ms))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def count_by_scope(self):
+        counts = {}
+        for scope, _, _ in self.queries:
+            counts[scope] = counts.get(scope, 0) + 1
+        return counts
+
+    def clear(self):
+        with self._lock:
+            self.queries = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    _local.query_count = getattr(_local, "query_count", 0) + 1
+    if not _recorders:
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    scope = current_scope()
+    for recorder in list(_recorders):
+        recorder.record(scope, statement, duration_ms)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def install_query_counter(engine):
+    """Attach the cursor listeners to an engine (safe to call more than once)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def record_queries():
+    """Record every query issued on an instrumented engine inside the block"""
+    recorder = QueryRecorder()
+    with _recorders_lock:
+        _recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        with _recorders_lock:
+            _recorders.remove(recorder)
+
+
+@contextmanager
+def query_scope(name):
+    """Attribute queries issued by this thread inside the block to name"""
+    scopes = _scope_stack()
+    scopes.append(name)
+    try:
+        yield
+    finally:
+        scopes.pop()
+
+
+def track_queries(name):
+    """Decorator form of query_scope, used on the page fragments"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            fragment_id = _running_fragment_id()
+            if fragment_id:
+                fragment_ids[name] = fragment_id
+            with query_scope(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
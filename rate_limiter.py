@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Login Rate Limiter for Project Tracker
+Token buckets keyed by email and client with exponential lockout after
+repeated failures. State lives in memory and can optionally be shared
+between processes through a database table.
+"""
+
+import heapq
+import ipaddress
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import bindparam, text
+
+from config import LOGIN_RATE_LIMIT_CONFIG
+
+
+def _valid_address(value):
+    try:
+        return str(ipaddress.ip_address((value or "").strip()))
+    except ValueError:
+        return None
+
+
+def get_client_id():
+    """Address of the client making the current request, or None when it cannot be trusted.
+
+    X-Forwarded-For is only read when LOGIN_TRUSTED_PROXY_COUNT says how many
+    proxies sit in front of the app: the client is the entry that many hops
+    from the right, since anything further left is supplied by the client.
+    """
+    try:
+        proxies = LOGIN_RATE_LIMIT_CONFIG["trusted_proxy_count"]
+        if proxies:
+            forwarded = [hop.strip() for hop in st.context.headers.get("X-Forwarded-For", "").split(",") if hop.strip()]
+            return _valid_address(forwarded[-proxies]) if len(forwarded) >= proxies else None
+        return _valid_address(getattr(st.context, "ip_address", None))
+    except Exception:
+        return None
+
+
+class _BucketState:
+    __slots__ = ("tokens", "updated_at", "failures", "locked_until", "allowed", "blocked", "failed")
+
+    def __init__(self, tokens, updated_at, failures=0, locked_until=0.0):
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.failures = failures
+        self.locked_until = locked_until
+        self.allowed = 0
+        self.blocked = 0
+        self.failed = 0
+
+
+class LoginRateLimiter:
+    def __init__(self, engine=None, persist=None, config=None):
+        """Initialize the limiter; persist=True shares state through the database"""
+        self.config = dict(LOGIN_RATE_LIMIT_CONFIG, **(config or {}))
+        self.engine = engine
+        self.persist = self.config["persist"] if persist is None else persist
+        self._states = {}
+        self._lock = threading.Lock()
+        self.totals = {"allowed": 0, "blocked": 0, "failed": 0, "succeeded": 0}
+
+        if self.persist and self.engine is not None:
+            self._create_table()
+
+    def _create_table(self):
+        """Create the shared rate limit table"""
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("""
+                    CREATE TABLE IF NOT EXISTS login_rate_limits (
+                        limiter_key VARCHAR(320) PRIMARY KEY,
+                        tokens FLOAT NOT NULL,
+                        updated_at FLOAT NOT NULL,
+                        failures INTEGER DEFAULT 0,
+                        locked_until FLOAT DEFAULT 0
+                    )
+                """))
+                conn.commit()
+        except Exception as e:
+            st.error(f"Error creating rate limit table: {e}")
+            self.persist = False
+
+    def _settings(self, key):
+        kind = key.split(":", 1)[0]
+        return (
+            self.config[f"{kind}_capacity"],
+            self.config[f"{kind}_refill_seconds"],
+            self.config[f"{kind}_backoff_after_failures"]
+        )
+
+    def _keys(self, email, client_id):
+        # Attempts without a trustworthy client address share one larger bucket, so a
+        # client that hides its address still cannot spray attempts across many emails
+        keys = [f"email:{(email or '').strip().lower()}"]
+        keys.append(f"client:{client_id}" if client_id else "unattributed:all")
+        return keys
+
+    def _get_state(self, key, now):
+        state = self._states.get(key)
+        if state is None:
+            max_keys = self.config["max_tracked_keys"]
+            if len(self._states) >= max_keys:
+                self._prune(now)
+            if len(self._states) >= max_keys:
+                self._evict(len(self._states) - max_keys + 1 + max_keys // 10)
+            capacity, _, _ = self._settings(key)
+            state = _BucketState(capacity, now)
+            self._states[key] = state
+        return state
+
+    def _refill(self, key, state, now):
+        capacity, refill_seconds, _ = self._settings(key)
+        elapsed = max(0.0, now - state.updated_at)
+        state.tokens = min(capacity, state.tokens + elapsed / refill_seconds)
+        state.updated_at = now
+
+    def _prune(self, now):
+        """Drop idle keys whose buckets have fully refilled"""
+        for key in list(self._states):
+            state = self._states[key]
+            capacity, refill_seconds, _ = self._settings(key)
+            idle_for = now - state.updated_at
+            if state.locked_until <= now and state.failures == 0 and idle_for >= capacity * refill_seconds:
+                del self._states[key]
+
+    def _evict(self, count):
+        """Drop the count least recently updated keys; pruning frees nothing while many emails are failing"""
+        for key in heapq.nsmallest(count, self._states, key=lambda key: self._states[key].updated_at):
+            del self._states[key]
+
+    def _load_shared(self, keys, now):
+        """Merge shared state for keys this process has not locked locally"""
+        try:
+            with self.engine.connect() as conn:
+                query = text("""
+                    SELECT limiter_key, tokens, updated_at, failures, locked_until
+                    FROM login_rate_limits WHERE limiter_key IN :keys
+                """).bindparams(bindparam("keys", expanding=True))
+                rows = conn.execute(query, {"keys": keys}).fetchall()
+        except Exception:
+            return
+        with self._lock:
+            for row in rows:
+                # Keep whichever view is more restrictive
+                state = self._get_state(row.limiter_key, now)
+                self._refill(row.limiter_key, state, now)
+                capacity, refill_seconds, _ = self._settings(row.limiter_key)
+                shared_tokens = min(capacity, row.tokens + max(0.0, now - row.updated_at) / refill_seconds)
+                state.tokens = min(state.tokens, shared_tokens)
+                state.failures = max(state.failures, row.failures)
+                state.locked_until = max(state.locked_until, row.locked_until)
+
+    def _save_shared(self, keys):
+        with self._lock:
+            params = [{
+                "limiter_key": key,
+                "tokens": self._states[key].tokens,
+                "updated_at": self._states[key].updated_at,
+                "failures": self._states[key].failures,
+                "locked_until": self._states[key].locked_until
+            } for key in keys if key in self._states]
+        try:
+            with self.engine.connect() as conn:
+                query = text("""
+                    INSERT INTO login_rate_limits (limiter_key, tokens, updated_at, failures, locked_until)
+                    VALUES (:limiter_key, :tokens, :updated_at, :failures, :locked_until)
+                    ON CONFLICT (limiter_key) DO UPDATE SET
+                        tokens = excluded.tokens,
+                        updated_at = excluded.updated_at,
+                        failures = excluded.failures,
+                        locked_until = excluded.locked_until
+                """)
+                conn.execute(query, params)
+                conn.commit()
+        except Exception:
+            pass
+
+    def check(self, email, client_id):
+        """Consume a token for this attempt. Returns (allowed, retry_after_seconds)"""
+        now = time.time()
+        keys = self._keys(email, client_id)
+        with self._lock:
+            retry_after = self._blocked_for(keys, now)
+            if retry_after:
+                self._count_blocked(keys, now)
+                return False, retry_after
+
+        # Only consult the shared table when this process would allow the attempt,
+        # so a burst that is already blocked locally never reaches the database.
+        if self.persist and self.engine is not None:
+            self._load_shared(keys, now)
+
+        with self._lock:
+            retry_after = self._blocked_for(keys, now)
+            if retry_after:
+                self._count_blocked(keys, now)
+                return False, retry_after
+            for key in keys:
+                state = self._get_state(key, now)
+                state.tokens -= 1
+                state.allowed += 1
+            self.totals["allowed"] += 1
+
+        if self.persist and self.engine is not None:
+            self._save_shared(keys)
+        return True, 0
+
+    def _blocked_for(self, keys, now):
+        retry_after = 0
+        for key in keys:
+            state = self._get_state(key, now)
+            self._refill(key, state, now)
+            if state.locked_until > now:
+                retry_after = max(retry_after, state.locked_until - now)
+            if state.tokens < 1:
+                _, refill_seconds, _ = self._settings(key)
+                retry_after = max(retry_after, (1 - state.tokens) * refill_seconds)
+        return retry_after
+
+    def _count_blocked(self, keys, now):
+        for key in keys:
+            self._get_state(key, now).blocked += 1
+        self.totals["blocked"] += 1
+
+    def record_failure(self, email, client_id):
+        """Register a failed login and apply exponential lockout"""
+        now = time.time()
+        keys = self._keys(email, client_id)
+        with self._lock:
+            for key in keys:
+                state = self._get_state(key, now)
+                state.failures += 1
+                state.failed += 1
+                _, _, threshold = self._settings(key)
+                if state.failures >= threshold:
+                    delay = self.config["backoff_base_seconds"] * 2 ** (state.failures - threshold)
+                    state.locked_until = now + min(delay, self.config["backoff_max_seconds"])
+            self.totals["failed"] += 1
+        if self.persist and self.engine is not None:
+            self._save_shared(keys)
+
+    def record_success(self, email, client_id):
+        """Clear the failure streak for the email after a successful login"""
+        now = time.time()
+        key = self._keys(email, client_id)[0]
+        with self._lock:
+            state = self._get_state(key, now)
+            state.failures = 0
+            state.locked_until = 0.0
+            self.totals["succeeded"] += 1
+        if self.persist and self.engine is not None:
+            self._save_shared([key])
+
+    def reset(self, key=None):
+        """Clear one tracked key, or all of them"""
+        with self._lock:
+            if key is None:
+                self._states.clear()
+            else:
+                self._states.pop(key, None)
+        if self.persist and self.engine is not None:
+            try:
+                with self.engine.connect() as conn:
+                    if key is None:
+                        conn.execute(text("DELETE FROM login_rate_limits"))
+                    else:
+                        conn.execute(text("DELETE FROM login_rate_limits WHERE limiter_key = :key"), {"key": key})
+                    conn.commit()
+            except Exception as e:
+                st.error(f"Failed to reset rate limits: {e}")
+
+    def get_stats(self):
+        """Return per-key counters for the admin panel"""
+        now = time.time()
+        with self._lock:
+            rows = [{
+                "key": key,
+                "tokens": round(state.tokens, 2),
+                "failures": state.failures,
+                "locked_for_seconds": max(0, round(state.locked_until - now)),
+                "allowed": state.allowed,
+                "blocked": state.blocked,
+                "failed": state.failed
+            } for key, state in self._states.items()]
+        if rows:
+            return pd.DataFrame(rows).sort_values(["blocked", "failures"], ascending=False)
+        return pd.DataFrame()
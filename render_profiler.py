@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Render Profiler for ProjectOps
+Admin-only instrumentation of a single script run: sections (auth, sidebar,
+page), data loads and chart builds are timed with their query counts and
+cache outcome, then drawn as a waterfall at the bottom of the page
+"""
+
+import html
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import streamlit as st
+
+from query_stats import thread_query_count
+
+_local = threading.local()
+
+KIND_COLORS = {
+    'section': '#1f77b4',
+    'page': '#764ba2',
+    'data': '#28a745',
+    'chart': '#ff7f0e'
+}
+
+
+class RenderProfile:
+    """Timeline of one script run on one thread"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries_at_start = thread_query_count()
+        self.entries = []
+        self._open = []
+
+    def begin(self, name, kind):
+        entry = {
+            'name': name,
+            'kind': kind,
+            'depth': len(self._open),
+            'start_ms': (time.perf_counter() - self.started) * 1000,
+            'duration_ms': None,
+            'queries': thread_query_count(),
+            'cache': None
+        }
+        self.entries.append(entry)
+        self._open.append(entry)
+        return entry
+
+    def end(self, entry):
+        entry['duration_ms'] = (time.perf_counter() - self.started) * 1000 - entry['start_ms']
+        entry['queries'] = thread_query_count() - entry['queries']
+        # st.cache_data does not report hits; a data load that ran no query was served from cache
+        if entry['kind'] == 'data' and entry['cache'] is None:
+            entry['cache'] = 'hit' if entry['queries'] == 0 else 'miss'
+        if entry in self._open:
+            self._open.remove(entry)
+
+    def close_open(self):
+        """End every section still open, e.g. when the page stopped early with st.stop()"""
+        for entry in reversed(self._open[:]):
+            self.end(entry)
+
+    def note_cache(self, hit):
+        if self._open:
+            self._open[-1]['cache'] = 'hit' if hit else 'miss'
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def total_queries(self):
+        return thread_query_count() - self.queries_at_start
+
+
+def start_profile():
+    """Begin profiling this thread's script run"""
+    _local.profile = RenderProfile()
+
+
+def stop_profile():
+    """Stop profiling and return the finished profile (None when profiling was off)"""
+    profile = getattr(_local, "profile", None)
+    _local.profile = None
+    return profile
+
+
+def active_profile():
+    return getattr(_local, "profile", None)
+
+
+def begin_section(name, kind="section"):
+    """Start timing a section; pair with end_section (or use profile_section)"""
+    profile = active_profile()
+    return profile.begin(name, kind) if profile else None
+
+
+def end_section(entry):
+    profile = active_profile()
+    if profile and entry is not None:
+        profile.end(entry)
+
+
+@contextmanager
+def profile_section(name, kind="section"):
+    entry = begin_section(name, kind)
+    try:
+        yield
+    finally:
+        end_section(entry)
+
+
+def profile_call(kind):
+    """Decorator that times each call as a section named after the function"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if active_profile() is None:
+                return func(*args, **kwargs)
+            with profile_section(func.__name__, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def note_cache(hit):
+    """Record whether the innermost open section was served from a cache"""
+    profile = active_profile()
+    if profile:
+        profile.note_cache(hit)
+
+
+def render_profile_overlay():
+    """Finish profiling and draw the waterfall in a collapsed expander"""
+    profile = stop_profile()
+    if profile is None:
+        return
+    profile.close_open()
+    total_ms = max(profile.total_ms, 0.001)
+    entries = [entry for entry in profile.entries if entry['duration_ms'] is not None]
+    cached = [entry for entry in entries if entry['cache']]
+    hits = sum(1 for entry in cached if entry['cache'] == 'hit')
+
+    with st.expander(f"⏱️ Render profile: {total_ms:.0f} ms, {profile.total_queries} queries", expanded=False):
+        st.caption(
+            f"{len(entries)} timed calls · cache hits {hits}/{len(cached)} · "
+            "fragment-only reruns are not included"
+        )
+        rows = []
+        for entry in entries:
+            left = entry['start_ms'] / total_ms * 100
+            width = max(entry['duration_ms'] / total_ms * 100, 0.3)
+            color = KIND_COLORS.get(entry['kind'], '#607D8B')
+            cache = f" · {entry['cache']}" if entry['cache'] else ""
+            rows.append(
+                f'<div style="display: flex; align-items: center; font-size: 0.8rem; margin: 2px 0;">'
+                f'<div style="width: 30%; padding-left: {entry["depth"] * 12}px; white-space: nowrap; overflow: hidden; '
+                f'text-overflow: ellipsis;">{html.escape(entry["name"])}</div>'
+                f'<div style="flex: 1; position: relative; height: 12px; background: #f5f5f5; border-radius: 3px;">'
+                f'<div style="position: absolute; left: {left:.2f}%; width: {width:.2f}%; height: 100%; '
+                f'background: {color}; border-radius: 3px;"></div></div>'
+                f'<div style="width: 22%; text-align: right; color: #666;">{entry["duration_ms"]:.1f} ms · '
+                f'{entry["queries"]} q{cache}</div></div>'
+            )
+        st.markdown("\n".join(rows), unsafe_allow_html=True)
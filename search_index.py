@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Search Index for ProjectOps
+One full-text inverted index over projects, meetings, client updates and
+issues. SQLite uses an FTS5 table and PostgreSQL a tsvector column with a GIN
+index; triggers on the four source tables keep it in step with every write.
+The DDL only runs when the stored schema version differs from this file's
+"""
+
+import hashlib
+import re
+import threading
+
+from sqlalchemy import inspect, text
+
+from config import SEARCH_CONFIG
+
+# Wrapped around matched words in titles and snippets; the UI turns them into <mark>
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+# entity type -> source table, type code, date column and the text that is indexed.
+# The code packs (type, id) into the FTS5 rowid so triggers can find a row by key.
+SEARCH_SOURCES = {
+    'project': {
+        'table': 'projects', 'code': 0, 'project_id': 'id', 'date': 'start_date',
+        'title': 'project_name', 'body': ['client_name', 'software', 'vendor', 'description']
+    },
+    'meeting': {
+        'table': 'meetings', 'code': 1, 'project_id': 'project_id', 'date': 'meeting_date',
+        'title': 'agenda', 'body': ['attendees', 'mom', 'next_steps']
+    },
+    'update': {
+        'table': 'client_updates', 'code': 2, 'project_id': 'project_id', 'date': 'update_date',
+        'title': 'summary', 'body': ['sent_by', 'mode', 'client_feedback', 'next_step']
+    },
+    'issue': {
+        'table': 'issues', 'code': 3, 'project_id': 'project_id', 'date': 'date_reported',
+        'title': 'description', 'body': ['assigned_to', 'status']
+    }
+}
+
+INDEX_COLUMNS = "entity_type, entity_id, project_id, user_id, entity_date, title, body"
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def query_terms(search):
+    """Lower-cased words of a search string; punctuation and operators are dropped"""
+    return _TERM_PATTERN.findall((search or "").lower())[:SEARCH_CONFIG["max_terms"]]
+
+
+def fts5_query(terms, user_id=None, entity_types=None):
+    """FTS5 MATCH expression: every (stemmed) term must appear in the title or body.
+
+    The owner and entity type are indexed tokens too, so scoping narrows the
+    posting lists instead of filtering every match afterwards.
+    """
+    expression = "{title body} : (" + " ".join(f'"{term}"' for term in terms) + ")"
+    if entity_types:
+        expression = f"entity_type : ({' OR '.join(entity_types)}) AND {expression}"
+    if user_id:
+        expression = f'user_id : "{int(user_id)}" AND {expression}'
+    return expression
+
+
+def tsquery(terms):
+    """to_tsquery() input: every (stemmed) term must appear"""
+    return " & ".join(terms)
+
+
+def _row_values(entity_type, row):
+    """SELECT list matching INDEX_COLUMNS for one source row (row is NEW, OLD or a table alias)"""
+    source = SEARCH_SOURCES[entity_type]
+    body = " || ' ' || ".join(f"COALESCE({row}.{column}, '')" for column in source['body'])
+    return (
+        f"'{entity_type}', {row}.id, {row}.{source['project_id']}, {row}.user_id, {row}.{source['date']}, "
+        f"COALESCE({row}.{source['title']}, ''), {body}"
+    )
+
+
+def _sqlite_statements(entity_type):
+    source = SEARCH_SOURCES[entity_type]
+    table, code = source['table'], source['code']
+    insert = f"INSERT INTO search_index (rowid, {INDEX_COLUMNS}) SELECT NEW.id * 4 + {code}, {_row_values(entity_type, 'NEW')};"
+    delete = f"DELETE FROM search_index WHERE rowid = OLD.id * 4 + {code};"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS search_index_{table}_insert AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS search_index_{table}_delete AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS search_index_{table}_update AFTER UPDATE ON {table} BEGIN {delete} {insert} END",
+    ]
+
+
+def _postgres_statements(entity_type):
+    table = SEARCH_SOURCES[entity_type]['table']
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION search_index_{table}() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM search_index WHERE entity_type = '{entity_type}' AND entity_id = OLD.id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO search_index ({INDEX_COLUMNS}) SELECT {_row_values(entity_type, 'NEW')};
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"DROP TRIGGER IF EXISTS search_index_{table} ON {table}",
+        f"""
+        CREATE TRIGGER search_index_{table} AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION search_index_{table}()
+        """,
+    ]
+
+
+def _backfill_statement(entity_type, dialect):
+    source = SEARCH_SOURCES[entity_type]
+    if dialect == "sqlite":
+        return (
+            f"INSERT INTO search_index (rowid, {INDEX_COLUMNS}) "
+            f"SELECT s.id * 4 + {source['code']}, {_row_values(entity_type, 's')} FROM {source['table']} s"
+        )
+    return f"INSERT INTO search_index ({INDEX_COLUMNS}) SELECT {_row_values(entity_type, 's')} FROM {source['table']} s"
+
+
+def _schema_statements(dialect):
+    if dialect == "sqlite":
+        statements = [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "entity_type, entity_id UNINDEXED, project_id UNINDEXED, user_id, "
+            "entity_date UNINDEXED, title, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+        ]
+        for entity_type in SEARCH_SOURCES:
+            statements += _sqlite_statements(entity_type)
+        return statements
+    statements = [
+        """
+        CREATE TABLE IF NOT EXISTS search_index (
+            entity_type VARCHAR(20) NOT NULL,
+            entity_id INTEGER NOT NULL,
+            project_id INTEGER,
+            user_id INTEGER,
+            entity_date VARCHAR(20),
+            title TEXT,
+            body TEXT,
+            document tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+                setweight(to_tsvector('english', COALESCE(body, '')), 'B')
+            ) STORED,
+            PRIMARY KEY (entity_type, entity_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_search_index_document ON search_index USING gin (document)",
+        "CREATE INDEX IF NOT EXISTS idx_search_index_user ON search_index (user_id)",
+    ]
+    for entity_type in SEARCH_SOURCES:
+        statements += _postgres_statements(entity_type)
+    return statements
+
+
+def _installed_version(engine):
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version FROM search_index_version")).scalar()
+    except Exception:
+        return None
+
+
+# Databases (by URL) whose index this process has already checked
+_checked = set()
+_checked_lock = threading.Lock()
+
+
+def create_search_index(engine):
+    """Create the index table and its triggers; a new index is filled from the existing rows.
+
+    Runs the DDL only when the schema version stored in the database differs
+    from the statements below (a new database, or an upgrade), and checks each
+    database once per process.
+    """
+    # In-memory SQLite URLs name a different database per engine, so they are always checked
+    key = engine.url.render_as_string(hide_password=False) if engine.url.database not in (None, "", ":memory:") else None
+    if key in _checked:
+        return
+    dialect = engine.dialect.name
+    statements = _schema_statements(dialect)
+    version = hashlib.sha256("\n".join(statements).encode("utf-8")).hexdigest()[:16]
+    with _checked_lock:
+        if key in _checked:
+            return
+        if _installed_version(engine) != version:
+            if not inspect(engine).has_table("search_index"):
+                statements += [_backfill_statement(entity_type, dialect) for entity_type in SEARCH_SOURCES]
+            statements += [
+                "CREATE TABLE IF NOT EXISTS search_index_version (version VARCHAR(64) NOT NULL)",
+                "DELETE FROM search_index_version",
+            ]
+            with engine.connect() as conn:
+                for statement in statements:
+                    conn.execute(text(statement))
+                conn.execute(text("INSERT INTO search_index_version (version) VALUES (:version)"), {'version': version})
+                conn.commit()
+        if key:
+            _checked.add(key)
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Shared Result Cache for ProjectOps
+A second cache level behind st.cache_data for deployments that run several
+Streamlit processes. Query results and figure specs are stored in a backend
+every worker can read (by default a local SQLite file), and entries are keyed
+on the per-user data versions kept in the database, so a write in any process
+makes the stale entries unreachable everywhere
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from functools import wraps
+
+from config import SHARED_CACHE_CONFIG
+
+# Returned by get() on a miss; None is a valid cached value
+MISSING = object()
+
+
+def cache_key(name, args, kwargs=None):
+    """Stable key for one call: namespace, function name and a hash of the arguments"""
+    payload = json.dumps([args, kwargs or {}], sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+    return f"{SHARED_CACHE_CONFIG['namespace']}:{name}:{digest}"
+
+
+class SQLiteCacheBackend:
+    """Pickled entries in a SQLite file (WAL mode) shared by every worker on the host"""
+
+    def __init__(self, path, ttl_seconds, max_entries):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sets = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires_at)")
+
+    def _connect(self):
+        # One connection per thread, reopened after a fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key):
+        try:
+            row = self._connect().execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return MISSING
+            value = pickle.loads(row[0])
+        except Exception:
+            # A broken shared cache only costs the query it would have saved
+            self._count("errors")
+            return MISSING
+        self._count("hits")
+        return value
+
+    def set(self, key, value):
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, data, time.time() + self.ttl_seconds)
+            )
+            with self._lock:
+                self._sets += 1
+                prune = self._sets % 100 == 0
+            if prune:
+                self._prune(conn)
+        except Exception:
+            self._count("errors")
+
+    def _prune(self, conn):
+        """Drop expired entries, then the ones closest to expiry while over max_entries"""
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        excess = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_entries ORDER BY expires_at LIMIT ?)",
+                (excess,)
+            )
+
+    def clear(self):
+        self._connect().execute("DELETE FROM cache_entries")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.errors = 0
+
+    def stats(self):
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries"
+            ).fetchone()
+        except Exception:
+            entries, size = 0, 0
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': 'sqlite',
+                'hits': self.hits,
+                'misses': self.misses,
+                'errors': self.errors,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': entries,
+                'bytes': size
+            }
+
+
+def _sqlite_backend(config):
+    return SQLiteCacheBackend(config["path"], config["ttl_seconds"], config["max_entries"])
+
+
+# backend name -> factory(config); register_backend() adds others (e.g. a shared-memory or Redis store)
+BACKENDS = {
+    'sqlite': _sqlite_backend
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def register_backend(name, factory):
+    """Make a backend selectable through SHARED_CACHE_CONFIG["backend"]"""
+    BACKENDS[name] = factory
+
+
+def get_shared_cache():
+    """The configured backend for this process, or None when shared caching is off"""
+    global _backend
+    if not SHARED_CACHE_CONFIG["enabled"] or SHARED_CACHE_CONFIG["backend"] == "none":
+        return None
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = BACKENDS[SHARED_CACHE_CONFIG["backend"]](SHARED_CACHE_CONFIG)
+    return _backend
+
+
+def shared_result(func):
+    """Serve func's result from the shared cache, keyed on its name and arguments.
+
+    Callers pass the user's data version as an argument so a write anywhere
+    moves them to a fresh key instead of reading a stale entry.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = get_shared_cache()
+        if cache is None:
+            return func(*args, **kwargs)
+        key = cache_key(func.__name__, args, kwargs)
+        value = cache.get(key)
+        if value is MISSING:
+            value = func(*args, **kwargs)
+            cache.set(key, value)
+        return value
+    return wrapper
+
+
+def _check_worker(args):
+    """One step of the multi-process check, run in a fresh interpreter"""
+    db_url, user_id, action = args
+    from database_postgres import ProjectOpsDatabase
+    from query_stats import thread_query_count
+
+    db = ProjectOpsDatabase(db_url)
+
+    @shared_result
+    def load_projects(user_id, data_version):
+        return db.get_all_projects(user_id)
+
+    if action == "write":
+        db.add_project("Shared cache check", "Check Client", "Other", "", "2025-01-01", "2025-12-31",
+                       "In Progress", "Added by the shared cache check", user_id=user_id)
+        return {'pid': os.getpid(), 'version': db.get_data_version(user_id)}
+    version = db.get_data_version(user_id)
+    before = thread_query_count()
+    projects = load_projects(user_id, version)
+    return {
+        'pid': os.getpid(),
+        'version': version,
+        'rows': len(projects),
+        'queries': thread_query_count() - before
+    }
+
+
+def run_check(workers):
+    """Start worker processes on a throwaway SQLite database and cache file; returns (passed, log lines)"""
+    import multiprocessing
+
+    workdir = tempfile.mkdtemp(prefix="shared_cache_check_")
+    db_url = f"sqlite:///{os.path.join(workdir, 'check.db')}"
+    os.environ["SHARED_CACHE"] = "true"
+    os.environ["SHARED_CACHE_BACKEND"] = "sqlite"
+    os.environ["SHARED_CACHE_PATH"] = os.path.join(workdir, "cache.db")
+    # Spawned workers re-import config and pick the settings up from the environment
+    context = multiprocessing.get_context("spawn")
+    user_id = 1
+    log = []
+    passed = True
+
+    def expect(condition, message):
+        nonlocal passed
+        passed = passed and condition
+        log.append(f"{'✅' if condition else '❌'} {message}")
+
+    with context.Pool(workers) as pool:
+        pool.map(_check_worker, [(db_url, user_id, "write")])
+        first = pool.apply(_check_worker, [(db_url, user_id, "read")])
+        expect(first['queries'] > 0, f"worker {first['pid']} loaded {first['rows']} project(s) from the database "
+                                     f"(version {first['version']}, {first['queries']} queries)")
+
+        reads = pool.map(_check_worker, [(db_url, user_id, "read")] * workers)
+        for read in reads:
+            expect(read['queries'] == 0 and read['rows'] == first['rows'],
+                   f"worker {read['pid']} read the same {read['rows']} project(s) from the shared cache")
+
+        write = pool.apply(_check_worker, [(db_url, user_id, "write")])
+        expect(write['version'] > first['version'],
+               f"worker {write['pid']} added a project and bumped the data version to {write['version']}")
+
+        time.sleep(SHARED_CACHE_CONFIG["version_refresh_seconds"] + 0.2)
+        reads = pool.map(_check_worker, [(db_url, user_id, "read")] * workers)
+        expect(all(read['rows'] == first['rows'] + 1 for read in reads),
+               f"all {len({read['pid'] for read in reads})} worker(s) saw {first['rows'] + 1} project(s) after the write")
+        expect(all(read['version'] == write['version'] for read in reads),
+               "every worker read the new data version from the database")
+    return passed, log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the shared result cache or check it across processes")
+    parser.add_argument("--stats", action="store_true", help="Show entry count and size of the configured cache")
+    parser.add_argument("--clear", action="store_true", help="Delete every entry in the configured cache")
+    parser.add_argument("--check", action="store_true", help="Run a multi-process check on a temporary database")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes for --check")
+    args = parser.parse_args()
+
+    if args.check:
+        print(f"\n🔄 Checking the shared cache with {args.workers} worker processes\n")
+        passed, log = run_check(args.workers)
+        print("\n".join(log))
+        print(f"\n{'✅ Shared cache check passed' if passed else '❌ Shared cache check failed'}")
+        sys.exit(0 if passed else 1)
+
+    cache = get_shared_cache()
+    if cache is None:
+        print("ℹ️ Shared caching is off (set SHARED_CACHE=true and SHARED_CACHE_BACKEND)")
+        return
+    if args.clear:
+        cache.clear()
+        print("🗑️ Shared cache cleared")
+    stats = cache.stats()
+    print(f"📦 {stats['backend']} cache: {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
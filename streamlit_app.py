@@ -15,98 +15,38 @@ st.set_page_config(
 )
 
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
 import sys
-from file_uploader import render_file_upload_section
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import modules
-from database_postgres import ProjectOpsDatabase
-from chatbot import ProjectChatbot
-from reports import ReportGenerator
+from app_cache import (
+    get_database, get_chatbot, get_report_generator, get_figure_cache,
+    cached_projects, cached_meetings, cached_issues, cached_client_updates,
+    cached_project_activity_counts, cached_profile_picture, cached_profile_thumbnail, cached_dashboard_metrics,
+    cached_project_status_counts, cached_recent_projects, cached_recent_meetings, cached_analytics,
+    cached_project_bundle, cached_project_filter_options, cached_filtered_project_count, cached_filtered_projects,
+    cached_global_search_count, cached_global_search
+)
+from chart_cache import pie_chart, line_chart, bar_chart
+from config import PROJECT_CARD_PAGE_SIZES, PROJECT_CARD_DEFAULT_PAGE_SIZE, PROFILE_PICTURE_CONFIG, SEARCH_CONFIG, EXPORT_CONFIG
+from query_stats import track_queries
+from render_profiler import start_profile, stop_profile, profile_section, begin_section, end_section, render_profile_overlay
+from shared_cache import get_shared_cache
+from ui_components import inject_styles, metric_card, avatar, activity_feed, project_card, search_hit
 from neon_auth import auth
 from login_page import render_login_page, check_if_admin_exists, render_force_password_change
-from email_management import render_email_management_page
-
-# Initialize components
-db = ProjectOpsDatabase()
-chatbot = ProjectChatbot(db)
-reports = ReportGenerator()
-
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-size: 2.5rem;
-        font-weight: bold;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin: 0.5rem 0;
-    }
-    .metric-value {
-        font-size: 2rem;
-        font-weight: bold;
-        margin-bottom: 0.5rem;
-    }
-    .metric-label {
-        font-size: 1rem;
-        opacity: 0.9;
-    }
-    .chat-message {
-        padding: 1rem;
-        margin: 0.5rem 0;
-        border-radius: 10px;
-        border-left: 4px solid #1f77b4;
-    }
-    .user-message {
-        background: #f0f8ff;
-        border-left-color: #1f77b4;
-    }
-    .bot-message {
-        background: #f8f9fa;
-        border-left-color: #28a745;
-    }
-    .stButton > button {
-        border-radius: 20px;
-        font-weight: bold;
-    }
-    .stSelectbox > div > div {
-        border-radius: 10px;
-    }
-    .stTextInput > div > div > input {
-        border-radius: 10px;
-    }
-    .project-card {
-        background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
-        border-radius: 16px;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.12);
-        padding: 1.8rem;
-        margin-bottom: 1.8rem;
-        border-left: 6px solid #2196F3;
-        position: relative;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Remove Streamlit's default page navigation if present
-st.markdown("""
-    <style>
-    [data-testid="stSidebarNav"] {display: none;}
-    </style>
-""", unsafe_allow_html=True)
+
+# Initialize components (built once per process). Page-specific modules such as
+# plotly, reports (reportlab/openpyxl) and email integration (requests) are
+# imported by the page that uses them so the login page starts quickly.
+db = get_database()
+
+# One stylesheet for the app; unchanged between runs, so the browser gets it once per session
+inject_styles()
 
 # Authentication check
 def check_authentication():
@@ -129,11 +69,662 @@ def check_authentication():
             st.stop()
     return current_user
 
+
+@st.fragment
+@track_queries("project_tracker")
+def render_project_tracker(current_user):
+    """Project Tracker page; widgets inside it rerun only this fragment"""
+    st.markdown('<h1 class="main-header">📁 Project Tracker</h1>', unsafe_allow_html=True)
+    
+    # Add some spacing and visual separation
+    st.markdown("---")
+    
+    tab1, tab2, tab3 = st.tabs(["➕ Add New Project", "📋 All Projects", "📁 File Management"])
+    
+    with tab1:
+        st.markdown("### 🆕 Create New Project")
+        st.markdown("Fill in the details below to create a new project entry.")
+        
+        # File upload section OUTSIDE the form
+        with st.expander("📎 File Upload (Optional)", expanded=False):
+            from file_uploader import render_file_upload_section
+            uploaded_file_path = render_file_upload_section(None, None)
+        
+        # Project form in a clean container
+        with st.container():
+            st.markdown("#### Project Information")
+            with st.form("project_form", clear_on_submit=True):
+                # Project details in organized columns
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown("**Basic Information**")
+                    project_name = st.text_input("Project Name *", placeholder="Enter project name", key="project_name_input")
+                    client_name = st.text_input("Client Name *", placeholder="Enter client name", key="client_name_input")
+                    software = st.selectbox("Software *", ["Epicor", "MYOB", "ODOO", "PayGlobal", "Sage 300", "Other"], key="software_select")
+                    vendor = st.text_input("Vendor *", placeholder="Enter vendor name", key="vendor_input")
+                
+                with col2:
+                    st.markdown("**Timeline & Status**")
+                    start_date = st.date_input("Start Date *", key="start_date_input")
+                    deadline = st.date_input("Deadline *", key="deadline_input")
+                    status = st.selectbox("Status *", ["In Progress", "On Hold", "Completed", "Planning"], key="status_select")
+                
+                # Description and file upload
+                st.markdown("**Project Details**")
+                description = st.text_area("Description *", placeholder="Enter detailed project description", key="description_input", height=100)
+                
+                # Form validation and submission
+                if not project_name or not client_name or not vendor or not description:
+                    st.warning("⚠️ Please fill in all required fields marked with *")
+                
+                # Submit button with better styling
+                col1b, col2b, col3b = st.columns([1, 2, 1])
+                with col2b:
+                    submitted = st.form_submit_button("➕ Create Project", use_container_width=True, type="primary")
+                
+                if submitted:
+                    if not project_name or not client_name or not vendor or not description:
+                        st.error("❌ Please fill in all required fields marked with *")
+                    elif start_date >= deadline:
+                        st.error("❌ Deadline must be after start date")
+                    else:
+                        # Prefer file uploaded in form, else use uploaded_file_path from outside
+                        file_path = None
+                        if uploaded_file_path:
+                            file_path = uploaded_file_path
+                        
+                        success = db.add_project(
+                            project_name, client_name, software, vendor,
+                            start_date.strftime('%Y-%m-%d'), deadline.strftime('%Y-%m-%d'),
+                            status, description, file_path, current_user['id']
+                        )
+                        if success:
+                            st.success(f"✅ Project '{project_name}' created successfully!")
+                            st.balloons()
+                        else:
+                            st.error("❌ Failed to create project. Please try again.")
+    
+    with tab2:
+        st.markdown("### 📋 Project Overview")
+        
+        # Counts, dropdown values and the visible page all come from SQL
+        status_counts = cached_project_status_counts(current_user['id'])
+        
+        if status_counts:
+            # Summary metrics
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                total_projects = sum(status_counts.values())
+                st.metric("Total Projects", total_projects)
+            with col2:
+                active_projects = status_counts.get('In Progress', 0)
+                st.metric("Active Projects", active_projects)
+            with col3:
+                completed_projects = status_counts.get('Completed', 0)
+                st.metric("Completed", completed_projects)
+            with col4:
+                on_hold_projects = status_counts.get('On Hold', 0)
+                st.metric("On Hold", on_hold_projects)
+            
+            st.markdown("---")
+            
+            # Filters in a clean layout
+            st.markdown("#### 🔍 Filter & Search")
+            filter_options = cached_project_filter_options(current_user['id'])
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                status_filter = st.selectbox("Status Filter", ["All"] + filter_options['status'], key="status_filter_projects")
+            with col2:
+                software_filter = st.selectbox("Software Filter", ["All"] + filter_options['software'], key="software_filter_projects")
+            with col3:
+                search_term = st.text_input("Search Projects", placeholder="Search by name or client", key="search_projects")
+            
+            # Filters run in the database; rows without a usable name are excluded there too
+            project_filters = {
+                'status': None if status_filter == "All" else status_filter,
+                'software': None if software_filter == "All" else software_filter,
+                'search': search_term.strip() or None
+            }
+            match_count = cached_filtered_project_count(current_user['id'], **project_filters)
+            
+            st.markdown(f"#### 📊 Projects ({match_count} found)")
+            
+            # Server-side pagination: only the visible page is rendered
+            col_size, col_page, col_info = st.columns([1, 1, 2])
+            with col_size:
+                page_size = st.selectbox(
+                    "Cards per page", PROJECT_CARD_PAGE_SIZES,
+                    index=PROJECT_CARD_PAGE_SIZES.index(PROJECT_CARD_DEFAULT_PAGE_SIZE),
+                    key="project_cards_page_size"
+                )
+            total_pages = max(1, -(-match_count // page_size))
+            with col_page:
+                page_number = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1, key="project_cards_page")
+            with col_info:
+                st.markdown(f'<div class="pager-info">Page {page_number} of {total_pages}</div>', unsafe_allow_html=True)
+            page_projects = cached_filtered_projects(
+                current_user['id'], limit=page_size, offset=(page_number - 1) * page_size, **project_filters
+            )
+            activity_counts = cached_project_activity_counts(page_projects['id'].tolist(), current_user['id'])
+            
+            card_cols = st.columns(2)
+            for card_count, (idx, project) in enumerate(page_projects.iterrows()):
+                pid = project.get('id')
+                counts = activity_counts.get(int(pid), {'meetings': 0, 'updates': 0, 'issues': 0})
+                
+                with card_cols[card_count % 2]:
+                    st.markdown(project_card(project, counts), unsafe_allow_html=True)
+                    if st.button("🔍 View More", key=f"view_more_{pid}"):
+                        st.session_state['show_project_detail'] = True
+                        st.session_state['selected_project_id'] = pid
+                        st.rerun()
+            
+            # Export options with better styling
+            st.markdown("---")
+            st.markdown("#### 📤 Export Options")
+            col1e, col2e = st.columns(2)
+            with col1e:
+                if st.button("📊 Export to PDF", key="projects_export_pdf", use_container_width=True):
+                    filtered_projects = db.filter_projects(current_user['id'], **project_filters)
+                    filename = get_report_generator().export_projects_to_pdf(filtered_projects, "projects_report.pdf")
+                    with open(filename, "rb") as f:
+                        st.download_button("📥 Download PDF", f, file_name="projects_report.pdf", use_container_width=True)
+            with col2e:
+                if st.button("📈 Export to Excel", key="projects_export_excel", use_container_width=True):
+                    filtered_projects = db.filter_projects(current_user['id'], **project_filters)
+                    filename = get_report_generator().export_to_excel(filtered_projects, "projects_report.xlsx")
+                    with open(filename, "rb") as f:
+                        st.download_button("📥 Download Excel", f, file_name="projects_report.xlsx", use_container_width=True)
+        else:
+            st.info("📭 No projects found. Create your first project using the 'Add New Project' tab!")
+    
+    with tab3:
+        st.markdown("### 📁 File Management")
+        st.markdown("Upload and manage project-related files.")
+        
+        from file_uploader import render_bulk_file_upload, render_file_analytics
+        
+        # File management options
+        file_option = st.selectbox(
+            "Choose File Management Option",
+            ["📦 Bulk File Upload", "📊 File Analytics"],
+            key="file_management_option"
+        )
+        
+        if file_option == "📦 Bulk File Upload":
+            render_bulk_file_upload(current_user['id'])
+        elif file_option == "📊 File Analytics":
+            render_file_analytics()
+
+
+SEARCH_ENTITY_LABELS = {
+    'project': ("📁", "Project"),
+    'meeting': ("🗓️", "Meeting"),
+    'update': ("🧾", "Client Update"),
+    'issue': ("🛠️", "Issue")
+}
+
+
+def _reset_search_page():
+    # Dropping the widget's state puts it back on page 1
+    st.session_state.pop('global_search_page', None)
+
+
+@st.fragment
+@track_queries("search")
+def render_global_search(current_user):
+    """Global Search page over the full-text index; widgets inside it rerun only this fragment"""
+    st.markdown('<h1 class="main-header">🔎 Global Search</h1>', unsafe_allow_html=True)
+    st.markdown("Search project details, meeting minutes and next steps, client updates and feedback, and issues.")
+    
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        search_term = st.text_input(
+            "Search", placeholder="e.g. data migration sign-off", key="global_search_query", on_change=_reset_search_page
+        )
+    with col2:
+        entity_types = st.multiselect(
+            "Only show", list(SEARCH_ENTITY_LABELS), format_func=lambda entity_type: SEARCH_ENTITY_LABELS[entity_type][1],
+            key="global_search_types", on_change=_reset_search_page
+        )
+    
+    if not search_term.strip():
+        st.info("Type one or more words; results contain all of them, in any form (e.g. 'meetings' finds 'meeting').")
+        return
+    
+    match_count = cached_global_search_count(current_user['id'], search_term, entity_types)
+    if not match_count:
+        st.info("No matches found")
+        return
+    
+    page_size = SEARCH_CONFIG["page_size"]
+    total_pages = max(1, -(-match_count // page_size))
+    col_count, col_page = st.columns([3, 1])
+    with col_count:
+        st.markdown(f"#### {match_count} results")
+    with col_page:
+        page_number = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1, key="global_search_page")
+    
+    hits = cached_global_search(
+        current_user['id'], search_term, entity_types, limit=page_size, offset=(page_number - 1) * page_size
+    )
+    for _, hit in hits.iterrows():
+        icon, label = SEARCH_ENTITY_LABELS.get(hit['entity_type'], ("", hit['entity_type']))
+        st.markdown(search_hit(hit, icon, label), unsafe_allow_html=True)
+        if st.button("Open project", key=f"search_open_{hit['entity_type']}_{hit['entity_id']}"):
+            st.session_state['show_project_detail'] = True
+            st.session_state['selected_project_id'] = int(hit['project_id'])
+            st.rerun()
+    st.caption(f"Page {page_number} of {total_pages}")
+
+
+@st.fragment
+@track_queries("meeting_log")
+def render_meeting_log(current_user):
+    """Meeting & MoM Log page; widgets inside it rerun only this fragment"""
+    st.markdown('<h1 class="main-header">Meeting & MoM Log</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2 = st.tabs(["➕ Log New Meeting", "📋 All Meetings"])
+    
+    with tab1:
+        with st.expander("Log New Meeting", expanded=True):
+            with st.form("meeting_form"):
+                projects = cached_projects(current_user['id'])
+                project_options = projects[["id", "project_name"]].values.tolist()
+                project_dict = {name: pid for pid, name in project_options}
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    project_name = st.selectbox("Project", list(project_dict.keys()), key="meeting_project_select")
+                    meeting_date = st.date_input("Date", key="meeting_date_input")
+                    attendees = st.text_input("Attendees", placeholder="Enter attendee names", key="meeting_attendees_input")
+                
+                with col2:
+                    agenda = st.text_input("Agenda", placeholder="Enter meeting agenda", key="meeting_agenda_input")
+                    follow_up_date = st.date_input("Follow-up Date", key="meeting_followup_input")
+                
+                mom = st.text_area("Minutes of Meeting (MoM)", placeholder="Enter meeting minutes", key="meeting_mom_input")
+                next_steps = st.text_area("Next Steps", placeholder="Enter next steps", key="meeting_next_steps_input")
+                
+                submitted = st.form_submit_button("📝 Log Meeting", use_container_width=True)
+                
+                if submitted:
+                    db.add_meeting(
+                        project_dict[project_name],
+                        meeting_date.strftime('%Y-%m-%d'),
+                        attendees, agenda, mom, next_steps,
+                        follow_up_date.strftime('%Y-%m-%d'),
+                        current_user['id']
+                    )
+                    st.success(f"✅ Meeting for '{project_name}' logged successfully!")
+    
+    with tab2:
+        meetings = cached_meetings(current_user['id'])
+        if not meetings.empty:
+            st.dataframe(meetings, use_container_width=True)
+            
+            # Export options
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("📊 Export to PDF", key="meetings_pdf", use_container_width=True):
+                    filename = get_report_generator().export_meetings_to_pdf(meetings, "meetings_report.pdf")
+                    with open(filename, "rb") as f:
+                        st.download_button("📥 Download PDF", f, file_name="meetings_report.pdf", use_container_width=True)
+            with col2:
+                if st.button("📈 Export to Excel", key="meetings_excel", use_container_width=True):
+                    filename = get_report_generator().export_to_excel(meetings, "meetings_report.xlsx")
+                    with open(filename, "rb") as f:
+                        st.download_button("📥 Download Excel", f, file_name="meetings_report.xlsx", use_container_width=True)
+        else:
+            st.info("No meetings found")
+
+
+@st.fragment
+@track_queries("client_update_log")
+def render_client_update_log(current_user):
+    """Client Update Log page; widgets inside it rerun only this fragment"""
+    st.markdown('<h1 class="main-header">Client Update Log</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2 = st.tabs(["➕ Log Client Update", "📋 All Updates"])
+    
+    with tab1:
+        with st.expander("Log Client Update", expanded=True):
+            with st.form("update_form"):
+                projects = cached_projects(current_user['id'])
+                project_options = projects[["id", "project_name"]].values.tolist()
+                project_dict = {name: pid for pid, name in project_options}
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    project_name = st.selectbox("Project", list(project_dict.keys()), key="update_project_select")
+                    update_date = st.date_input("Date", key="update_date_input")
+                    sent_by = st.text_input("Sent By", placeholder="Enter sender name", key="update_sent_by_input")
+                
+                with col2:
+                    mode = st.selectbox("Mode", ["Email", "Call", "Meeting", "Other"], key="update_mode_select")
+                
+                summary = st.text_area("Summary", placeholder="Enter update summary", key="update_summary_input")
+                client_feedback = st.text_area("Client Feedback", placeholder="Enter client feedback", key="update_feedback_input")
+                next_step = st.text_area("Next Step", placeholder="Enter next step", key="update_next_step_input")
+                
+                submitted = st.form_submit_button("📧 Log Update", use_container_width=True)
+                
+                if submitted:
+                    db.add_client_update(
+                        project_dict[project_name],
+                        update_date.strftime('%Y-%m-%d'),
+                        summary, sent_by, mode, client_feedback, next_step,
+                        current_user['id']
+                    )
+                    st.success(f"✅ Update for '{project_name}' logged successfully!")
+    
+    with tab2:
+        updates = cached_client_updates(current_user['id'])
+        
+        if not updates.empty:
+            st.dataframe(updates, use_container_width=True)
+            
+            # Export options
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("📊 Export to PDF", key="updates_pdf", use_container_width=True):
+                    filename = get_report_generator().export_projects_to_pdf(updates, "updates_report.pdf")
+                    with open(filename, "rb") as f:
+                        st.download_button("📥 Download PDF", f, file_name="updates_report.pdf", use_container_width=True)
+            with col2:
+                if st.button("📈 Export to Excel", key="updates_excel", use_container_width=True):
+                    filename = get_report_generator().export_to_excel(updates, "updates_report.xlsx")
+                    with open(filename, "rb") as f:
+                        st.download_button("📥 Download Excel", f, file_name="updates_report.xlsx", use_container_width=True)
+        else:
+            st.info("No updates found")
+
+
+@st.fragment
+@track_queries("issue_tracker")
+def render_issue_tracker(current_user):
+    """Issue Tracker page; widgets inside it rerun only this fragment"""
+    st.markdown('<h1 class="main-header">Issue Tracker</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2 = st.tabs(["➕ Log New Issue", "📋 All Issues"])
+    
+    with tab1:
+        with st.expander("Log New Issue", expanded=True):
+            with st.form("issue_form"):
+                projects = cached_projects(current_user['id'])
+                project_options = projects[["id", "project_name"]].values.tolist()
+                project_dict = {name: pid for pid, name in project_options}
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    project_name = st.selectbox("Project", list(project_dict.keys()), key="issue_project_select")
+                    date_reported = st.date_input("Date Reported", key="issue_date_input")
+                    status = st.selectbox("Status", ["Pending", "In Progress", "Resolved"], key="issue_status_select")
+                
+                with col2:
+                    assigned_to = st.text_input("Assigned To", placeholder="Enter assignee name", key="issue_assigned_input")
+                    resolution_date = st.date_input("Resolution Date", key="issue_resolution_input")
+                
+                description = st.text_area("Description", placeholder="Enter issue description", key="issue_description_input")
+                
+                submitted = st.form_submit_button("🐞 Log Issue", use_container_width=True)
+                
+                if submitted:
+                    db.add_issue(
+                        project_dict[project_name],
+                        date_reported.strftime('%Y-%m-%d'),
+                        description, status, assigned_to,
+                        resolution_date.strftime('%Y-%m-%d'),
+                        current_user['id']
+                    )
+                    st.success(f"✅ Issue for '{project_name}' logged successfully!")
+    
+    with tab2:
+        issues = cached_issues(current_user['id'])
+        if not issues.empty:
+            st.dataframe(issues, use_container_width=True)
+            
+            # Export options
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("📊 Export to PDF", key="issues_pdf", use_container_width=True):
+                    filename = get_report_generator().export_projects_to_pdf(issues, "issues_report.pdf")
+                    with open(filename, "rb") as f:
+                        st.download_button("📥 Download PDF", f, file_name="issues_report.pdf", use_container_width=True)
+            with col2:
+                if st.button("📈 Export to Excel", key="issues_excel", use_container_width=True):
+                    filename = get_report_generator().export_to_excel(issues, "issues_report.xlsx")
+                    with open(filename, "rb") as f:
+                        st.download_button("📥 Download Excel", f, file_name="issues_report.xlsx", use_container_width=True)
+        else:
+            st.info("No issues found")
+
+
+@st.fragment
+@track_queries("chat")
+def render_chat(current_user):
+    """AI Chatbot page; sending a message reruns only this fragment"""
+    st.markdown('<h1 class="main-header">AI Project Assistant</h1>', unsafe_allow_html=True)
+    st.markdown("Ask questions about your projects, get insights, and receive AI-powered recommendations.")
+    
+    # Initialize chat history
+    if "messages" not in st.session_state:
+        st.session_state.messages = []
+
+    # Display chat messages
+    for message in st.session_state.messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+    # Chat input
+    if prompt := st.chat_input("Ask me about your projects..."):
+        # Add user message to chat history
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        # Get AI response
+        with st.chat_message("assistant"):
+            response = get_chatbot().process_query(prompt, current_user['id'])
+            st.markdown(response)
+            st.session_state.messages.append({"role": "assistant", "content": response})
+
+    # Clear chat button; the callback runs before the fragment redraws
+    st.button("🗑️ Clear Chat", key="clear_chat", on_click=lambda: st.session_state.update(messages=[]))
+
+
+# Project detail callbacks run before the fragment redraws, so the lists
+# below them already reflect the change without another rerun
+@track_queries("project_detail")
+def _delete_detail_record(method_name, record_id, notice):
+    getattr(db, method_name)(record_id)
+    st.session_state['project_detail_notice'] = notice
+
+
+@track_queries("project_detail")
+def _add_detail_meeting(pid, user_id):
+    state = st.session_state
+    db.add_meeting(
+        pid, state['detail_meeting_date'].strftime('%Y-%m-%d'),
+        state['detail_meeting_attendees'], state['detail_meeting_agenda'],
+        state['detail_meeting_mom'], state['detail_meeting_next_steps'],
+        state['detail_meeting_follow_up'].strftime('%Y-%m-%d'), user_id
+    )
+    state['project_detail_notice'] = "Meeting added!"
+
+
+@track_queries("project_detail")
+def _add_detail_update(pid, user_id):
+    state = st.session_state
+    db.add_client_update(
+        pid, state['detail_update_date'].strftime('%Y-%m-%d'),
+        state['detail_update_summary'], state['detail_update_sent_by'], state['detail_update_mode'],
+        state['detail_update_feedback'], state['detail_update_next_step'], user_id
+    )
+    state['project_detail_notice'] = "Update added!"
+
+
+@track_queries("project_detail")
+def _add_detail_issue(pid, user_id):
+    state = st.session_state
+    db.add_issue(
+        pid, state['detail_issue_date'].strftime('%Y-%m-%d'),
+        state['detail_issue_description'], state['detail_issue_status'],
+        state['detail_issue_assigned_to'], state['detail_issue_resolution_date'].strftime('%Y-%m-%d'), user_id
+    )
+    state['project_detail_notice'] = "Issue added!"
+
+
+@st.fragment
+@track_queries("project_detail")
+def render_project_detail(current_user):
+    """Project detail panel; its buttons and forms rerun only this fragment"""
+    pid = st.session_state.get('selected_project_id')
+    # Project, meetings, updates and issues arrive together in one query
+    bundle = cached_project_bundle(pid, current_user['id'])
+    project = bundle['project']
+    if project is None:
+        st.warning("This project no longer exists.")
+        st.session_state['show_project_detail'] = False
+        st.session_state['selected_project_id'] = None
+        return
+    project_meetings = bundle['meetings']
+    updates = bundle['updates']
+    project_issues = bundle['issues']
+    
+    st.markdown(f'<h1 class="main-header">🔍 Project Details: {project["project_name"]}</h1>', unsafe_allow_html=True)
+    if notice := st.session_state.pop('project_detail_notice', None):
+        st.success(notice)
+    st.markdown("---")
+    
+    # Project Info
+    st.markdown("### 📝 Project Information")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"**Client:** {project['client_name']}")
+        st.markdown(f"**Software:** {project['software']}")
+        st.markdown(f"**Vendor:** {project['vendor']}")
+        st.markdown(f"**Status:** {project['status']}")
+        st.markdown(f"**Start Date:** {project['start_date']}")
+        st.markdown(f"**Deadline:** {project['deadline']}")
+    with col2:
+        st.markdown(f"**Description:**\n{project['description']}")
+        if project['file_path']:
+            st.markdown(f"**File:** {project['file_path']}")
+    st.markdown("---")
+    
+    # Meetings (MoM)
+    st.markdown("### 📅 Meetings & MoM")
+    if not project_meetings.empty:
+        for idx, meeting in project_meetings.iterrows():
+            with st.expander(f"{meeting['meeting_date']} - {meeting['agenda']}"):
+                st.markdown(f"**Attendees:** {meeting['attendees']}")
+                st.markdown(f"**Minutes of Meeting:**\n{meeting['mom']}")
+                st.markdown(f"**Next Steps:** {meeting['next_steps']}")
+                st.markdown(f"**Follow-up Date:** {meeting['follow_up_date']}")
+                colm1, colm2 = st.columns(2)
+                with colm1:
+                    if st.button("✏️ Edit MoM", key=f"edit_mom_{meeting['id']}"):
+                        st.warning("Edit MoM feature coming soon!")
+                with colm2:
+                    st.button("🗑️ Delete MoM", key=f"delete_mom_{meeting['id']}",
+                              on_click=_delete_detail_record, args=("delete_meeting", meeting['id'], "Meeting deleted!"))
+    else:
+        st.info("No meetings found for this project.")
+    with st.expander("➕ Add New Meeting", expanded=False):
+        with st.form(f"add_meeting_form_{pid}", clear_on_submit=True):
+            st.date_input("Meeting Date", key="detail_meeting_date")
+            st.text_input("Attendees", key="detail_meeting_attendees")
+            st.text_input("Agenda", key="detail_meeting_agenda")
+            st.text_area("Minutes of Meeting (MoM)", key="detail_meeting_mom")
+            st.text_area("Next Steps", key="detail_meeting_next_steps")
+            st.date_input("Follow-up Date", key="detail_meeting_follow_up")
+            st.form_submit_button("Add Meeting", on_click=_add_detail_meeting, args=(pid, current_user['id']))
+    st.markdown("---")
+    
+    # Updates/Logs
+    st.markdown("### 📝 Client Updates / Logs")
+    if not updates.empty:
+        for idx, update in updates.iterrows():
+            with st.expander(f"{update['update_date']} - {update['summary'][:40]}"):
+                st.markdown(f"**Sent By:** {update['sent_by']}")
+                st.markdown(f"**Mode:** {update['mode']}")
+                st.markdown(f"**Client Feedback:** {update['client_feedback']}")
+                st.markdown(f"**Next Step:** {update['next_step']}")
+                colu1, colu2 = st.columns(2)
+                with colu1:
+                    if st.button("✏️ Edit Update", key=f"edit_update_{update['id']}"):
+                        st.warning("Edit update feature coming soon!")
+                with colu2:
+                    st.button("🗑️ Delete Update", key=f"delete_update_{update['id']}",
+                              on_click=_delete_detail_record, args=("delete_client_update", update['id'], "Update deleted!"))
+    else:
+        st.info("No updates found for this project.")
+    with st.expander("➕ Add New Update/Log", expanded=False):
+        with st.form(f"add_update_form_{pid}", clear_on_submit=True):
+            st.date_input("Update Date", key="detail_update_date")
+            st.text_area("Summary", key="detail_update_summary")
+            st.text_input("Sent By", value=current_user['full_name'], key="detail_update_sent_by")
+            st.selectbox("Mode", ["Email", "Call", "Meeting", "Other"], key="detail_update_mode")
+            st.text_area("Client Feedback", key="detail_update_feedback")
+            st.text_area("Next Step", key="detail_update_next_step")
+            st.form_submit_button("Add Update", on_click=_add_detail_update, args=(pid, current_user['id']))
+    st.markdown("---")
+    
+    # Issues/Queries
+    st.markdown("### 🐞 Issues / Queries")
+    if not project_issues.empty:
+        for idx, issue in project_issues.iterrows():
+            with st.expander(f"{issue['date_reported']} - {issue['description'][:40]}"):
+                st.markdown(f"**Status:** {issue['status']}")
+                st.markdown(f"**Assigned To:** {issue['assigned_to']}")
+                st.markdown(f"**Resolution Date:** {issue['resolution_date']}")
+                coli1, coli2 = st.columns(2)
+                with coli1:
+                    if st.button("✏️ Edit Issue", key=f"edit_issue_{issue['id']}"):
+                        st.warning("Edit issue feature coming soon!")
+                with coli2:
+                    st.button("🗑️ Delete Issue", key=f"delete_issue_{issue['id']}",
+                              on_click=_delete_detail_record, args=("delete_issue", issue['id'], "Issue deleted!"))
+    else:
+        st.info("No issues found for this project.")
+    with st.expander("➕ Add New Issue/Query", expanded=False):
+        with st.form(f"add_issue_form_{pid}", clear_on_submit=True):
+            st.date_input("Date Reported", key="detail_issue_date")
+            st.text_area("Description", key="detail_issue_description")
+            st.selectbox("Status", ["Pending", "In Progress", "Resolved"], key="detail_issue_status")
+            st.text_input("Assigned To", key="detail_issue_assigned_to")
+            st.date_input("Resolution Date", key="detail_issue_resolution_date")
+            st.form_submit_button("Add Issue", on_click=_add_detail_issue, args=(pid, current_user['id']))
+    st.markdown("---")
+    
+    # Back button
+    if st.button("⬅️ Back to Project List", key="back_to_tracker"):
+        st.session_state['show_project_detail'] = False
+        st.session_state['selected_project_id'] = None
+        st.rerun()
+
+
+def finish_render_profile(current_user):
+    """Draw the profiling waterfall for admins; a no-op unless profiling is switched on"""
+    if current_user and current_user['role'] == 'admin':
+        render_profile_overlay()
+    else:
+        stop_profile()
+
+
+# Admins can profile a whole run with the sidebar toggle; it takes effect on the next run
+if st.session_state.get('profile_renders'):
+    start_profile()
+else:
+    stop_profile()
+
 # Get current user
-current_user = check_authentication()
+with profile_section("auth"):
+    current_user = check_authentication()
 
 # After current_user is set (after authentication):
-profile_pic_path = db.get_user_profile_picture(current_user['id'])
+profile_pic_path = cached_profile_picture(current_user['id'])
 if profile_pic_path and os.path.exists(os.path.abspath(profile_pic_path)):
     st.session_state['profile_picture'] = profile_pic_path
 else:
@@ -148,7 +739,7 @@ if current_user:
     </script>
     """, unsafe_allow_html=True)
     # --- Sidebar Branding and Navigation ---
-    with st.sidebar:
+    with st.sidebar, profile_section("sidebar"):
         # Branding/logo (replace with your logo path if available)
         # st.markdown("""
         # <div style='text-align: center; margin-bottom: 1.5rem;'>
@@ -171,17 +762,13 @@ if current_user:
         col1, col2 = st.columns([1, 2])
         
         with col1:
-            # Display profile picture or default avatar
-            if st.session_state['profile_picture'] and os.path.exists(os.path.abspath(st.session_state['profile_picture'])):
-                st.image(st.session_state['profile_picture'], width=60, use_container_width=True)
+            # Display the 60px profile picture variant or default avatar
+            sidebar_thumbnail = cached_profile_thumbnail(current_user['id'], 60) if st.session_state['profile_picture'] else None
+            if sidebar_thumbnail:
+                st.image(sidebar_thumbnail, width=60)
             else:
                 # Default avatar
-                st.markdown("""
-                <div style='width: 60px; height: 60px; border-radius: 50%; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                            display: flex; align-items: center; justify-content: center; color: white; font-size: 24px; font-weight: bold;'>
-                    {initials}
-                </div>
-                """.format(initials=current_user['full_name'][:2].upper()), unsafe_allow_html=True)
+                st.markdown(avatar(current_user['full_name']), unsafe_allow_html=True)
         
         with col2:
             st.markdown(f"**{current_user['full_name']}**")
@@ -224,6 +811,7 @@ if current_user:
         menu_options = [
             "🏠 Dashboard",
             "📁 Project Tracker", 
+            "🔎 Global Search",
             "🗓️ Meeting & MoM Log",
             "🧾 Client Update Log",
             "🛠️ Issue Tracker",
@@ -238,64 +826,17 @@ if current_user:
         if 'active_menu' not in st.session_state:
             st.session_state['active_menu'] = menu_options[0]
 
-        st.markdown("""
-        <style>
-        .nav-button {
-            background: transparent;
-            border: none;
-            padding: 0.8rem 1rem;
-            margin: 0.2rem 0;
-            border-radius: 8px;
-            font-size: 1rem;
-            font-weight: 500;
-            color: #555;
-            cursor: pointer;
-            transition: all 0.2s;
-            text-align: left;
-            width: 100%;
-            display: block;
-        }
-        .nav-button:hover {
-            background: #f0f4fa;
-            color: #1f77b4;
-        }
-        .nav-button.active {
-            background: linear-gradient(90deg, #1f77b4 0%, #764ba2 100%);
-            color: white !important;
-            font-weight: bold;
-            box-shadow: 0 2px 8px rgba(31, 119, 180, 0.3);
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
-        # Create tab-style navigation
+        # Tab-style navigation; the active page is a primary button, styled by the app stylesheet
         for option in menu_options:
-            is_active = st.session_state['active_menu'] == option
-            button_style = "active" if is_active else ""
-            
-            # Use container to create button-like appearance
-            with st.container():
-                if st.button(
-                    option,
-                    key=f"nav_{option}",
-                    use_container_width=True,
-                    help=f"Navigate to {option}"
-                ):
-                    st.session_state['active_menu'] = option
-                    st.rerun()
-                
-                # Apply custom styling via markdown
-                if is_active:
-                    st.markdown(f"""
-                    <style>
-                    [data-testid="stButton"] button[kind="secondary"]:has(div:contains("{option}")) {{
-                        background: linear-gradient(90deg, #1f77b4 0%, #764ba2 100%) !important;
-                        color: white !important;
-                        font-weight: bold !important;
-                        box-shadow: 0 2px 8px rgba(31, 119, 180, 0.3) !important;
-                    }}
-                    </style>
-                    """, unsafe_allow_html=True)
+            if st.button(
+                option,
+                key=f"nav_{option}",
+                type="primary" if st.session_state['active_menu'] == option else "secondary",
+                use_container_width=True,
+                help=f"Navigate to {option}"
+            ):
+                st.session_state['active_menu'] = option
+                st.rerun()
 
         # Get the active menu
         menu = st.session_state['active_menu']
@@ -309,6 +850,11 @@ if current_user:
             st.success("✅ Logged out successfully!")
             st.rerun()
         st.markdown("---")
+        if current_user['role'] == 'admin':
+            st.toggle("⏱️ Profile page renders", key="profile_renders",
+                      help="Show a timing waterfall of each full rerun at the bottom of the page")
+
+    page_section = begin_section(menu, "page")
 
     # Profile Picture Management Page
     if st.session_state.get('show_profile_page', False):
@@ -318,25 +864,22 @@ if current_user:
         
         with col1:
             st.markdown("### Current Picture")
-            if st.session_state['profile_picture'] is not None:
-                st.image(st.session_state['profile_picture'], width=200, use_container_width=True)
+            profile_thumbnail = cached_profile_thumbnail(current_user['id'], 200) if st.session_state['profile_picture'] else None
+            if profile_thumbnail:
+                st.image(profile_thumbnail, width=200)
             else:
-                st.markdown("""
-                <div style='width: 200px; height: 200px; border-radius: 50%; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                            display: flex; align-items: center; justify-content: center; color: white; font-size: 48px; font-weight: bold; margin: 0 auto;'>
-                    {initials}
-                </div>
-                """.format(initials=current_user['full_name'][:2].upper()), unsafe_allow_html=True)
+                st.markdown(avatar(current_user['full_name'], large=True), unsafe_allow_html=True)
         
         with col2:
             st.markdown("### Upload New Picture")
             st.markdown("Choose a profile picture that represents you professionally.")
             
+            max_upload_mb = PROFILE_PICTURE_CONFIG["max_upload_bytes"] // (1024 * 1024)
             new_upload = st.file_uploader(
                 "Select Image", 
                 type=['png', 'jpg', 'jpeg'], 
                 key="profile_page_upload",
-                help="Upload a profile picture (PNG, JPG, JPEG)"
+                help=f"Upload a profile picture (PNG, JPG, JPEG, up to {max_upload_mb} MB)"
             )
             
             # --- Prevent upload loop with session state flag ---
@@ -344,14 +887,12 @@ if current_user:
                 st.session_state['profile_upload_done'] = False
 
             if new_upload is not None and not st.session_state['profile_upload_done']:
-                # Save the file to disk
-                import os
-                file_ext = os.path.splitext(new_upload.name)[1]
-                file_path = os.path.join("profile_pics", f"{current_user['id']}{file_ext}")
-                os.makedirs("profile_pics", exist_ok=True)
+                # Only the resized variants are kept on disk
                 try:
-                    with open(file_path, "wb") as f:
-                        f.write(new_upload.getbuffer())
+                    if new_upload.size > PROFILE_PICTURE_CONFIG["max_upload_bytes"]:
+                        raise ValueError(f"Pictures can be at most {max_upload_mb} MB")
+                    from profile_pictures import store_profile_picture
+                    file_path = store_profile_picture(current_user['id'], new_upload.getvalue())
                     # Try to update the DB
                     try:
                         db.update_user_profile_picture(current_user['id'], file_path)
@@ -384,6 +925,7 @@ if current_user:
                     st.session_state['show_profile_page'] = False
                     st.rerun()
         
+        finish_render_profile(current_user)
         st.stop()
 
     # Admin-only User Management
@@ -406,6 +948,28 @@ if current_user:
                         st.success(msg)
                     else:
                         st.error(msg)
+        with st.expander("📦 Bulk Create Users from CSV", expanded=False):
+            st.markdown("Upload a CSV with `email`, `full_name` and `role` columns. Invitations are sent in the background.")
+            users_csv = st.file_uploader("Users CSV", type=['csv'], key="bulk_users_csv")
+            if users_csv is not None:
+                from bulk_provision import parse_user_csv
+                bulk_users, csv_errors = parse_user_csv(users_csv.getvalue())
+                for error in csv_errors:
+                    st.warning(error)
+                if bulk_users:
+                    st.dataframe(pd.DataFrame(bulk_users), use_container_width=True, hide_index=True)
+                    if st.button(f"➕ Create {len(bulk_users)} Users", key="bulk_create_users", use_container_width=True):
+                        results = auth.bulk_create_users(bulk_users, current_user['id'], current_user['email'])
+                        if results['error']:
+                            st.error(results['error'])
+                        else:
+                            st.success(f"Created {len(results['created'])} users, skipped {len(results['skipped'])} existing.")
+                            if results['skipped']:
+                                st.info("Already existed: " + ", ".join(results['skipped']))
+                            unsent = [u for u in results['created'] if not u['email_queued']]
+                            if unsent:
+                                st.warning("Email not configured. Share these temporary passwords securely:")
+                                st.dataframe(pd.DataFrame(unsent)[['email', 'temp_password']], use_container_width=True, hide_index=True)
         st.markdown("---")
         st.subheader("All Users")
         users_df = auth.get_all_users()
@@ -469,63 +1033,143 @@ if current_user:
         else:
             st.info("No users found.")
         st.markdown("---")
-        st.subheader("Audit Logs (last 100 actions)")
-        logs_df = auth.get_audit_logs(limit=100)
+        st.subheader("Login Rate Limiting")
+        limiter = auth.rate_limiter
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Allowed Attempts", limiter.totals['allowed'])
+        col2.metric("Blocked Attempts", limiter.totals['blocked'])
+        col3.metric("Failed Logins", limiter.totals['failed'])
+        col4.metric("Successful Logins", limiter.totals['succeeded'])
+        limits_df = limiter.get_stats()
+        if not limits_df.empty:
+            limits_df.columns = ['Key', 'Tokens', 'Failures', 'Locked (s)', 'Allowed', 'Blocked', 'Failed']
+            st.dataframe(limits_df, use_container_width=True, hide_index=True)
+            if st.button("Reset Rate Limits", key="reset_rate_limits"):
+                limiter.reset()
+                auth.log_admin_action(current_user['id'], current_user['email'], "reset_rate_limits", None, None)
+                st.rerun()
+        else:
+            st.info("No login attempts tracked yet.")
+        st.markdown("---")
+        st.subheader("Outbound Email")
+        outbox_counts = auth.mail_queue.get_status_counts()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Pending", outbox_counts.get('pending', 0))
+        col2.metric("Sending", outbox_counts.get('sending', 0))
+        col3.metric("Sent", outbox_counts.get('sent', 0))
+        col4.metric("Failed", outbox_counts.get('failed', 0))
+        if outbox_counts.get('failed'):
+            failed_df = auth.mail_queue.get_failed_messages()
+            if not failed_df.empty:
+                failed_df.columns = ['ID', 'To', 'Subject', 'Attempts', 'Last Error', 'Queued At']
+                st.dataframe(failed_df, use_container_width=True, hide_index=True)
+            st.caption("Failed emails no longer hold their temporary password, so resending issues each user a new one.")
+            if st.button("🔁 Resend Failed Invitations", key="retry_failed_emails"):
+                if auth.resend_failed_invitations(current_user['id'], current_user['email']):
+                    st.rerun()
+                st.info("None of the failed emails belong to an existing user.")
+        st.markdown("---")
+        st.subheader("Chart Cache")
+        figure_stats = get_figure_cache().stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Hit Rate", f"{figure_stats['hit_rate']:.0%}")
+        col2.metric("Hits", figure_stats['hits'])
+        col3.metric("Misses", figure_stats['misses'])
+        col4.metric("Cached Figures", figure_stats['entries'], help=f"{figure_stats['bytes'] / 1024:.0f} KB of figure specs")
+        shared_cache = get_shared_cache()
+        if shared_cache is not None:
+            st.markdown("---")
+            st.subheader("Shared Cache")
+            shared_stats = shared_cache.stats()
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Hit Rate", f"{shared_stats['hit_rate']:.0%}", help="Lookups from this process only")
+            col2.metric("Hits", shared_stats['hits'])
+            col3.metric("Misses", shared_stats['misses'])
+            col4.metric("Entries", shared_stats['entries'], help=f"{shared_stats['bytes'] / 1024:.0f} KB across all processes")
+            if st.button("🗑️ Clear Shared Cache", key="clear_shared_cache"):
+                shared_cache.clear()
+                st.rerun()
+        st.markdown("---")
+        st.subheader("Audit Logs")
+        user_ids = dict(zip(users_df['email'], users_df['id'])) if not users_df.empty else {}
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            audit_admin = st.selectbox("Admin", ["All"] + list(user_ids), key="audit_admin_filter")
+        with col2:
+            audit_action = st.selectbox("Action", ["All"] + auth.get_audit_actions(), key="audit_action_filter")
+        with col3:
+            audit_target = st.selectbox("Target User", ["All"] + list(user_ids), key="audit_target_filter")
+        with col4:
+            audit_dates = st.date_input("Date Range", value=(), key="audit_date_filter")
+        audit_filters = {
+            'admin_id': user_ids.get(audit_admin),
+            'action': None if audit_action == "All" else audit_action,
+            'target_user_id': user_ids.get(audit_target),
+            'start': datetime.combine(audit_dates[0], datetime.min.time()) if len(audit_dates) > 0 else None,
+            'end': datetime.combine(audit_dates[-1], datetime.min.time()) + timedelta(days=1) if len(audit_dates) > 0 else None
+        }
+        # Keyset pagination: keep a stack of page cursors, reset whenever the filters change
+        if st.session_state.get('audit_filters') != audit_filters:
+            st.session_state['audit_filters'] = audit_filters
+            st.session_state['audit_cursors'] = [None]
+        audit_cursors = st.session_state['audit_cursors']
+        logs_df, next_cursor = auth.query_audit_logs(before=audit_cursors[-1], limit=50, **audit_filters)
         if not logs_df.empty:
             logs_df = logs_df[['timestamp', 'admin_email', 'action', 'target_email', 'details']]
             logs_df.columns = ['Time', 'Admin', 'Action', 'Target', 'Details']
-            st.dataframe(logs_df, use_container_width=True)
+            st.dataframe(logs_df, use_container_width=True, hide_index=True)
         else:
             st.info("No audit logs found.")
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if len(audit_cursors) > 1 and st.button("⬅️ Newer", key="audit_newer"):
+                audit_cursors.pop()
+                st.rerun()
+        with col2:
+            st.caption(f"Page {len(audit_cursors)}")
+        with col3:
+            if next_cursor is not None and st.button("Older ➡️", key="audit_older"):
+                audit_cursors.append(next_cursor)
+                st.rerun()
+        if st.button("📤 Prepare CSV Export", key="audit_export"):
+            import io
+            # download_button holds the whole file in memory anyway, so the export is capped and built there
+            max_rows = EXPORT_CONFIG["audit_log_ui_max_rows"]
+            export_file = io.StringIO()
+            exported = auth.export_audit_logs_csv(export_file, limit=max_rows, **audit_filters)
+            st.download_button(f"📥 Download {exported} rows", export_file.getvalue(), file_name="audit_logs.csv", mime="text/csv")
+            if exported >= max_rows:
+                st.warning(f"Only the newest {max_rows:,} rows are included. Use `python export_audit_logs.py` for the full export.")
+            else:
+                st.caption("For very large exports use `python export_audit_logs.py`.")
+        finish_render_profile(current_user)
         st.stop()
 
     # Main content area
     if menu == "🏠 Dashboard":
         st.markdown('<h1 class="main-header">ProjectOps Assistant Dashboard</h1>', unsafe_allow_html=True)
         
-        # Get user-specific data
-        projects = db.get_all_projects(current_user['id'])
-        meetings = db.get_all_meetings(current_user['id'])
-        issues = db.get_all_issues(current_user['id'])
+        # KPIs in one aggregate query; lists fetch only the rows shown
+        metrics = cached_dashboard_metrics(current_user['id'])
         
         # Key Metrics Row
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_projects = len(projects) if not projects.empty else 0
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{total_projects}</div>
-                <div class="metric-label">Total Projects</div>
-            </div>
-            """, unsafe_allow_html=True)
+            total_projects = metrics['total_projects']
+            st.markdown(metric_card(total_projects, "Total Projects"), unsafe_allow_html=True)
         
         with col2:
-            active_projects = len(projects[projects['status'] == 'In Progress']) if not projects.empty else 0
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{active_projects}</div>
-                <div class="metric-label">Active Projects</div>
-            </div>
-            """, unsafe_allow_html=True)
+            active_projects = metrics['active_projects']
+            st.markdown(metric_card(active_projects, "Active Projects"), unsafe_allow_html=True)
         
         with col3:
-            total_meetings = len(meetings) if not meetings.empty else 0
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{total_meetings}</div>
-                <div class="metric-label">Total Meetings</div>
-            </div>
-            """, unsafe_allow_html=True)
+            total_meetings = metrics['total_meetings']
+            st.markdown(metric_card(total_meetings, "Total Meetings"), unsafe_allow_html=True)
         
         with col4:
-            pending_issues = len(issues[issues['status'] == 'Pending']) if not issues.empty else 0
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{pending_issues}</div>
-                <div class="metric-label">Pending Issues</div>
-            </div>
-            """, unsafe_allow_html=True)
+            pending_issues = metrics['pending_issues']
+            st.markdown(metric_card(pending_issues, "Pending Issues"), unsafe_allow_html=True)
         
         st.markdown("---")
         
@@ -534,41 +1178,36 @@ if current_user:
         
         with col1:
             st.subheader("📈 Project Status Distribution")
-            if not projects.empty:
-                status_counts = projects['status'].value_counts()
-                fig = px.pie(
-                    values=status_counts.values,
-                    names=status_counts.index,
+            if total_projects:
+                status_counts = cached_project_status_counts(current_user['id'])
+                fig = pie_chart(
+                    get_figure_cache(),
+                    values=list(status_counts.values()),
+                    names=list(status_counts.keys()),
                     title="Project Status Breakdown",
                     color_discrete_map={
                         'In Progress': '#ffd700',
                         'Completed': '#28a745',
                         'On Hold': '#dc3545'
-                    }
+                    },
+                    height=400
                 )
-                fig.update_layout(height=400)
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No projects found")
         
         with col2:
             st.subheader("📅 Recent Activity")
-            if not meetings.empty:
-                recent_meetings = meetings.head(5)
-                for _, meeting in recent_meetings.iterrows():
-                    st.markdown(f"""
-                    <div style="padding: 1rem; border: 1px solid #e0e0e0; border-radius: 8px; margin: 0.5rem 0;">
-                        <strong>{meeting['project_name']}</strong><br>
-                        <small>{meeting['meeting_date']} - {meeting['agenda']}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
+            recent_meetings = cached_recent_meetings(current_user['id'], 5)
+            if not recent_meetings.empty:
+                st.markdown(activity_feed(recent_meetings), unsafe_allow_html=True)
             else:
                 st.info("No recent meetings")
         
         # Recent Projects Table
         st.subheader("🚀 Recent Projects")
-        if not projects.empty:
-            recent_projects = projects.head(10)
+        recent_projects = cached_recent_projects(current_user['id'], 10)
+        if not recent_projects.empty:
             
             # Create a styled dataframe
             def style_status(val):
@@ -588,515 +1227,74 @@ if current_user:
             st.info("No projects found")
 
     elif menu == "📁 Project Tracker":
-        st.markdown('<h1 class="main-header">📁 Project Tracker</h1>', unsafe_allow_html=True)
-        
-        # Add some spacing and visual separation
-        st.markdown("---")
-        
-        tab1, tab2, tab3 = st.tabs(["➕ Add New Project", "📋 All Projects", "📁 File Management"])
-        
-        with tab1:
-            st.markdown("### 🆕 Create New Project")
-            st.markdown("Fill in the details below to create a new project entry.")
-            
-            # File upload section OUTSIDE the form
-            with st.expander("📎 File Upload (Optional)", expanded=False):
-                uploaded_file_path = render_file_upload_section(None, None)
-            
-            # Project form in a clean container
-            with st.container():
-                st.markdown("#### Project Information")
-                with st.form("project_form", clear_on_submit=True):
-                    # Project details in organized columns
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.markdown("**Basic Information**")
-                        project_name = st.text_input("Project Name *", placeholder="Enter project name", key="project_name_input")
-                        client_name = st.text_input("Client Name *", placeholder="Enter client name", key="client_name_input")
-                        software = st.selectbox("Software *", ["Epicor", "MYOB", "ODOO", "PayGlobal", "Sage 300", "Other"], key="software_select")
-                        vendor = st.text_input("Vendor *", placeholder="Enter vendor name", key="vendor_input")
-                    
-                    with col2:
-                        st.markdown("**Timeline & Status**")
-                        start_date = st.date_input("Start Date *", key="start_date_input")
-                        deadline = st.date_input("Deadline *", key="deadline_input")
-                        status = st.selectbox("Status *", ["In Progress", "On Hold", "Completed", "Planning"], key="status_select")
-                    
-                    # Description and file upload
-                    st.markdown("**Project Details**")
-                    description = st.text_area("Description *", placeholder="Enter detailed project description", key="description_input", height=100)
-                    
-                    # Form validation and submission
-                    if not project_name or not client_name or not vendor or not description:
-                        st.warning("⚠️ Please fill in all required fields marked with *")
-                    
-                    # Submit button with better styling
-                    col1b, col2b, col3b = st.columns([1, 2, 1])
-                    with col2b:
-                        submitted = st.form_submit_button("➕ Create Project", use_container_width=True, type="primary")
-                    
-                    if submitted:
-                        if not project_name or not client_name or not vendor or not description:
-                            st.error("❌ Please fill in all required fields marked with *")
-                        elif start_date >= deadline:
-                            st.error("❌ Deadline must be after start date")
-                        else:
-                            # Prefer file uploaded in form, else use uploaded_file_path from outside
-                            file_path = None
-                            if uploaded_file_path:
-                                file_path = uploaded_file_path
-                            
-                            success = db.add_project(
-                                project_name, client_name, software, vendor,
-                                start_date.strftime('%Y-%m-%d'), deadline.strftime('%Y-%m-%d'),
-                                status, description, file_path, current_user['id']
-                            )
-                            if success:
-                                st.success(f"✅ Project '{project_name}' created successfully!")
-                                st.balloons()
-                                st.rerun()
-                            else:
-                                st.error("❌ Failed to create project. Please try again.")
-        
-        with tab2:
-            st.markdown("### 📋 Project Overview")
-            
-            # Get data
-            projects = db.get_all_projects(current_user['id'])
-            meetings = db.get_all_meetings(current_user['id'])
-            issues = db.get_all_issues(current_user['id'])
-            
-            if not projects.empty:
-                # Summary metrics
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    total_projects = len(projects)
-                    st.metric("Total Projects", total_projects)
-                with col2:
-                    active_projects = len(projects[projects['status'] == 'In Progress'])
-                    st.metric("Active Projects", active_projects)
-                with col3:
-                    completed_projects = len(projects[projects['status'] == 'Completed'])
-                    st.metric("Completed", completed_projects)
-                with col4:
-                    on_hold_projects = len(projects[projects['status'] == 'On Hold'])
-                    st.metric("On Hold", on_hold_projects)
-                
-                st.markdown("---")
-                
-                # Filters in a clean layout
-                st.markdown("#### 🔍 Filter & Search")
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    status_filter = st.selectbox("Status Filter", ["All"] + list(projects['status'].unique()), key="status_filter_projects")
-                with col2:
-                    software_filter = st.selectbox("Software Filter", ["All"] + list(projects['software'].unique()), key="software_filter_projects")
-                with col3:
-                    search_term = st.text_input("Search Projects", placeholder="Search by name or client", key="search_projects")
-                
-                # Apply filters
-                filtered_projects = projects.copy()
-                if status_filter != "All":
-                    filtered_projects = filtered_projects[filtered_projects['status'] == status_filter]
-                if software_filter != "All":
-                    filtered_projects = filtered_projects[filtered_projects['software'] == software_filter]
-                if search_term:
-                    filtered_projects = filtered_projects[
-                        filtered_projects['project_name'].str.contains(search_term, case=False) |
-                        filtered_projects['client_name'].str.contains(search_term, case=False)
-                    ]
-                
-                st.markdown(f"#### 📊 Projects ({len(filtered_projects)} found)")
-                
-                # Card view with improved styling
-                seen_ids = set()
-                card_cols = st.columns(2)
-                card_count = 0
-                
-                for idx, project in filtered_projects.iterrows():
-                    pname = project.get('project_name')
-                    pid = project.get('id')
-                    
-                    if (
-                        pd.notnull(pname) and
-                        pd.notnull(pid) and
-                        isinstance(pname, str) and
-                        str(pname).strip() and
-                        str(pid).strip() and
-                        pid not in seen_ids
-                    ):
-                        seen_ids.add(pid)
-                        col = card_cols[card_count % 2]
-                        
-                        with col:
-                            # Enhanced card styling
-                            status = project.get('status', 'In Progress')
-                            status_color = {
-                                'Completed': '#4CAF50',
-                                'In Progress': '#2196F3',
-                                'Pending': '#FFC107',
-                                'On Hold': '#FF5722',
-                                'Near Completion': '#00BCD4',
-                                'Planning': '#9C27B0',
-                            }.get(status, '#607D8B')
-                            
-                            percent = project.get('percent_complete', '')
-                            if percent and isinstance(percent, str) and '%' in percent:
-                                percent_val = percent
-                            else:
-                                percent_val = ''
-                            
-                            # Enhanced card HTML with better spacing and icons
-                            st.markdown(
-                                f"""
-                                <div style='background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%); border-radius: 16px; box-shadow: 0 4px 12px rgba(0,0,0,0.1); padding: 1.8rem; margin-bottom: 1.8rem; border-left: 6px solid {status_color}; position: relative;'>
-                                    <div style='display: flex; align-items: center; justify-content: space-between; margin-bottom: 1rem;'>
-                                        <div style='font-size: 1.3rem; font-weight: bold; color: #1a1a1a;'>{pname}</div>
-                                        <div style='font-size: 0.9rem; font-weight: 600; color: {status_color}; background: {status_color}15; padding: 0.3rem 0.8rem; border-radius: 20px;'>{status}</div>
-                                    </div>
-                                    <div style='margin-bottom: 1rem; color: #555; font-size: 0.95rem; line-height: 1.5;'>
-                                        <div style='margin-bottom: 0.5rem;'><b>🖥️ Software:</b> {project.get('software', '')}</div>
-                                        <div style='margin-bottom: 0.5rem;'><b>👥 Client:</b> {project.get('client_name', '')}</div>
-                                        <div style='margin-bottom: 0.5rem;'><b>🏢 Vendor:</b> {project.get('vendor', '')}</div>
-                                        <div style='margin-bottom: 0.5rem;'><b>📅 Deadline:</b> {project.get('deadline', '')}</div>
-                                        <div style='margin-bottom: 0.5rem;'><b>📊 Progress:</b> {percent_val if percent_val else 'Not specified'}</div>
-                                    </div>
-                                    <div style='margin-bottom: 1rem; color: #444; font-size: 0.9rem; line-height: 1.4; background: #f8f9fa; padding: 0.8rem; border-radius: 8px;'>
-                                        <b>📝 Description:</b> {project.get('description', '')[:150]}{'...' if len(str(project.get('description', ''))) > 150 else ''}
-                                    </div>
-                                    <div style='display: flex; gap: 1.2rem; font-size: 0.9rem; color: #666; margin-bottom: 1rem;'>
-                                        <span>📅 <b>{len(meetings[meetings['project_id'] == pid]) if not meetings.empty else 0}</b> Meetings</span>
-                                        <span>📝 <b>{len(db.get_client_updates_by_project(pid, current_user['id']))}</b> Updates</span>
-                                        <span>🐞 <b>{len(issues[issues['project_id'] == pid]) if not issues.empty else 0}</b> Issues</span>
-                                    </div>
-                                </div>
-                                """,
-                                unsafe_allow_html=True
-                            )
-                            st.markdown("<div style='height: 0.5rem'></div>", unsafe_allow_html=True)  # small spacer
-                            if st.button("🔍 View More", key=f"view_more_{pid}"):
-                                st.session_state['show_project_detail'] = True
-                                st.session_state['selected_project_id'] = pid
-                                st.rerun()
-                            # Style the button to look like part of the card
-                            st.markdown(
-                                f"""
-                                <style>
-                                div[data-testid="stButton"][key="view_more_{pid}"] button {{
-                                    min-width: 180px;
-                                    font-size: 1.1rem;
-                                    padding: 0.8rem 2.2rem;
-                                    margin: 0 auto;
-                                    display: block;
-                                    background: linear-gradient(90deg,#1f77b4 0%,#764ba2 100%);
-                                    color: white;
-                                    font-weight: bold;
-                                    border: none;
-                                    border-radius: 8px;
-                                    transition: background 0.18s;
-                                }}
-                                div[data-testid="stButton"][key="view_more_{pid}"] button:hover {{
-                                    background: linear-gradient(90deg,#764ba2 0%,#1f77b4 100%);
-                                }}
-                                </style>
-                                """,
-                                unsafe_allow_html=True
-                            )
-                        
-                        card_count += 1
-                
-                # Export options with better styling
-                st.markdown("---")
-                st.markdown("#### 📤 Export Options")
-                col1e, col2e = st.columns(2)
-                with col1e:
-                    if st.button("📊 Export to PDF", key="projects_export_pdf", use_container_width=True):
-                        filename = reports.export_projects_to_pdf(filtered_projects, "projects_report.pdf")
-                        with open(filename, "rb") as f:
-                            st.download_button("📥 Download PDF", f, file_name="projects_report.pdf", use_container_width=True)
-                with col2e:
-                    if st.button("📈 Export to Excel", key="projects_export_excel", use_container_width=True):
-                        filename = reports.export_to_excel(filtered_projects, "projects_report.xlsx")
-                        with open(filename, "rb") as f:
-                            st.download_button("📥 Download Excel", f, file_name="projects_report.xlsx", use_container_width=True)
-            else:
-                st.info("📭 No projects found. Create your first project using the 'Add New Project' tab!")
-        
-        with tab3:
-            st.markdown("### 📁 File Management")
-            st.markdown("Upload and manage project-related files.")
-            
-            from file_uploader import render_bulk_file_upload, render_file_analytics
-            
-            # File management options
-            file_option = st.selectbox(
-                "Choose File Management Option",
-                ["📦 Bulk File Upload", "📊 File Analytics"],
-                key="file_management_option"
-            )
-            
-            if file_option == "📦 Bulk File Upload":
-                render_bulk_file_upload()
-            elif file_option == "📊 File Analytics":
-                render_file_analytics()
+        render_project_tracker(current_user)
+
+    elif menu == "🔎 Global Search":
+        render_global_search(current_user)
 
     elif menu == "🗓️ Meeting & MoM Log":
-        st.markdown('<h1 class="main-header">Meeting & MoM Log</h1>', unsafe_allow_html=True)
-        
-        tab1, tab2 = st.tabs(["➕ Log New Meeting", "📋 All Meetings"])
-        
-        with tab1:
-            with st.expander("Log New Meeting", expanded=True):
-                with st.form("meeting_form"):
-                    projects = db.get_all_projects(current_user['id'])
-                    project_options = projects[["id", "project_name"]].values.tolist()
-                    project_dict = {name: pid for pid, name in project_options}
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        project_name = st.selectbox("Project", list(project_dict.keys()), key="meeting_project_select")
-                        meeting_date = st.date_input("Date", key="meeting_date_input")
-                        attendees = st.text_input("Attendees", placeholder="Enter attendee names", key="meeting_attendees_input")
-                    
-                    with col2:
-                        agenda = st.text_input("Agenda", placeholder="Enter meeting agenda", key="meeting_agenda_input")
-                        follow_up_date = st.date_input("Follow-up Date", key="meeting_followup_input")
-                    
-                    mom = st.text_area("Minutes of Meeting (MoM)", placeholder="Enter meeting minutes", key="meeting_mom_input")
-                    next_steps = st.text_area("Next Steps", placeholder="Enter next steps", key="meeting_next_steps_input")
-                    
-                    submitted = st.form_submit_button("📝 Log Meeting", use_container_width=True)
-                    
-                    if submitted:
-                        db.add_meeting(
-                            project_dict[project_name],
-                            meeting_date.strftime('%Y-%m-%d'),
-                            attendees, agenda, mom, next_steps,
-                            follow_up_date.strftime('%Y-%m-%d'),
-                            current_user['id']
-                        )
-                        st.success(f"✅ Meeting for '{project_name}' logged successfully!")
-                        st.rerun()
-        
-        with tab2:
-            meetings = db.get_all_meetings(current_user['id'])
-            if not meetings.empty:
-                st.dataframe(meetings, use_container_width=True)
-                
-                # Export options
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("📊 Export to PDF", key="meetings_pdf", use_container_width=True):
-                        filename = reports.export_meetings_to_pdf(meetings, "meetings_report.pdf")
-                        with open(filename, "rb") as f:
-                            st.download_button("📥 Download PDF", f, file_name="meetings_report.pdf", use_container_width=True)
-                with col2:
-                    if st.button("📈 Export to Excel", key="meetings_excel", use_container_width=True):
-                        filename = reports.export_to_excel(meetings, "meetings_report.xlsx")
-                        with open(filename, "rb") as f:
-                            st.download_button("📥 Download Excel", f, file_name="meetings_report.xlsx", use_container_width=True)
-            else:
-                st.info("No meetings found")
+        render_meeting_log(current_user)
 
     elif menu == "🧾 Client Update Log":
-        st.markdown('<h1 class="main-header">Client Update Log</h1>', unsafe_allow_html=True)
-        
-        tab1, tab2 = st.tabs(["➕ Log Client Update", "📋 All Updates"])
-        
-        with tab1:
-            with st.expander("Log Client Update", expanded=True):
-                with st.form("update_form"):
-                    projects = db.get_all_projects(current_user['id'])
-                    project_options = projects[["id", "project_name"]].values.tolist()
-                    project_dict = {name: pid for pid, name in project_options}
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        project_name = st.selectbox("Project", list(project_dict.keys()), key="update_project_select")
-                        update_date = st.date_input("Date", key="update_date_input")
-                        sent_by = st.text_input("Sent By", placeholder="Enter sender name", key="update_sent_by_input")
-                    
-                    with col2:
-                        mode = st.selectbox("Mode", ["Email", "Call", "Meeting", "Other"], key="update_mode_select")
-                    
-                    summary = st.text_area("Summary", placeholder="Enter update summary", key="update_summary_input")
-                    client_feedback = st.text_area("Client Feedback", placeholder="Enter client feedback", key="update_feedback_input")
-                    next_step = st.text_area("Next Step", placeholder="Enter next step", key="update_next_step_input")
-                    
-                    submitted = st.form_submit_button("📧 Log Update", use_container_width=True)
-                    
-                    if submitted:
-                        db.add_client_update(
-                            project_dict[project_name],
-                            update_date.strftime('%Y-%m-%d'),
-                            summary, sent_by, mode, client_feedback, next_step,
-                            current_user['id']
-                        )
-                        st.success(f"✅ Update for '{project_name}' logged successfully!")
-                        st.rerun()
-        
-        with tab2:
-            updates = pd.DataFrame()
-            if not projects.empty:
-                updates = pd.concat([
-                    db.get_client_updates_by_project(pid, current_user['id']) for pid in projects['id'].tolist()
-                ], ignore_index=True)
-            
-            if not updates.empty:
-                st.dataframe(updates, use_container_width=True)
-                
-                # Export options
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("📊 Export to PDF", key="updates_pdf", use_container_width=True):
-                        filename = reports.export_projects_to_pdf(updates, "updates_report.pdf")
-                        with open(filename, "rb") as f:
-                            st.download_button("📥 Download PDF", f, file_name="updates_report.pdf", use_container_width=True)
-                with col2:
-                    if st.button("📈 Export to Excel", key="updates_excel", use_container_width=True):
-                        filename = reports.export_to_excel(updates, "updates_report.xlsx")
-                        with open(filename, "rb") as f:
-                            st.download_button("📥 Download Excel", f, file_name="updates_report.xlsx", use_container_width=True)
-            else:
-                st.info("No updates found")
+        render_client_update_log(current_user)
 
     elif menu == "🛠️ Issue Tracker":
-        st.markdown('<h1 class="main-header">Issue Tracker</h1>', unsafe_allow_html=True)
-        
-        tab1, tab2 = st.tabs(["➕ Log New Issue", "📋 All Issues"])
-        
-        with tab1:
-            with st.expander("Log New Issue", expanded=True):
-                with st.form("issue_form"):
-                    projects = db.get_all_projects(current_user['id'])
-                    project_options = projects[["id", "project_name"]].values.tolist()
-                    project_dict = {name: pid for pid, name in project_options}
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        project_name = st.selectbox("Project", list(project_dict.keys()), key="issue_project_select")
-                        date_reported = st.date_input("Date Reported", key="issue_date_input")
-                        status = st.selectbox("Status", ["Pending", "In Progress", "Resolved"], key="issue_status_select")
-                    
-                    with col2:
-                        assigned_to = st.text_input("Assigned To", placeholder="Enter assignee name", key="issue_assigned_input")
-                        resolution_date = st.date_input("Resolution Date", key="issue_resolution_input")
-                    
-                    description = st.text_area("Description", placeholder="Enter issue description", key="issue_description_input")
-                    
-                    submitted = st.form_submit_button("🐞 Log Issue", use_container_width=True)
-                    
-                    if submitted:
-                        db.add_issue(
-                            project_dict[project_name],
-                            date_reported.strftime('%Y-%m-%d'),
-                            description, status, assigned_to,
-                            resolution_date.strftime('%Y-%m-%d'),
-                            current_user['id']
-                        )
-                        st.success(f"✅ Issue for '{project_name}' logged successfully!")
-                        st.rerun()
-        
-        with tab2:
-            issues = db.get_all_issues(current_user['id'])
-            if not issues.empty:
-                st.dataframe(issues, use_container_width=True)
-                
-                # Export options
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("📊 Export to PDF", key="issues_pdf", use_container_width=True):
-                        filename = reports.export_projects_to_pdf(issues, "issues_report.pdf")
-                        with open(filename, "rb") as f:
-                            st.download_button("📥 Download PDF", f, file_name="issues_report.pdf", use_container_width=True)
-                with col2:
-                    if st.button("📈 Export to Excel", key="issues_excel", use_container_width=True):
-                        filename = reports.export_to_excel(issues, "issues_report.xlsx")
-                        with open(filename, "rb") as f:
-                            st.download_button("📥 Download Excel", f, file_name="issues_report.xlsx", use_container_width=True)
-            else:
-                st.info("No issues found")
+        render_issue_tracker(current_user)
 
     elif menu == "🤖 AI Chatbot":
-        st.markdown('<h1 class="main-header">AI Project Assistant</h1>', unsafe_allow_html=True)
-        st.markdown("Ask questions about your projects, get insights, and receive AI-powered recommendations.")
-        
-        # Initialize chat history
-        if "messages" not in st.session_state:
-            st.session_state.messages = []
-
-        # Display chat messages
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
-
-        # Chat input
-        if prompt := st.chat_input("Ask me about your projects..."):
-            # Add user message to chat history
-            st.session_state.messages.append({"role": "user", "content": prompt})
-            with st.chat_message("user"):
-                st.markdown(prompt)
-
-            # Get AI response
-            with st.chat_message("assistant"):
-                response = chatbot.get_response(prompt, current_user['id'])
-                st.markdown(response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-
-        # Clear chat button
-        if st.button("🗑️ Clear Chat", key="clear_chat"):
-            st.session_state.messages = []
-            st.rerun()
+        render_chat(current_user)
 
     elif menu == "📈 Analytics":
         st.markdown('<h1 class="main-header">Project Analytics</h1>', unsafe_allow_html=True)
         
-        # Get data
-        projects = db.get_all_projects(current_user['id'])
-        meetings = db.get_all_meetings(current_user['id'])
-        issues = db.get_all_issues(current_user['id'])
+        # Distributions are aggregated in the database and cached per data version
+        analytics = cached_analytics(current_user['id'])
+        figure_cache = get_figure_cache()
         
-        if not projects.empty:
+        if analytics['total_projects']:
             # Project Status Distribution
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("📊 Project Status Distribution")
-                status_counts = projects['status'].value_counts()
-                fig = px.pie(
-                    values=status_counts.values,
-                    names=status_counts.index,
+                status_counts = analytics['status']
+                fig = pie_chart(
+                    figure_cache,
+                    values=status_counts['count'],
+                    names=status_counts['status'],
                     title="Project Status Breakdown"
                 )
                 st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 st.subheader("📈 Projects Over Time")
-                projects['start_date'] = pd.to_datetime(projects['start_date'])
-                monthly_projects = projects.groupby(projects['start_date'].dt.to_period('M')).size()
-                fig = px.line(
-                    x=monthly_projects.index.astype(str),
-                    y=monthly_projects.values,
+                monthly_projects = analytics['per_month']
+                fig = line_chart(
+                    figure_cache,
+                    x=monthly_projects['month'],
+                    y=monthly_projects['count'],
                     title="New Projects per Month"
                 )
                 st.plotly_chart(fig, use_container_width=True)
             
             # Software Distribution
             st.subheader("🖥️ Software Distribution")
-            software_counts = projects['software'].value_counts()
-            fig = px.bar(
-                x=software_counts.index,
-                y=software_counts.values,
+            software_counts = analytics['software']
+            fig = bar_chart(
+                figure_cache,
+                x=software_counts['software'],
+                y=software_counts['count'],
                 title="Projects by Software"
             )
             st.plotly_chart(fig, use_container_width=True)
             
             # Client Analysis
             st.subheader("👥 Top Clients")
-            client_counts = projects['client_name'].value_counts().head(10)
-            fig = px.bar(
-                x=client_counts.index,
-                y=client_counts.values,
+            client_counts = analytics['clients']
+            fig = bar_chart(
+                figure_cache,
+                x=client_counts['client_name'],
+                y=client_counts['count'],
                 title="Projects by Client"
             )
             st.plotly_chart(fig, use_container_width=True)
@@ -1104,149 +1302,14 @@ if current_user:
             st.info("No projects found for analytics.")
 
     elif menu == "📧 Email Integration":
+        from email_management import render_email_management_page
         render_email_management_page(db, current_user['id'])
 
+    end_section(page_section)
+
 # Project Detail Page
 if st.session_state.get('show_project_detail', False):
-    pid = st.session_state.get('selected_project_id')
-    project = db.get_project_by_id(pid)
-    meetings = db.get_all_meetings(current_user['id'])
-    updates = db.get_client_updates_by_project(pid, current_user['id'])
-    issues = db.get_all_issues(current_user['id'])
-    
-    st.markdown(f'<h1 class="main-header">🔍 Project Details: {project["project_name"]}</h1>', unsafe_allow_html=True)
-    st.markdown("---")
-    
-    # Project Info
-    st.markdown("### 📝 Project Information")
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown(f"**Client:** {project['client_name']}")
-        st.markdown(f"**Software:** {project['software']}")
-        st.markdown(f"**Vendor:** {project['vendor']}")
-        st.markdown(f"**Status:** {project['status']}")
-        st.markdown(f"**Start Date:** {project['start_date']}")
-        st.markdown(f"**Deadline:** {project['deadline']}")
-    with col2:
-        st.markdown(f"**Description:**\n{project['description']}")
-        if project['file_path']:
-            st.markdown(f"**File:** {project['file_path']}")
-    st.markdown("---")
-    
-    # Meetings (MoM)
-    st.markdown("### 📅 Meetings & MoM")
-    if not meetings.empty:
-        project_meetings = meetings[meetings['project_id'] == pid]
-    else:
-        project_meetings = pd.DataFrame()
-    if not project_meetings.empty:
-        for idx, meeting in project_meetings.iterrows():
-            with st.expander(f"{meeting['meeting_date']} - {meeting['agenda']}"):
-                st.markdown(f"**Attendees:** {meeting['attendees']}")
-                st.markdown(f"**Minutes of Meeting:**\n{meeting['mom']}")
-                st.markdown(f"**Next Steps:** {meeting['next_steps']}")
-                st.markdown(f"**Follow-up Date:** {meeting['follow_up_date']}")
-                colm1, colm2 = st.columns(2)
-                with colm1:
-                    if st.button("✏️ Edit MoM", key=f"edit_mom_{meeting['id']}"):
-                        st.warning("Edit MoM feature coming soon!")
-                with colm2:
-                    if st.button("🗑️ Delete MoM", key=f"delete_mom_{meeting['id']}"):
-                        db.delete_meeting(meeting['id'])
-                        st.success("Meeting deleted!")
-                        st.rerun()
-    else:
-        st.info("No meetings found for this project.")
-    with st.expander("➕ Add New Meeting", expanded=False):
-        with st.form(f"add_meeting_form_{pid}"):
-            meeting_date = st.date_input("Meeting Date")
-            attendees = st.text_input("Attendees")
-            agenda = st.text_input("Agenda")
-            mom = st.text_area("Minutes of Meeting (MoM)")
-            next_steps = st.text_area("Next Steps")
-            follow_up_date = st.date_input("Follow-up Date")
-            submitted = st.form_submit_button("Add Meeting")
-            if submitted:
-                db.add_meeting(pid, meeting_date.strftime('%Y-%m-%d'), attendees, agenda, mom, next_steps, follow_up_date.strftime('%Y-%m-%d'), current_user['id'])
-                st.success("Meeting added!")
-                st.rerun()
-    st.markdown("---")
-    
-    # Updates/Logs
-    st.markdown("### 📝 Client Updates / Logs")
-    if not updates.empty:
-        for idx, update in updates.iterrows():
-            with st.expander(f"{update['update_date']} - {update['summary'][:40]}"):
-                st.markdown(f"**Sent By:** {update['sent_by']}")
-                st.markdown(f"**Mode:** {update['mode']}")
-                st.markdown(f"**Client Feedback:** {update['client_feedback']}")
-                st.markdown(f"**Next Step:** {update['next_step']}")
-                colu1, colu2 = st.columns(2)
-                with colu1:
-                    if st.button("✏️ Edit Update", key=f"edit_update_{update['id']}"):
-                        st.warning("Edit update feature coming soon!")
-                with colu2:
-                    if st.button("🗑️ Delete Update", key=f"delete_update_{update['id']}"):
-                        db.delete_client_update(update['id'])
-                        st.success("Update deleted!")
-                        st.rerun()
-    else:
-        st.info("No updates found for this project.")
-    with st.expander("➕ Add New Update/Log", expanded=False):
-        with st.form(f"add_update_form_{pid}"):
-            update_date = st.date_input("Update Date")
-            summary = st.text_area("Summary")
-            sent_by = st.text_input("Sent By", value=current_user['full_name'])
-            mode = st.selectbox("Mode", ["Email", "Call", "Meeting", "Other"])
-            client_feedback = st.text_area("Client Feedback")
-            next_step = st.text_area("Next Step")
-            submitted = st.form_submit_button("Add Update")
-            if submitted:
-                db.add_client_update(pid, update_date.strftime('%Y-%m-%d'), summary, sent_by, mode, client_feedback, next_step, current_user['id'])
-                st.success("Update added!")
-                st.rerun()
-    st.markdown("---")
-    
-    # Issues/Queries
-    st.markdown("### 🐞 Issues / Queries")
-    if not issues.empty:
-        project_issues = issues[issues['project_id'] == pid]
-    else:
-        project_issues = pd.DataFrame()
-    if not project_issues.empty:
-        for idx, issue in project_issues.iterrows():
-            with st.expander(f"{issue['date_reported']} - {issue['description'][:40]}"):
-                st.markdown(f"**Status:** {issue['status']}")
-                st.markdown(f"**Assigned To:** {issue['assigned_to']}")
-                st.markdown(f"**Resolution Date:** {issue['resolution_date']}")
-                coli1, coli2 = st.columns(2)
-                with coli1:
-                    if st.button("✏️ Edit Issue", key=f"edit_issue_{issue['id']}"):
-                        st.warning("Edit issue feature coming soon!")
-                with coli2:
-                    if st.button("🗑️ Delete Issue", key=f"delete_issue_{issue['id']}"):
-                        db.delete_issue(issue['id'])
-                        st.success("Issue deleted!")
-                        st.rerun()
-    else:
-        st.info("No issues found for this project.")
-    with st.expander("➕ Add New Issue/Query", expanded=False):
-        with st.form(f"add_issue_form_{pid}"):
-            date_reported = st.date_input("Date Reported")
-            description = st.text_area("Description")
-            status = st.selectbox("Status", ["Pending", "In Progress", "Resolved"])
-            assigned_to = st.text_input("Assigned To")
-            resolution_date = st.date_input("Resolution Date")
-            submitted = st.form_submit_button("Add Issue")
-            if submitted:
-                db.add_issue(pid, date_reported.strftime('%Y-%m-%d'), description, status, assigned_to, resolution_date.strftime('%Y-%m-%d'), current_user['id'])
-                st.success("Issue added!")
-                st.rerun()
-    st.markdown("---")
-    
-    # Back button
-    if st.button("⬅️ Back to Project List", key="back_to_tracker"):
-        st.session_state['show_project_detail'] = False
-        st.session_state['selected_project_id'] = None
-        st.rerun()
-    st.stop()
\ No newline at end of file
+    with profile_section("project detail"):
+        render_project_detail(current_user)
+
+finish_render_profile(current_user)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+UI Components for ProjectOps
+One stylesheet for the whole app plus compact, class-based HTML builders for
+the cards and feed items drawn with st.markdown. The stylesheet is emitted as
+a single identical element on every run, so Streamlit's message cache sends
+it to the browser once per session and a short hash reference afterwards
+(see global.minCachedMessageSize in .streamlit/config.toml)
+"""
+
+import html
+import re
+
+import streamlit as st
+
+from search_index import MARK_START, MARK_END
+
+STATUS_COLORS = {
+    'Completed': '#4CAF50',
+    'In Progress': '#2196F3',
+    'Pending': '#FFC107',
+    'On Hold': '#FF5722',
+    'Near Completion': '#00BCD4',
+    'Planning': '#9C27B0',
+}
+DEFAULT_STATUS_COLOR = '#607D8B'
+
+_STYLESHEET = """
+[data-testid="stSidebarNav"] { display: none; }
+.main-header {
+    color: #1f77b4;
+    text-align: center;
+    margin-bottom: 2rem;
+    font-size: 2.5rem;
+    font-weight: bold;
+}
+.metric-card {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 1.5rem;
+    border-radius: 10px;
+    color: white;
+    text-align: center;
+    margin: 0.5rem 0;
+}
+.metric-value { font-size: 2rem; font-weight: bold; margin-bottom: 0.5rem; }
+.metric-label { font-size: 1rem; opacity: 0.9; }
+.stButton > button { border-radius: 20px; font-weight: bold; }
+.stSelectbox > div > div { border-radius: 10px; }
+.stTextInput > div > div > input { border-radius: 10px; }
+[data-testid="stSidebar"] .stButton > button[kind="primary"] {
+    background: linear-gradient(90deg, #1f77b4 0%, #764ba2 100%);
+    color: white;
+    border: none;
+    box-shadow: 0 2px 8px rgba(31, 119, 180, 0.3);
+}
+.avatar {
+    width: 60px;
+    height: 60px;
+    border-radius: 50%;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    color: white;
+    font-size: 24px;
+    font-weight: bold;
+}
+.avatar-lg { width: 200px; height: 200px; font-size: 48px; margin: 0 auto; }
+.activity-item { padding: 1rem; border: 1px solid #e0e0e0; border-radius: 8px; margin: 0.5rem 0; }
+.pager-info { padding-top: 2rem; color: #666; }
+.search-hit { padding: 0.8rem 1rem; border-left: 4px solid #1f77b4; background: #f8f9fa; border-radius: 8px; margin: 0.5rem 0; }
+.search-hit-meta { font-size: 0.8rem; color: #666; margin-bottom: 0.2rem; }
+.search-hit-snippet { font-size: 0.9rem; color: #444; margin-top: 0.3rem; }
+.search-hit mark { background: #fff3b0; padding: 0 2px; border-radius: 2px; }
+.pcard {
+    background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
+    border-radius: 16px;
+    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+    padding: 1.8rem;
+    margin-bottom: 1.3rem;
+    border-left: 6px solid var(--c);
+    position: relative;
+}
+.pcard-header { display: flex; align-items: center; justify-content: space-between; margin-bottom: 1rem; }
+.pcard-title { font-size: 1.3rem; font-weight: bold; color: #1a1a1a; }
+.pcard-status {
+    font-size: 0.9rem;
+    font-weight: 600;
+    color: var(--c);
+    background: color-mix(in srgb, var(--c) 8%, transparent);
+    padding: 0.3rem 0.8rem;
+    border-radius: 20px;
+}
+.pcard-body { margin-bottom: 1rem; color: #555; font-size: 0.95rem; line-height: 1.5; }
+.pcard-body > div { margin-bottom: 0.5rem; }
+.pcard-desc {
+    margin-bottom: 1rem;
+    color: #444;
+    font-size: 0.9rem;
+    line-height: 1.4;
+    background: #f8f9fa;
+    padding: 0.8rem;
+    border-radius: 8px;
+}
+.pcard-stats { display: flex; gap: 1.2rem; font-size: 0.9rem; color: #666; margin-bottom: 1rem; }
+[class*="st-key-view_more_"] button {
+    min-width: 180px;
+    font-size: 1.1rem;
+    padding: 0.8rem 2.2rem;
+    margin: 0 auto;
+    display: block;
+    background: linear-gradient(90deg,#1f77b4 0%,#764ba2 100%);
+    color: white;
+    font-weight: bold;
+    border: none;
+    border-radius: 8px;
+    transition: background 0.18s;
+}
+[class*="st-key-view_more_"] button:hover { background: linear-gradient(90deg,#764ba2 0%,#1f77b4 100%); }
+"""
+
+
+def _minify(css):
+    """Drop the whitespace the browser does not need"""
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+STYLESHEET = _minify(_STYLESHEET)
+
+
+def inject_styles():
+    """Emit the app stylesheet; call once near the top of every run"""
+    st.markdown(f"<style>{STYLESHEET}</style>", unsafe_allow_html=True)
+
+
+def _text(value):
+    return html.escape("" if value is None else str(value))
+
+
+def _truncate(text, length):
+    return text[:length] + ('...' if len(text) > length else '')
+
+
+def metric_card(value, label):
+    return (
+        f'<div class="metric-card"><div class="metric-value">{_text(value)}</div>'
+        f'<div class="metric-label">{_text(label)}</div></div>'
+    )
+
+
+def avatar(name, large=False):
+    """Round badge with the first two letters of a name, for users without a picture"""
+    size = " avatar-lg" if large else ""
+    return f'<div class="avatar{size}">{_text(name[:2].upper())}</div>'
+
+
+def activity_feed(meetings):
+    """One block for the recent meeting rows (project_name, meeting_date, agenda)"""
+    items = []
+    for _, row in meetings.iterrows():
+        agenda = _truncate(str(row['agenda'] or ''), 80)
+        items.append(
+            f'<div class="activity-item"><strong>{_text(row["project_name"])}</strong><br>'
+            f'<small>{_text(row["meeting_date"])} - {_text(agenda)}</small></div>'
+        )
+    return "".join(items)
+
+
+def project_card(project, counts):
+    """Summary card for one project row with its meeting/update/issue counts"""
+    status = project.get('status') or 'In Progress'
+    percent = project.get('percent_complete', '')
+    progress = percent if percent and isinstance(percent, str) and '%' in percent else 'Not specified'
+    description = _truncate(str(project.get('description') or ''), 150)
+    fields = [
+        ('🖥️ Software', project.get('software', '')),
+        ('👥 Client', project.get('client_name', '')),
+        ('🏢 Vendor', project.get('vendor', '')),
+        ('📅 Deadline', project.get('deadline', '')),
+        ('📊 Progress', progress)
+    ]
+    body = "".join(f'<div><b>{label}:</b> {_text(value)}</div>' for label, value in fields)
+    return (
+        f'<div class="pcard" style="--c:{STATUS_COLORS.get(status, DEFAULT_STATUS_COLOR)}">'
+        f'<div class="pcard-header"><div class="pcard-title">{_text(project.get("project_name"))}</div>'
+        f'<div class="pcard-status">{_text(status)}</div></div>'
+        f'<div class="pcard-body">{body}</div>'
+        f'<div class="pcard-desc"><b>📝 Description:</b> {_text(description)}</div>'
+        f'<div class="pcard-stats"><span>📅 <b>{counts["meetings"]}</b> Meetings</span>'
+        f'<span>📝 <b>{counts["updates"]}</b> Updates</span>'
+        f'<span>🐞 <b>{counts["issues"]}</b> Issues</span></div></div>'
+    )
+
+
+def highlighted(text):
+    """Escape search index text and turn its match markers into <mark> tags"""
+    return _text(text).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+def search_hit(hit, icon, label):
+    """One global search result: entity type, project and date, then the highlighted title and snippet"""
+    snippet = f'<div class="search-hit-snippet">{highlighted(hit["snippet"])}</div>' if hit['snippet'] else ''
+    return (
+        f'<div class="search-hit"><div class="search-hit-meta">{icon} {_text(label)} · '
+        f'{_text(hit["project_name"])} · {_text(hit["entity_date"])}</div>'
+        f'<strong>{highlighted(hit["title"])}</strong>{snippet}</div>'
+    )
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Buffer for Project Tracker
+Collects low-priority writes (audit log rows, last_login timestamps) and
+flushes them in one batched transaction on a timer or when the buffer fills.
+A batch the database rejects is retried row by row, so one bad row is
+dropped instead of blocking every later flush
+"""
+
+import atexit
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.exc import DataError, IntegrityError
+
+
+def _utc_now():
+    # Matches what CURRENT_TIMESTAMP stores for the TIMESTAMP columns
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class WriteBehindBuffer:
+    """Buffers writes for at most flush_interval seconds before committing them"""
+
+    def __init__(self, engine, flush_interval=2.0, max_batch=200, max_pending=5000):
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._audit_rows = []
+        self._last_logins = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self.stats = {'flushes': 0, 'audit_rows': 0, 'last_logins': 0, 'coalesced': 0, 'errors': 0, 'dropped': 0,
+                      'last_error': None}
+        # The most recent rows dropped because the database rejected them, with the error
+        self.dropped = deque(maxlen=100)
+        self._worker = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def _pending(self):
+        return len(self._audit_rows) + len(self._last_logins)
+
+    def log_admin_action(self, admin_id, admin_email, action, target_user_id, target_email, details=None):
+        """Queue an audit log row stamped with the current time"""
+        with self._lock:
+            self._audit_rows.append({
+                'admin_id': admin_id,
+                'admin_email': admin_email,
+                'action': action,
+                'target_user_id': target_user_id,
+                'target_email': target_email,
+                'details': details,
+                'timestamp': _utc_now()
+            })
+            pending = self._pending()
+        self._after_enqueue(pending)
+
+    def touch_last_login(self, user_id):
+        """Queue a last_login update; repeated logins before a flush collapse into one"""
+        with self._lock:
+            if user_id in self._last_logins:
+                self.stats['coalesced'] += 1
+            self._last_logins[user_id] = _utc_now()
+            pending = self._pending()
+        self._after_enqueue(pending)
+
+    def _after_enqueue(self, pending):
+        if pending >= self.max_pending:
+            # Backpressure: the caller pays for the flush rather than the buffer growing without bound
+            self.flush()
+        elif pending >= self.max_batch:
+            self._wake.set()
+
+    def flush(self):
+        """Write everything buffered so far in one transaction"""
+        with self._flush_lock:
+            with self._lock:
+                audit_rows, self._audit_rows = self._audit_rows, []
+                last_logins, self._last_logins = self._last_logins, {}
+            if not audit_rows and not last_logins:
+                return
+            try:
+                self._write(audit_rows, last_logins)
+                self.stats['flushes'] += 1
+                self.stats['audit_rows'] += len(audit_rows)
+                self.stats['last_logins'] += len(last_logins)
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.stats['last_error'] = str(e)
+                self._write_row_by_row(audit_rows, last_logins)
+
+    def _write(self, audit_rows, last_logins):
+        with self.engine.connect() as conn:
+            if audit_rows:
+                conn.execute(text("""
+                    INSERT INTO audit_logs (admin_id, admin_email, action, target_user_id, target_email, details, timestamp)
+                    VALUES (:admin_id, :admin_email, :action, :target_user_id, :target_email, :details, :timestamp)
+                """), audit_rows)
+            if last_logins:
+                conn.execute(text("UPDATE users SET last_login = :last_login WHERE id = :user_id"), [
+                    {'user_id': user_id, 'last_login': last_login}
+                    for user_id, last_login in last_logins.items()
+                ])
+            conn.commit()
+
+    def _write_row_by_row(self, audit_rows, last_logins):
+        """Retry a failed batch one row per transaction.
+
+        Rows the database rejects (constraint violations, bad values) are
+        dropped and kept in self.dropped; on any other error the database is
+        assumed unreachable and the rest go back in the buffer.
+        """
+        writes = [([row], {}) for row in audit_rows]
+        writes += [([], {user_id: last_login}) for user_id, last_login in last_logins.items()]
+        for index, (rows, logins) in enumerate(writes):
+            try:
+                self._write(rows, logins)
+                self.stats['audit_rows'] += len(rows)
+                self.stats['last_logins'] += len(logins)
+            except (IntegrityError, DataError) as e:
+                self.stats['dropped'] += 1
+                self.stats['last_error'] = str(e)
+                self.dropped.append({'row': rows[0] if rows else logins, 'error': str(e)})
+            except Exception as e:
+                self.stats['last_error'] = str(e)
+                remaining = writes[index:]
+                self._requeue(
+                    [row for rows, _ in remaining for row in rows],
+                    {user_id: last_login for _, logins in remaining for user_id, last_login in logins.items()}
+                )
+                return
+
+    def _requeue(self, audit_rows, last_logins):
+        """Put writes back for the next flush, keeping the newest if over the limit"""
+        with self._lock:
+            self._audit_rows = (audit_rows + self._audit_rows)[-self.max_pending:]
+            for user_id, last_login in last_logins.items():
+                self._last_logins.setdefault(user_id, last_login)
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Stop the timer and flush whatever is left"""
+        self._stopped = True
+        self._wake.set()
+        self.flush()